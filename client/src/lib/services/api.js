@@ -51,8 +51,10 @@ export async function fetchVoices() {
 
 /**
  * Upload a document and extract text.
+ * The text stays on the server; play it by document_id (see streamSpeech).
+ * The Android app's embedded server returns the full text instead.
  * @param {File} file
- * @returns {Promise<{filename: string, text: string, chunk_count: number}>}
+ * @returns {Promise<{document_id?: string, filename: string, preview?: string, text?: string, char_count?: number, chunk_count: number, expires_at?: number}>}
  */
 export async function uploadDocument(file) {
 	const formData = new FormData();
@@ -71,6 +73,57 @@ export async function uploadDocument(file) {
 	return res.json();
 }
 
+/**
+ * Fetch the full extracted text of an uploaded document.
+ * @param {string} documentId - ID returned by uploadDocument
+ * @returns {Promise<{document_id: string, filename: string, text: string}>}
+ */
+export async function fetchDocumentText(documentId) {
+	const res = await fetch(apiUrl(`/api/documents/${documentId}/text`));
+	if (!res.ok) {
+		const err = await res.json().catch(() => ({ detail: res.statusText }));
+		throw new Error(err.detail || 'Failed to fetch document text');
+	}
+	return res.json();
+}
+
+/**
+ * Release an uploaded document's server-side handle (best effort).
+ * @param {string} documentId - ID returned by uploadDocument
+ */
+export function releaseDocument(documentId) {
+	fetch(apiUrl(`/api/documents/${documentId}`), { method: 'DELETE' }).catch(() => {});
+}
+
+/**
+ * Start a TTS stream for text, or for an uploaded document by its ID
+ * so the document text is not posted back to the server.
+ *
+ * Document handles expire and do not survive a server restart: when the
+ * ID is no longer known (404) and text is given, the text is streamed
+ * instead. Pass text with a documentId only if it is the full document.
+ * @param {{text?: string|null, documentId?: string|null, voice: string, speed: number}} request
+ * @param {AbortSignal} [signal]
+ * @returns {Promise<Response>} Streaming response (check response.ok)
+ */
+export async function streamSpeech({ text, documentId = null, voice, speed }, signal) {
+	if (documentId) {
+		const res = await postJson(`/api/documents/${documentId}/stream`, { voice, speed }, signal);
+		if (res.status !== 404 || !text) return res;
+		console.log(`[api] Document ${documentId} expired, streaming its text instead`);
+	}
+	return postJson('/api/tts/stream', { text, voice, speed }, signal);
+}
+
+function postJson(path, body, signal) {
+	return fetch(apiUrl(path), {
+		method: 'POST',
+		headers: { 'Content-Type': 'application/json' },
+		body: JSON.stringify(body),
+		signal,
+	});
+}
+
 /**
  * Fetch available TTS engines.
  * @returns {Promise<Array<{name: string, label: string, available: boolean, active: boolean}>>}
@@ -112,7 +165,7 @@ export async function healthCheck() {
 /**
  * Transcribe audio to text via Moonshine STT.
  * @param {Blob} audioBlob - Audio data (WAV format preferred)
- * @returns {Promise<{text: string, duration_ms: number, model: string}>}
+ * @returns {Promise<{text: string, duration_ms: number, model: string, segments: Array<{start: number, end: number, text: string}>, rtf: number, cached: boolean}>}
  */
 export async function transcribeAudio(audioBlob) {
 	const formData = new FormData();
@@ -133,7 +186,7 @@ export async function transcribeAudio(audioBlob) {
 
 /**
  * Get available STT models and their status.
- * @returns {Promise<{models: Array<{name: string, size_mb: number, downloaded: boolean, active: boolean}>}>}
+ * @returns {Promise<{models: Array<{name: string, size_mb: number, downloaded: boolean, active: boolean, state: 'not_loaded'|'loading'|'loaded'|'failed', error: string|null}>}>}
  */
 export async function fetchSttModels() {
 	const res = await fetch(apiUrl('/api/stt/models'));
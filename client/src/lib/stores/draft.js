@@ -1,6 +1,7 @@
 /**
  * Draft store — persists the current text input across tab switches.
- * Also provides save-to-history for text-only entries (dictation, notes).
+ * Also provides save-to-history for text-only entries (dictation, notes),
+ * and holds an uploaded document that is played by its server-side ID.
  */
 import { writable } from 'svelte/store';
 import { historyStore } from './history';
@@ -73,3 +74,10 @@ function createDraftStore() {
 }
 
 export const draftStore = createDraftStore();
+
+/**
+ * Uploaded document waiting to be played, kept across tab switches:
+ * {id, filename, preview, charCount, chunkCount} or null. Not persisted —
+ * the server-side handle expires anyway.
+ */
+export const documentDraft = writable(null);
@@ -47,6 +47,10 @@ function createHistoryStore() {
 						text: entry.text,
 						voice: entry.voice,
 						speed: entry.speed,
+						// Uploaded documents are regenerated by server-side ID; until
+						// the full text has been fetched (partialText), text is a preview
+						documentId: entry.documentId || null,
+						partialText: !!entry.partialText,
 						createdAt: new Date().toISOString(),
 						preview: entry.text.slice(0, 200),
 					},
@@ -3,7 +3,7 @@
  */
 import { writable, derived, get } from 'svelte/store';
 import { cacheAudio, getCachedAudio } from '$lib/services/audioCache';
-import { apiUrl } from '$lib/services/api';
+import { apiUrl, streamSpeech } from '$lib/services/api';
 import { playlistStore } from '$lib/stores/playlist';
 
 // Playback states
@@ -141,6 +141,11 @@ function createPlayerStore() {
 		}
 	}
 
+	/** Uploaded document of a history entry, as taken by generate() */
+	function uploadedDocument(entry) {
+		return entry.documentId ? { id: entry.documentId, partial: !!entry.partialText } : null;
+	}
+
 	function resetAudio() {
 		if (audioElement) {
 			audioElement.pause();
@@ -318,8 +323,12 @@ function createPlayerStore() {
 		 * @param {number} speedVal - Speed multiplier
 		 * @param {boolean} autoPlay - Whether to auto-play when complete
 		 * @param {number|null} historyId - Optional history ID for caching
+		 * @param {{id: string, partial: boolean}|null} uploaded - Uploaded document
+		 *   to stream by ID instead of posting text. With partial, text is only a
+		 *   preview for display; otherwise it is the full text, streamed instead
+		 *   if the document handle has expired.
 		 */
-		async generate(text, voiceName, speedVal, autoPlay = true, historyId = null) {
+		async generate(text, voiceName, speedVal, autoPlay = true, historyId = null, uploaded = null) {
 			// Abort any in-flight generation before starting a new one
 			if (activeController) {
 				activeController.abort();
@@ -378,16 +387,15 @@ function createPlayerStore() {
 			try {
 				resetInactivityTimer();
 
-				const response = await fetch(apiUrl('/api/tts/stream'), {
-					method: 'POST',
-					headers: { 'Content-Type': 'application/json' },
-					body: JSON.stringify({
-						text,
+				const response = await streamSpeech(
+					{
+						text: uploaded?.partial ? null : text,
+						documentId: uploaded?.id,
 						voice: voiceName,
 						speed: speedVal,
-					}),
-					signal: controller.signal,
-				});
+					},
+					controller.signal,
+				);
 				if (!response.ok) {
 					const err = await response.json().catch(() => ({ detail: response.statusText }));
 					throw new Error(err.detail || 'TTS generation failed');
@@ -686,7 +694,7 @@ function createPlayerStore() {
 
 		/**
 		 * Play from cache if available, otherwise regenerate.
-		 * @param {object} entry - History entry with id, text, voice, speed
+		 * @param {object} entry - History entry with id, text, voice, speed (and documentId for uploads)
 		 * @param {boolean} autoPlay - Whether to auto-play
 		 */
 		async playFromHistory(entry, autoPlay = true) {
@@ -754,11 +762,11 @@ function createPlayerStore() {
 					// Fall back to regenerating fresh audio instead of dead-ending on error.
 					console.warn('Cached audio playback failed, regenerating:', err.message);
 					resetAudio();
-					await this.generate(entry.text, entry.voice, entry.speed, autoPlay, entry.id);
+					await this.generate(entry.text, entry.voice, entry.speed, autoPlay, entry.id, uploadedDocument(entry));
 				}
 			} else {
 				// No cache, regenerate and cache
-				await this.generate(entry.text, entry.voice, entry.speed, autoPlay, entry.id);
+				await this.generate(entry.text, entry.voice, entry.speed, autoPlay, entry.id, uploadedDocument(entry));
 			}
 		},
 
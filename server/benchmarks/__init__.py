@@ -0,0 +1,4 @@
+"""Performance benchmarks for Open Mobile TTS server.
+
+Run from the server/ directory, e.g.: python -m benchmarks.bench_chunking
+"""
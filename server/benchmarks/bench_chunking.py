@@ -0,0 +1,89 @@
+"""
+Per-language chunking benchmark.
+
+Chunks a synthetic multi-paragraph text for each supported voice language,
+once with the default (Latin-script) segmentation rules and once with the
+language's own rules, and reports chunk counts, the largest chunk and the
+time spent chunking.
+
+Usage (from server/):
+    python -m benchmarks.bench_chunking [--paragraphs N] [--max-tokens N]
+"""
+
+import argparse
+import time
+
+from src.text_preprocessor import TextPreprocessor
+
+# One short paragraph per language; repeated to build the corpus
+SAMPLE_PARAGRAPHS = {
+    'en-us': (
+        "The quick brown fox jumps over the lazy dog. It was a bright cold day in April! "
+        "Did the clocks strike thirteen? Nobody could say for certain."
+    ),
+    'es': (
+        "El rápido zorro marrón salta sobre el perro perezoso. Era un día frío y brillante de abril. "
+        "¿Dieron los relojes las trece? Nadie podía decirlo con certeza."
+    ),
+    'ja': (
+        "素早い茶色の狐が怠け者の犬を飛び越えた。四月の晴れた寒い日だった！"
+        "時計は十三時を打ったのか？誰にも確かなことは言えなかった。"
+    ),
+    'zh': (
+        "敏捷的棕色狐狸跳过了懒狗。那是四月里一个晴朗寒冷的日子！"
+        "时钟敲了十三下吗？没有人能确定。"
+    ),
+    'hi': (
+        "तेज़ भूरी लोमड़ी आलसी कुत्ते के ऊपर कूदती है। अप्रैल का एक उजला ठंडा दिन था। "
+        "क्या घड़ियों ने तेरह बजाए? कोई भी निश्चित रूप से नहीं कह सकता था।"
+    ),
+}
+
+
+def build_corpus(language: str, paragraphs: int, sentences_per_paragraph: int = 40) -> str:
+    """Build a multi-paragraph text from the language's sample paragraph."""
+    sample = SAMPLE_PARAGRAPHS[language]
+    joiner = TextPreprocessor.get_language_rules(language)['joiner']
+    reps = max(1, sentences_per_paragraph // 4)
+    paragraph = joiner.join([sample] * reps)
+    return '\n\n'.join([paragraph] * paragraphs)
+
+
+def bench(preprocessor: TextPreprocessor, text: str, language: str, rules_language: str, rounds: int = 5) -> dict:
+    """Chunk text with rules_language's rules and measure chunks in language's token estimate."""
+    best = float('inf')
+    chunks = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        chunks = preprocessor.chunk_text(text, rules_language)
+        best = min(best, time.perf_counter() - start)
+
+    rules = preprocessor.get_language_rules(language)
+    token_counts = [preprocessor._estimate_tokens(c['text'], rules['chars_per_token']) for c in chunks]
+    return {
+        'chunks': len(chunks),
+        'max_chars': max((len(c['text']) for c in chunks), default=0),
+        'max_tokens': max(token_counts, default=0),
+        'ms': best * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paragraphs', type=int, default=200, help='Paragraphs per language corpus')
+    parser.add_argument('--max-tokens', type=int, default=None, help='Override MAX_CHUNK_TOKENS')
+    args = parser.parse_args()
+
+    preprocessor = TextPreprocessor(max_chunk_tokens=args.max_tokens)
+    print(f"max_chunk_tokens={preprocessor.max_chunk_tokens}, paragraphs={args.paragraphs}\n")
+    print(f"{'language':<8} {'rules':<9} {'chunks':>7} {'max chars':>10} {'max tokens':>11} {'time (ms)':>10}")
+
+    for language in SAMPLE_PARAGRAPHS:
+        text = build_corpus(language, args.paragraphs)
+        for label, rules_language in (('default', None), ('language', language)):
+            r = bench(preprocessor, text, language, rules_language)
+            print(f"{language:<8} {label:<9} {r['chunks']:>7} {r['max_chars']:>10} {r['max_tokens']:>11} {r['ms']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+DOCX extraction benchmark: python-docx object model vs streaming iterparse.
+
+Extracts a synthetic DOCX (see benchmarks/corpus.py) with the python-docx
+Document model (the previous implementation), with the streaming
+DocumentProcessor.extract_docx, and by consuming iter_docx_paragraphs
+without keeping the text (as the document stream endpoint does), each in a
+fresh process. Reports wall time and peak RSS growth; outputs are checked
+to be identical.
+
+Usage (from server/):
+    python -m benchmarks.bench_docx_extract [--sizes 1MB,10MB,50MB]
+"""
+
+import argparse
+import hashlib
+import logging
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from .corpus import generate_docx, parse_size
+from .memory import peak_rss_kb
+
+
+def object_model_extract(path: str) -> str:
+    """Previous implementation: build the python-docx Document, then join."""
+    from docx import Document
+
+    doc = Document(path)
+    paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+    text = '\n\n'.join(paragraphs)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def streaming_extract(path: str) -> str:
+    """Current implementation: iterparse word/document.xml, then join."""
+    from src.document_processor import DocumentProcessor
+
+    text = DocumentProcessor().extract_docx(path)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def streaming_iter(path: str) -> str:
+    """Consume paragraphs as they are parsed, without keeping the text."""
+    from src.document_processor import DocumentProcessor
+
+    digest = hashlib.sha256()
+    for n, paragraph in enumerate(DocumentProcessor().iter_docx_paragraphs(path)):
+        digest.update((paragraph if n == 0 else '\n\n' + paragraph).encode('utf-8'))
+    return digest.hexdigest()
+
+
+METHODS = {'python-docx': object_model_extract, 'streaming': streaming_extract, 'iter': streaming_iter}
+
+
+def _measure(method: str, path: str) -> tuple:
+    """Child process entry point: (seconds, peak RSS growth in KB, output digest)."""
+    logging.disable(logging.INFO)
+    import docx  # noqa: F401  Import cost is excluded from the RSS growth
+    import src.document_processor  # noqa: F401
+
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+    digest = METHODS[method](path)
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_kb()
+    return elapsed, peak - baseline, digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1MB,10MB,50MB', help='Comma-separated text sizes')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'text size':>10} {'docx bytes':>11} {'method':>12} {'time (s)':>9} {'peak RSS +MB':>13} {'identical':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes.split(','):
+            path = generate_docx(str(Path(tmp) / f'bench_{size}.docx'), parse_size(size))
+            digests = {}
+            for method in METHODS:
+                with ctx.Pool(1) as pool:
+                    elapsed, rss_kb, digests[method] = pool.apply(_measure, (method, path))
+                identical = '-' if method == 'python-docx' else str(digests[method] == digests['python-docx'])
+                print(f"{size:>10} {Path(path).stat().st_size:>11} {method:>12} {elapsed:>9.2f} "
+                      f"{rss_kb / 1024:>13.1f} {identical:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Parallel normalization speed-up benchmark.
+
+Normalizes a generated corpus document (see benchmarks/corpus.py) serially
+and with the process pool at increasing worker counts, checks the outputs
+are identical and reports the speed-up over the serial path.
+
+Usage (from server/):
+    python -m benchmarks.bench_normalize_parallel [--size-mb N] [--kind mixed] [--workers 2,4]
+"""
+
+import argparse
+import os
+import time
+
+from src.text_preprocessor import TextPreprocessor
+
+from .corpus import KINDS, generate
+
+
+def time_normalize(preprocessor: TextPreprocessor, text: str, rounds: int) -> tuple:
+    """Best-of-N wall time and the output of the last run."""
+    best = float('inf')
+    result = ''
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = preprocessor.normalize(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size-mb', type=float, default=10, help='Document size in MB')
+    parser.add_argument('--kind', default='mixed', choices=KINDS, help='Corpus kind')
+    parser.add_argument('--workers', default=None, help='Comma-separated worker counts (default: 2..cpu_count)')
+    parser.add_argument('--rounds', type=int, default=3, help='Timed runs per configuration')
+    args = parser.parse_args()
+
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(',')]
+    else:
+        cpus = os.cpu_count() or 1
+        worker_counts = [w for w in (2, 4, 8, 16) if w <= cpus] or [2]
+
+    text = generate(args.kind, int(args.size_mb * 1024 * 1024))
+    print(f"Document: {len(text)} chars, {os.cpu_count()} CPUs\n")
+
+    serial = TextPreprocessor(normalize_workers=1)
+    serial_time, expected = time_normalize(serial, text, args.rounds)
+    print(f"{'workers':>8} {'time (s)':>9} {'speed-up':>9} {'identical':>10}")
+    print(f"{'serial':>8} {serial_time:>9.2f} {1.0:>8.2f}x {'-':>10}")
+
+    for workers in worker_counts:
+        parallel = TextPreprocessor(normalize_workers=workers, parallel_min_chars=1)
+        parallel.normalize(text[:200000])  # Warm up: spawn pool processes
+        parallel_time, result = time_normalize(parallel, text, args.rounds)
+        print(f"{workers:>8} {parallel_time:>9.2f} {serial_time / parallel_time:>8.2f}x {str(result == expected):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+PDF extraction throughput benchmark.
+
+Extracts a synthetic text PDF (see benchmarks/corpus.py) serially and with
+the process pool at increasing worker counts, checks the outputs are
+identical and reports pages per second.
+
+Usage (from server/):
+    python -m benchmarks.bench_pdf_extract [--pages N] [--workers 2,4]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.document_processor import DocumentProcessor
+
+from .corpus import generate_pdf
+
+
+def time_extract(processor: DocumentProcessor, path: str, rounds: int) -> tuple:
+    """Best-of-N wall time and the output of the last run."""
+    best = float('inf')
+    result = ''
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = processor.extract_pdf(path)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=1000, help='Pages in the synthetic PDF')
+    parser.add_argument('--workers', default=None, help='Comma-separated worker counts (default: 2..cpu_count)')
+    parser.add_argument('--rounds', type=int, default=3, help='Timed runs per configuration')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    if args.workers:
+        worker_counts = [int(w) for w in args.workers.split(',')]
+    else:
+        cpus = os.cpu_count() or 1
+        worker_counts = [w for w in (2, 4, 8, 16) if w <= cpus] or [2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = generate_pdf(str(Path(tmp) / 'bench.pdf'), args.pages)
+        print(f"PDF: {args.pages} pages, {Path(path).stat().st_size} bytes, {os.cpu_count()} CPUs\n")
+
+        serial_time, expected = time_extract(DocumentProcessor(pdf_workers=1), path, args.rounds)
+        print(f"{'workers':>8} {'time (s)':>9} {'pages/s':>9} {'speed-up':>9} {'identical':>10}")
+        print(f"{'serial':>8} {serial_time:>9.2f} {args.pages / serial_time:>9.0f} {1.0:>8.2f}x {'-':>10}")
+
+        for workers in worker_counts:
+            processor = DocumentProcessor(pdf_workers=workers, pdf_parallel_min_pages=1)
+            processor.extract_pdf(path)  # Warm up: spawn pool processes
+            parallel_time, result = time_extract(processor, path, args.rounds)
+            print(f"{workers:>8} {parallel_time:>9.2f} {args.pages / parallel_time:>9.0f} "
+                  f"{serial_time / parallel_time:>8.2f}x {str(result == expected):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Text preprocessing micro-benchmarks.
+
+Times the full normalize() pipeline, its individual stages and chunk_text()
+over the generated corpus (see benchmarks/corpus.py) and writes the results
+as JSON. Pass --baseline to compare against a previous results file and exit
+non-zero if any benchmark got slower than the allowed threshold.
+
+Usage (from server/):
+    python -m benchmarks.bench_preprocess --output results.json
+    python -m benchmarks.bench_preprocess --baseline baseline.json --threshold 0.2
+    python -m benchmarks.bench_preprocess --sizes 1KB,100KB --kinds numbers,urls
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+from src.text_preprocessor import TextPreprocessor
+
+from .corpus import KINDS, generate, parse_size
+
+DEFAULT_SIZES = '1KB,10KB,100KB,1MB,10MB'
+
+
+def _stages(preprocessor: TextPreprocessor) -> dict:
+    """Benchmarked stages: name -> (callable, whether input is normalized text)."""
+    return {
+        'normalize': (preprocessor.normalize, False),
+        '_strip_emojis': (preprocessor._strip_emojis, False),
+        '_strip_markdown': (preprocessor._strip_markdown, False),
+        '_sanitize_special_chars': (preprocessor._sanitize_special_chars, False),
+        '_convert_numbers_to_words': (preprocessor._convert_numbers_to_words, False),
+        'chunk_text': (preprocessor.chunk_text, True),
+    }
+
+
+def time_call(func, arg, min_time: float, max_rounds: int) -> tuple:
+    """Run func(arg) repeatedly; return (best seconds, rounds run)."""
+    best = float('inf')
+    rounds = 0
+    total = 0.0
+    while rounds < max_rounds and (rounds == 0 or total < min_time):
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        rounds += 1
+    return best, rounds
+
+
+def run(kinds, sizes, stages, min_time: float, max_rounds: int, seed: int) -> list:
+    """Run every (stage, kind, size) combination and collect results."""
+    # Serial normalization only: parallel mode is measured by bench_normalize_parallel
+    preprocessor = TextPreprocessor(normalize_workers=1)
+    available = _stages(preprocessor)
+    results = []
+
+    for kind in kinds:
+        for size in sizes:
+            text = generate(kind, size, seed)
+            normalized = preprocessor.normalize(text)
+            for stage in stages:
+                func, takes_normalized = available[stage]
+                arg = normalized if takes_normalized else text
+                seconds, rounds = time_call(func, arg, min_time, max_rounds)
+                result = {
+                    'stage': stage,
+                    'corpus': kind,
+                    'size_bytes': size,
+                    'seconds': seconds,
+                    'mb_per_s': len(arg.encode('utf-8')) / (1024 * 1024) / seconds if seconds else None,
+                    'rounds': rounds,
+                }
+                results.append(result)
+                print(f"{stage:<27} {kind:<9} {size:>10} B {seconds * 1000:>11.3f} ms {result['mb_per_s'] or 0:>8.2f} MB/s",
+                      file=sys.stderr)
+    return results
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Return benchmarks slower than baseline by more than threshold (fraction)."""
+    key = lambda r: (r['stage'], r['corpus'], r['size_bytes'])
+    previous = {key(r): r for r in baseline.get('results', [])}
+    regressions = []
+    for r in results:
+        base = previous.get(key(r))
+        if base is None or not base['seconds']:
+            continue
+        ratio = r['seconds'] / base['seconds']
+        if ratio > 1 + threshold:
+            regressions.append({**r, 'baseline_seconds': base['seconds'], 'ratio': ratio})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--kinds', default=','.join(KINDS), help=f"Corpus kinds (default: all of {KINDS})")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"Corpus sizes (default: {DEFAULT_SIZES})")
+    parser.add_argument('--stages', default=None, help='Stages to run (default: all)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Minimum seconds spent per benchmark')
+    parser.add_argument('--max-rounds', type=int, default=20, help='Maximum runs per benchmark')
+    parser.add_argument('--output', default=None, help='Write JSON results to this file (default: stdout)')
+    parser.add_argument('--baseline', default=None, help='Baseline JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown vs baseline (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    # Keep per-call INFO logging out of the timings and output
+    logging.disable(logging.INFO)
+
+    kinds = [k.strip() for k in args.kinds.split(',')]
+    sizes = [parse_size(s) for s in args.sizes.split(',')]
+    stages = [s.strip() for s in args.stages.split(',')] if args.stages else list(_stages(TextPreprocessor()))
+
+    results = run(kinds, sizes, stages, args.min_time, args.max_rounds, args.seed)
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} {r['corpus']} {r['size_bytes']} B: "
+                  f"{r['baseline_seconds'] * 1000:.3f} ms -> {r['seconds'] * 1000:.3f} ms ({r['ratio']:.2f}x)",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
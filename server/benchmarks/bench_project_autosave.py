@@ -0,0 +1,106 @@
+"""
+Project autosave benchmark: write-through vs write-behind.
+
+Simulates --sessions users editing their own project for --seconds: each
+types in bursts of 1-4 s, autosaving (update() with the whole draft) every
+--interval seconds, then pauses for 1-5 s. Runs the same seeded workload
+with every update written immediately (write_delay 0, the previous
+behaviour) and with the given write-behind delays, and reports updates,
+files written, MB written and update latency. Files and bytes count every
+project.json/content.txt replacement, including the final flush on close().
+
+Usage (from server/):
+    python -m benchmarks.bench_project_autosave [--sessions 4] [--seconds 20]
+        [--interval 0.1] [--delays 0,0.5,2] [--max-delay 10]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.project_storage import ProjectStorage
+
+
+class CountingStorage(ProjectStorage):
+    """ProjectStorage that counts the files and bytes it writes."""
+
+    def __init__(self, *args, **kwargs):
+        self._count_lock = threading.Lock()
+        self.files_written = 0
+        self.bytes_written = 0
+        super().__init__(*args, **kwargs)
+
+    def _write_atomic(self, path: Path, text: str) -> None:
+        ProjectStorage._write_atomic(path, text)
+        with self._count_lock:
+            self.files_written += 1
+            self.bytes_written += len(text.encode("utf-8"))
+
+
+def session(storage: ProjectStorage, project_id: str, seed: int, interval: float, stop: threading.Event) -> list:
+    """Type in bursts until stopped; returns update latencies (s)."""
+    rng = random.Random(seed)
+    draft = "Opening paragraph of a long draft. " * 100
+    latencies = []
+    while not stop.is_set():
+        burst_end = time.monotonic() + rng.uniform(1, 4)
+        while time.monotonic() < burst_end and not stop.is_set():
+            draft += rng.choice("abcdefghij klmnop.")
+            start = time.perf_counter()
+            storage.update(project_id, content=draft)
+            latencies.append(time.perf_counter() - start)
+            stop.wait(interval)
+        stop.wait(rng.uniform(1, 5))
+    return latencies
+
+
+def run(delay: float, args) -> tuple:
+    """(updates, files written, bytes written, p50 s, p95 s) for one write delay."""
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = CountingStorage(tmp, write_delay=delay, max_write_delay=args.max_delay)
+        ids = [storage.create(f"Draft {i}", "tts", "") for i in range(args.sessions)]
+        storage.files_written = storage.bytes_written = 0
+
+        stop = threading.Event()
+        results = [None] * args.sessions
+
+        def worker(i):
+            results[i] = session(storage, ids[i], i, args.interval, stop)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.sessions)]
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        storage.close()
+
+        latencies = sorted(l for r in results for l in r)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return len(latencies), storage.files_written, storage.bytes_written, statistics.median(latencies), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent editing sessions")
+    parser.add_argument("--seconds", type=float, default=20, help="Duration per delay")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between autosaves while typing")
+    parser.add_argument("--delays", default="0,0.5,2", help="Comma-separated write delays (0 = write-through)")
+    parser.add_argument("--max-delay", type=float, default=10, help="max_write_delay for write-behind runs")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"{'delay (s)':>10} {'updates':>8} {'files':>7} {'MB':>7} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for delay in (float(d) for d in args.delays.split(",")):
+        updates, files, size, p50, p95 = run(delay, args)
+        print(f"{delay:>10g} {updates:>8} {files:>7} {size / 1e6:>7.1f} {p50 * 1000:>9.2f} {p95 * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Project storage concurrency benchmark: one global lock vs per-project locks.
+
+Creates N projects in a temporary directory, then for --seconds runs
+autosave writers (update() of a random project with a few KB of text),
+readers (get() of a random project and list_projects()) and one thread
+repeating export_all(), the slow whole-store operation. Reports operation
+counts and median/p95/max latency per operation for the previous locking
+(every public method serialized on one RLock, emulated by wrapping the
+current class) and for ProjectStorage as is.
+
+Usage (from server/):
+    python -m benchmarks.bench_project_concurrency [--projects 1000]
+        [--writers 4] [--readers 4] [--seconds 5]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from src.project_storage import ProjectStorage
+
+
+class GlobalLockStorage(ProjectStorage):
+    """Previous locking: every public operation holds one RLock."""
+
+    def __init__(self, base_dir: str):
+        self._global_lock = threading.RLock()
+        super().__init__(base_dir)
+
+
+def _serialized(name):
+    method = getattr(ProjectStorage, name)
+
+    def locked(self, *args, **kwargs):
+        with self._global_lock:
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+for _name in ("create", "get", "list_projects", "update", "delete", "cleanup", "export_all"):
+    setattr(GlobalLockStorage, _name, _serialized(_name))
+
+LAYOUTS = {"global-lock": GlobalLockStorage, "per-project": ProjectStorage}
+
+
+def run(storage: ProjectStorage, ids: list, writers: int, readers: int, seconds: float) -> dict:
+    """Operation name -> list of latencies (s) from a mixed workload."""
+    latencies = defaultdict(list)
+    stop = threading.Event()
+
+    def timed(name, func, *args, **kwargs):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        latencies[name].append(time.perf_counter() - start)
+
+    def writer(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            text = "Draft sentence being typed. " * rng.randint(50, 200)
+            timed("update", storage.update, rng.choice(ids), content=text)
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            timed("get", storage.get, rng.choice(ids))
+            timed("list", storage.list_projects)
+
+    def exporter():
+        while not stop.is_set():
+            timed("export_all", storage.export_all)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(100 + i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=exporter))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=1000, help="Projects in the store")
+    parser.add_argument("--writers", type=int, default=4, help="Autosave threads")
+    parser.add_argument("--readers", type=int, default=4, help="get/list threads")
+    parser.add_argument("--seconds", type=float, default=5, help="Duration per layout")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"{'layout':>12} {'op':>11} {'count':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9}")
+    for layout, cls in LAYOUTS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = cls(tmp)
+            ids = [storage.create(f"Project {i}", "tts", "Some text. " * 200) for i in range(args.projects)]
+            latencies = run(storage, ids, args.writers, args.readers, args.seconds)
+            storage.close()
+        for op in ("update", "get", "list", "export_all"):
+            values = sorted(latencies[op])
+            if not values:
+                continue
+            p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+            print(f"{layout:>12} {op:>11} {len(values):>7} {statistics.median(values) * 1000:>9.1f} "
+                  f"{p95 * 1000:>9.1f} {values[-1] * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
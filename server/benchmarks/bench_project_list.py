@@ -0,0 +1,103 @@
+"""
+Project listing benchmark: folder scan vs SQLite metadata index.
+
+Creates N projects in a temporary directory and times the previous
+list_projects (iterate every folder, parse every project.json, sort in
+Python) against ProjectStorage.list_projects from the index, along with
+the startup cost of building the index from scratch and of checking an
+up-to-date one. Also times one --page-size page of list_page (id, title,
+modified) at the top and halfway down the list, and compares the JSON
+response size of the full listing with that of one page.
+
+Usage (from server/):
+    python -m benchmarks.bench_project_list [--projects 100,1000,5000] [--repeat 5] [--page-size 50]
+"""
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from src.project_storage import INDEX_FILE, ProjectStorage
+
+
+def make_projects(base: Path, count: int):
+    """Write project folders directly (as Android or a restore would)."""
+    now = int(time.time() * 1000)
+    for i in range(count):
+        project_dir = base / f"proj_{i:016x}"
+        project_dir.mkdir()
+        meta = {"id": project_dir.name, "title": f"Project {i}", "type": "tts" if i % 2 else "stt",
+                "created": now - i * 1000, "modified": now - (i * 7919 % count) * 1000}
+        (project_dir / "project.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        (project_dir / "content.txt").write_text("Some text. " * 200, encoding="utf-8")
+
+
+def scan_list(base: Path) -> list:
+    """Previous implementation: parse every project.json and sort."""
+    projects = []
+    for project_dir in base.iterdir():
+        if not project_dir.is_dir():
+            continue
+        meta_file = project_dir / "project.json"
+        if not meta_file.exists():
+            continue
+        try:
+            projects.append(json.loads(meta_file.read_text(encoding="utf-8")))
+        except Exception:
+            continue
+    projects.sort(key=lambda p: p.get("modified", 0), reverse=True)
+    return projects
+
+
+def best_of(repeat: int, func) -> float:
+    """Fastest of `repeat` runs, in ms."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", default="100,1000,5000", help="Comma-separated project counts")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    parser.add_argument("--page-size", type=int, default=50, help="Projects per list_page call")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    fields = ["id", "title", "modified"]
+    print(f"{'projects':>9} {'scan list (ms)':>15} {'index list (ms)':>16} {'build (ms)':>11} {'startup check (ms)':>19}"
+          f" {'page (ms)':>10} {'mid page (ms)':>14} {'full KB':>8} {'page KB':>8}")
+    for count in (int(n) for n in args.projects.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp)
+            make_projects(base, count)
+
+            start = time.perf_counter()
+            storage = ProjectStorage(tmp)
+            build_ms = (time.perf_counter() - start) * 1000
+            assert len(storage.list_projects()) == len(scan_list(base)) == count
+
+            scan_ms = best_of(args.repeat, lambda: scan_list(base))
+            index_ms = best_of(args.repeat, storage.list_projects)
+            check_ms = best_of(args.repeat, lambda: ProjectStorage(tmp))
+            assert (base / INDEX_FILE).exists()
+
+            full = storage.list_projects()
+            middle = full[count // 2]
+            mid_cursor = f"{middle['modified']}:{middle['id']}"
+            page_ms = best_of(args.repeat, lambda: storage.list_page(args.page_size, fields=fields))
+            mid_ms = best_of(args.repeat, lambda: storage.list_page(args.page_size, mid_cursor, fields=fields))
+            full_kb = len(json.dumps({"projects": full})) / 1024
+            page_kb = len(json.dumps(storage.list_page(args.page_size, fields=fields))) / 1024
+            print(f"{count:>9} {scan_ms:>15.1f} {index_ms:>16.1f} {build_ms:>11.1f} {check_ms:>19.1f}"
+                  f" {page_ms:>10.2f} {mid_ms:>14.2f} {full_kb:>8.0f} {page_kb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Running header/footer removal benchmark.
+
+Extracts synthetic PDFs (see benchmarks/corpus.py) with a running header
+and a "Page N of M" footer, with and without RunningLineFilter, and reports
+how much text and estimated speech the filter removes and what it costs.
+
+Usage (from server/):
+    python -m benchmarks.bench_running_lines [--pages 50,300]
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from src.document_processor import DocumentProcessor
+from src.running_lines import RunningLineFilter
+
+from .corpus import generate_pdf
+
+HEADER = "Open Mobile TTS Annual Report 2025 - Internal Use Only"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', default='50,300', help='Comma-separated page counts')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"{'pages':>6} {'chars before':>13} {'chars removed':>14} {'speech saved':>13} {'extract (s)':>12} {'filter cost':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in (int(p) for p in args.pages.split(',')):
+            path = generate_pdf(str(Path(tmp) / f'bench_{pages}.pdf'), pages,
+                                header=HEADER, footer=f"Page {{page}} of {pages}")
+
+            start = time.perf_counter()
+            raw = DocumentProcessor(pdf_workers=1, strip_running_lines=False).extract(path)
+            raw_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            text = DocumentProcessor(pdf_workers=1, strip_running_lines=True).extract(path)
+            filtered_time = time.perf_counter() - start
+
+            removed = len(raw) - len(text)
+            seconds = removed / RunningLineFilter.SPEECH_CHARS_PER_SECOND
+            print(f"{pages:>6} {len(raw):>13} {removed:>14} {seconds / 60:>10.1f}min "
+                  f"{filtered_time:>12.2f} {(filtered_time - raw_time) * 1000:>10.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
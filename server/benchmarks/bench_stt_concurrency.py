@@ -0,0 +1,75 @@
+"""
+STT concurrency benchmark: recognizer pool size vs threads per recognizer.
+
+For each pool layout (recognizers x ONNX threads each) and each number of
+concurrent clients, sends --requests transcriptions of the same clip
+through SttEngine.transcribe from that many threads and reports aggregate
+transcriptions per second and median/p95 latency. Keeping recognizers x
+threads near the core count compares one wide recognizer (the previous
+fixed layout, 1 x 4) against several narrow ones.
+
+Requires sherpa-onnx and the Moonshine model.
+
+Usage (from server/):
+    python -m benchmarks.bench_stt_concurrency --audio clip.wav
+        [--layouts 1x4,2x2,4x1] [--clients 1,2,4,8] [--requests 16]
+        [--model-dir ~/.cache/sherpa-onnx-moonshine-base-en-int8]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from src.stt_engine import HAS_SHERPA, SttEngine
+
+
+def run(engine: SttEngine, samples: np.ndarray, clients: int, requests: int) -> tuple:
+    """(transcriptions/s, p50 s, p95 s) for `requests` calls from `clients` threads."""
+
+    def one(_):
+        start = time.perf_counter()
+        engine.transcribe(samples)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = sorted(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return requests / elapsed, statistics.median(latencies), p95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", required=True, help="Speech clip (any format ffmpeg decodes), ideally 5-15 s")
+    parser.add_argument("--layouts", default="1x4,2x2,4x1", help="Comma-separated RECOGNIZERSxTHREADS")
+    parser.add_argument("--clients", default="1,2,4,8", help="Comma-separated concurrent client counts")
+    parser.add_argument("--requests", type=int, default=16, help="Transcriptions per measurement")
+    parser.add_argument("--model-dir", default=str(Path.home() / ".cache" / SttEngine.MODEL_NAME))
+    args = parser.parse_args()
+
+    if not HAS_SHERPA or not Path(args.model_dir).exists():
+        parser.error(f"sherpa-onnx and the Moonshine model at {args.model_dir} are required")
+
+    logging.disable(logging.INFO)
+    samples = SttEngine().decode_audio_file(args.audio)
+    print(f"clip: {len(samples) / SttEngine.SAMPLE_RATE:.1f}s\n")
+    print(f"{'layout':>7} {'clients':>8} {'req/s':>7} {'p50 (s)':>8} {'p95 (s)':>8}")
+    for layout in args.layouts.split(","):
+        recognizers, threads = (int(n) for n in layout.lower().split("x"))
+        engine = SttEngine(recognizers=recognizers, num_threads=threads)
+        engine.init(args.model_dir)
+        engine.transcribe(samples)  # warm-up
+        for clients in (int(c) for c in args.clients.split(",")):
+            rate, p50, p95 = run(engine, samples, clients, args.requests)
+            print(f"{layout:>7} {clients:>8} {rate:>7.2f} {p50:>8.2f} {p95:>8.2f}")
+        engine.release()
+
+
+if __name__ == "__main__":
+    main()
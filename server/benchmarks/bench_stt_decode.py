@@ -0,0 +1,108 @@
+"""
+STT audio decode benchmark: ffmpeg temp file + struct vs pipe + NumPy.
+
+Generates AAC (.m4a) test tones of the given lengths with ffmpeg and, each
+in a fresh process, decodes them to 16 kHz mono samples the previous way
+(ffmpeg writes a .raw temp file, struct.unpack to a tuple, list of Python
+floats) and with SttEngine.decode_audio_file (ffmpeg stdout pipe into one
+buffer, float32 array via NumPy). Reports wall time and peak RSS growth.
+Requires ffmpeg on PATH.
+
+Usage (from server/):
+    python -m benchmarks.bench_stt_decode [--minutes 1,60]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from .memory import peak_rss_kb
+
+SAMPLE_RATE = 16000
+
+
+def make_audio(path: str, minutes: float):
+    """Encode a 44.1 kHz stereo tone so the decode also has to resample and downmix."""
+    subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=44100:duration={minutes * 60}",
+            "-ac", "2", "-c:a", "aac", "-b:a", "64k", path,
+        ],
+        check=True,
+    )
+
+
+def tempfile_struct(path: str) -> int:
+    """Previous implementation: decode to a temp .raw file, unpack with struct."""
+    import struct
+
+    tmp = tempfile.NamedTemporaryFile(suffix=".raw", delete=False)
+    tmp_path = tmp.name
+    tmp.close()
+    try:
+        cmd = [
+            "ffmpeg", "-i", path, "-f", "s16le", "-acodec", "pcm_s16le",
+            "-ar", str(SAMPLE_RATE), "-ac", "1", "-y", tmp_path,
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr[:500])
+        raw_bytes = Path(tmp_path).read_bytes()
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+
+    num_samples = len(raw_bytes) // 2
+    shorts = struct.unpack(f"<{num_samples}h", raw_bytes)
+    return len([s / 32768.0 for s in shorts])
+
+
+def pipe_numpy(path: str) -> int:
+    """Current implementation: SttEngine.decode_audio_file."""
+    from src.stt_engine import SttEngine
+
+    return len(SttEngine().decode_audio_file(path))
+
+
+METHODS = {"tempfile-struct": tempfile_struct, "pipe-numpy": pipe_numpy}
+
+
+def _measure(method: str, path: str) -> tuple:
+    """Child process entry point: (seconds, peak RSS growth in KB, samples)."""
+    logging.disable(logging.INFO)
+    import src.stt_engine  # noqa: F401  Import cost is excluded from the RSS growth
+
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+    samples = METHODS[method](path)
+    return time.perf_counter() - start, peak_rss_kb() - baseline, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", default="1,60", help="Comma-separated audio lengths in minutes")
+    args = parser.parse_args()
+
+    if shutil.which("ffmpeg") is None:
+        parser.error("ffmpeg not found on PATH")
+
+    logging.disable(logging.INFO)
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'minutes':>8} {'method':>16} {'time (s)':>9} {'peak RSS +MB':>13} {'samples':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in (float(m) for m in args.minutes.split(",")):
+            path = str(Path(tmp) / f"tone-{minutes:g}.m4a")
+            make_audio(path, minutes)
+            for method in METHODS:
+                with ctx.Pool(1) as pool:
+                    seconds, rss_kb, samples = pool.apply(_measure, (method, path))
+                print(f"{minutes:>8g} {method:>16} {seconds:>9.2f} {rss_kb / 1024:>13.1f} {samples:>11,}")
+
+
+if __name__ == "__main__":
+    main()
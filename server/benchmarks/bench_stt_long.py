@@ -0,0 +1,105 @@
+"""
+Long-audio STT benchmark: one Moonshine stream vs VAD-segmented batches.
+
+Builds recordings of the given lengths by repeating a speech file (or, with
+no --audio, synthetic noise bursts separated by pauses) and reports, per
+length, the VAD time and segment count for each available detector. When
+the Moonshine model is present it also reports the real-time factor (RTF,
+processing time / audio time) of decoding the whole recording in a single
+stream (skipped past --single-max minutes) and of
+SttEngine.transcribe_segments.
+
+Usage (from server/):
+    python -m benchmarks.bench_stt_long [--audio speech.wav] [--minutes 1,10,60]
+        [--model-dir ~/.cache/sherpa-onnx-moonshine-base-en-int8]
+        [--vad-model ~/.cache/silero_vad.onnx] [--workers 2] [--batch-size 8]
+"""
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.config import settings
+from src.stt_engine import HAS_SHERPA, SttEngine
+from src.vad import SpeechSegmenter
+
+RATE = SttEngine.SAMPLE_RATE
+
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """Noise bursts of 1-6 s separated by 0.3-1.5 s of faint hiss."""
+    rng = np.random.default_rng(seed)
+    parts, total = [], 0
+    while total < seconds * RATE:
+        burst = int(rng.uniform(1, 6) * RATE)
+        pause = int(rng.uniform(0.3, 1.5) * RATE)
+        parts.append(rng.standard_normal(burst) * 0.3)
+        parts.append(rng.standard_normal(pause) * 0.001)
+        total += burst + pause
+    return np.concatenate(parts)[:int(seconds * RATE)].astype(np.float32)
+
+
+def recording(source: np.ndarray, seconds: float) -> np.ndarray:
+    """Repeat source audio to the requested length."""
+    n = int(seconds * RATE)
+    return np.resize(source, n) if len(source) < n else source[:n].copy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", help="Speech recording to repeat (any format ffmpeg decodes)")
+    parser.add_argument("--minutes", default="1,10,60", help="Comma-separated recording lengths in minutes")
+    parser.add_argument("--model-dir", default=str(Path.home() / ".cache" / SttEngine.MODEL_NAME))
+    parser.add_argument("--vad-model", default=settings.STT_VAD_MODEL)
+    parser.add_argument("--workers", type=int, default=settings.STT_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=settings.STT_BATCH_SIZE)
+    parser.add_argument("--single-max", type=float, default=10, help="Longest recording (minutes) decoded as one stream")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    minutes = [float(m) for m in args.minutes.split(",")]
+    if args.audio:
+        source = SttEngine().decode_audio_file(args.audio)
+    else:
+        source = synthetic_speech(max(minutes) * 60)
+
+    segmenters = {"energy": SpeechSegmenter(None, settings.STT_MIN_SILENCE_SECONDS, settings.STT_MAX_SEGMENT_SECONDS)}
+    silero = SpeechSegmenter(args.vad_model, settings.STT_MIN_SILENCE_SECONDS, settings.STT_MAX_SEGMENT_SECONDS)
+    if silero.backend == "silero":
+        segmenters["silero"] = silero
+
+    engine = None
+    if HAS_SHERPA and Path(args.model_dir).exists():
+        engine = SttEngine(workers=args.workers, batch_size=args.batch_size, segmenter=segmenters.get("silero", segmenters["energy"]))
+        engine.init(args.model_dir)
+    else:
+        print(f"Moonshine model not found at {args.model_dir}: reporting VAD only\n")
+
+    print(f"{'minutes':>8} {'mode':>16} {'time (s)':>9} {'RTF':>7} {'segments':>9}")
+    for length in minutes:
+        samples = recording(source, length * 60)
+        audio_seconds = len(samples) / RATE
+        for name, segmenter in segmenters.items():
+            start = time.perf_counter()
+            count = len(segmenter.segments(samples))
+            seconds = time.perf_counter() - start
+            print(f"{length:>8g} {'vad-' + name:>16} {seconds:>9.2f} {seconds / audio_seconds:>7.4f} {count:>9}")
+
+        if engine is None:
+            continue
+        if length <= args.single_max:
+            start = time.perf_counter()
+            engine.transcribe(samples)
+            seconds = time.perf_counter() - start
+            print(f"{length:>8g} {'single-stream':>16} {seconds:>9.2f} {seconds / audio_seconds:>7.4f} {1:>9}")
+        start = time.perf_counter()
+        count = len(engine.transcribe_segments(samples))
+        seconds = time.perf_counter() - start
+        print(f"{length:>8g} {'segmented':>16} {seconds:>9.2f} {seconds / audio_seconds:>7.4f} {count:>9}")
+
+
+if __name__ == "__main__":
+    main()
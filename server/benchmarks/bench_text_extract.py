@@ -0,0 +1,92 @@
+"""
+Text/markdown extraction memory benchmark: whole-file read vs mmap blocks.
+
+Writes a synthetic .txt and .md file (see benchmarks/corpus.py) and, each in
+a fresh process, extracts them the previous way (read() the whole file,
+then run the markdown regexes over the whole string) and by consuming
+DocumentProcessor.iter_text_blocks (memory-mapped, decoded and stripped
+per block, as the document stream endpoint does). Reports wall time and
+peak RSS growth.
+
+Usage (from server/):
+    python -m benchmarks.bench_text_extract [--size 100MB]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from .corpus import generate, parse_size
+from .memory import peak_rss_kb
+
+
+def read_whole(path: str) -> int:
+    """Previous implementation: read() the file, strip markdown on the whole string."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    if path.endswith('.md'):
+        text = re.sub(r'```[\s\S]*?```', '', text)
+        text = re.sub(r'`([^`]+)`', r'\1', text)
+        text = re.sub(r'!\[([^\]]*)\]\([^)]*\)', r'\1', text)
+        text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+        text = re.sub(r'<[^>]+>', '', text)
+        text = re.sub(r'(?m)^#{1,6}\s+', '', text)
+        text = re.sub(r'\*{1,3}([^*]+)\*{1,3}', r'\1', text)
+        text = re.sub(r'_{1,3}([^_]+)_{1,3}', r'\1', text)
+        text = re.sub(r'~~([^~]+)~~', r'\1', text)
+        text = re.sub(r'(?m)^>\s?', '', text)
+        text = re.sub(r'(?m)^[-*_]{3,}\s*$', '', text)
+        text = re.sub(r'(?m)^\s*[-*+]\s+', '', text)
+        text = re.sub(r'(?m)^\s*\d+\.\s+', '', text)
+        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = re.sub(r' {2,}', ' ', text)
+    return len(text.strip())
+
+
+def mmap_blocks(path: str) -> int:
+    """Current implementation: consume memory-mapped blocks without keeping them."""
+    from src.document_processor import DocumentProcessor
+
+    return sum(len(block) for block in DocumentProcessor().iter_text_blocks(path, markdown=path.endswith('.md')))
+
+
+METHODS = {'read': read_whole, 'mmap-blocks': mmap_blocks}
+
+
+def _measure(method: str, path: str) -> tuple:
+    """Child process entry point: (seconds, peak RSS growth in KB, output chars)."""
+    logging.disable(logging.INFO)
+    import src.document_processor  # noqa: F401  Import cost is excluded from the RSS growth
+
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+    chars = METHODS[method](path)
+    return time.perf_counter() - start, peak_rss_kb() - baseline, chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='100MB', help='File size (e.g. 10MB, 100MB)')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    size = parse_size(args.size)
+    ctx = multiprocessing.get_context('spawn')
+    print(f"{'file':>9} {'bytes':>11} {'method':>12} {'time (s)':>9} {'peak RSS +MB':>13} {'chars out':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, kind in (('bench.txt', 'pdf'), ('bench.md', 'markdown')):
+            path = Path(tmp) / name
+            path.write_text(generate(kind, size), encoding='utf-8')
+            for method in METHODS:
+                with ctx.Pool(1) as pool:
+                    elapsed, rss_kb, chars = pool.apply(_measure, (method, str(path)))
+                print(f"{name:>9} {path.stat().st_size:>11} {method:>12} {elapsed:>9.2f} "
+                      f"{rss_kb / 1024:>13.1f} {chars:>11}")
+
+
+if __name__ == '__main__':
+    main()
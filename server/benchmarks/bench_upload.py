@@ -0,0 +1,80 @@
+"""
+Document upload latency benchmark: in-memory parsing vs temp files.
+
+Posts small synthetic documents to /api/documents/upload through the ASGI
+app, once with uploads parsed from memory (UPLOAD_SPOOL_MAX_KB) and once
+with every upload written to UPLOAD_DIR first, and reports per-request
+latency. The document cache is disabled so every request is extracted.
+
+Usage (from server/):
+    python -m benchmarks.bench_upload [--size 20KB] [--requests 200]
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from src import main as server
+from src.document_cache import DocumentCache
+
+from .corpus import generate, generate_docx, generate_pdf, parse_size
+
+
+def make_documents(size_bytes: int, tmp: str) -> dict:
+    """Synthetic .txt, .md, .pdf and .docx uploads of roughly size_bytes."""
+    pdf_path = generate_pdf(str(Path(tmp) / 'bench.pdf'), max(1, size_bytes // 3000))
+    docx_path = generate_docx(str(Path(tmp) / 'bench.docx'), size_bytes)
+    return {
+        'bench.txt': generate('pdf', size_bytes).encode('utf-8'),
+        'bench.md': generate('markdown', size_bytes).encode('utf-8'),
+        'bench.pdf': Path(pdf_path).read_bytes(),
+        'bench.docx': Path(docx_path).read_bytes(),
+    }
+
+
+def time_uploads(client: TestClient, name: str, content: bytes, requests: int) -> list:
+    """Per-request latencies in milliseconds."""
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.post("/api/documents/upload", files={"file": (name, content)})
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='20KB', help='Approximate document size (e.g. 20KB, 1MB)')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per configuration')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    server.document_cache = DocumentCache(max_mb=0)
+    client = TestClient(server.app)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server.settings.UPLOAD_DIR = tmp
+        documents = make_documents(parse_size(args.size), tmp)
+        spool_kb = max(server.settings.UPLOAD_SPOOL_MAX_KB, max(len(c) for c in documents.values()) // 1024 + 1)
+
+        print(f"{'document':>12} {'bytes':>9} {'disk p50':>9} {'mem p50':>9} {'disk p95':>9} {'mem p95':>9} {'saved':>8}")
+        for name, content in documents.items():
+            results = {}
+            for label, spool in (('disk', 0), ('memory', spool_kb)):
+                server.settings.UPLOAD_SPOOL_MAX_KB = spool
+                time_uploads(client, name, content, 5)  # Warm up
+                latencies = time_uploads(client, name, content, args.requests)
+                results[label] = (statistics.median(latencies), statistics.quantiles(latencies, n=20)[-1])
+            disk, mem = results['disk'], results['memory']
+            print(f"{name:>12} {len(content):>9} {disk[0]:>7.2f}ms {mem[0]:>7.2f}ms "
+                  f"{disk[1]:>7.2f}ms {mem[1]:>7.2f}ms {disk[0] - mem[0]:>6.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
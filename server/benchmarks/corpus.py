@@ -0,0 +1,182 @@
+"""
+Reproducible synthetic corpus for preprocessing benchmarks.
+
+Each corpus kind stresses a different part of the TextPreprocessor pipeline.
+Generation is seeded, so the same (kind, size, seed) always yields the same
+text and benchmark results are comparable across runs and machines.
+"""
+
+import random
+
+WORDS = (
+    "the of and to in is was for that with as on by at from this which be are were "
+    "report committee market system analysis result period growth value review data "
+    "document process section agreement party model figure table change increase"
+).split()
+
+
+def _sentence(rng: random.Random, min_words: int = 6, max_words: int = 18) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return ' '.join(words).capitalize() + rng.choice('...!?')
+
+
+def _markdown_paragraph(rng: random.Random, n: int) -> str:
+    choice = rng.randrange(5)
+    if choice == 0:
+        return f"{'#' * rng.randint(1, 4)} Section {n}: **{rng.choice(WORDS).title()}**"
+    if choice == 1:
+        return '\n'.join(f"- Item with `code_{i}` and *{rng.choice(WORDS)}*" for i in range(rng.randint(2, 5)))
+    if choice == 2:
+        return f"> {_sentence(rng)} See [the {rng.choice(WORDS)}](https://example.com/{n}) for more."
+    if choice == 3:
+        return f"```python\nvalue_{n} = compute({n})\n```"
+    return f"{_sentence(rng)} The __{rng.choice(WORDS)}__ {_sentence(rng)}"
+
+
+def _pdf_paragraph(rng: random.Random, n: int) -> str:
+    text = ' '.join(_sentence(rng) for _ in range(rng.randint(3, 6)))
+    # Hard wrap at ~70 columns with an occasional hyphenated break
+    lines, line = [], ''
+    for word in text.split():
+        if len(line) + len(word) + 1 > 70:
+            if rng.random() < 0.1 and len(word) > 4:
+                lines.append(f"{line} {word[:3]}-")
+                line = word[3:]
+                continue
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    lines.append(line)
+    if n % 10 == 9:
+        lines.append(f"\n{n // 10 + 1}\n")  # Page number artifact
+    return '\n'.join(lines)
+
+
+def _numbers_paragraph(rng: random.Random, n: int) -> str:
+    return (
+        f"In Q{rng.randint(1, 4)} revenue was {rng.randint(1, 9999)}.{rng.randint(0, 99):02d} million, "
+        f"up {rng.randint(1, 99)}% from {rng.randint(1, 9999)}; costs fell to {rng.uniform(0, 1000):.3f} "
+        f"and headcount reached {rng.randint(10, 9999)}. Item {n} of {rng.randint(n + 1, n + 9999)} "
+        f"was priced at {rng.randint(1, 999)}.{rng.randint(0, 99)} over {rng.randint(2, 60)} months."
+    )
+
+
+def _urls_paragraph(rng: random.Random, n: int) -> str:
+    return (
+        f"{_sentence(rng)} Visit https://example.com/{rng.choice(WORDS)}/{n}?ref={rng.randint(1, 999)} "
+        f"or www.{rng.choice(WORDS)}.org, email user{n}@example.com, cc @team{n % 7} #{rng.choice(WORDS)} "
+        f"[{n % 30}] (source: archive) and see /usr/share/doc/{rng.choice(WORDS)}.txt & <b>notes</b>."
+    )
+
+
+GENERATORS = {
+    'markdown': _markdown_paragraph,
+    'pdf': _pdf_paragraph,
+    'numbers': _numbers_paragraph,
+    'urls': _urls_paragraph,
+}
+
+KINDS = list(GENERATORS) + ['mixed']
+
+
+def generate(kind: str, size_bytes: int, seed: int = 0) -> str:
+    """
+    Generate a corpus document of approximately size_bytes.
+
+    Args:
+        kind: One of KINDS ('mixed' interleaves all the others)
+        size_bytes: Target size in UTF-8 bytes (the result may exceed it by one paragraph)
+        seed: Random seed
+
+    Returns:
+        Document text with paragraphs separated by blank lines
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown corpus kind: {kind}. Valid: {KINDS}")
+
+    rng = random.Random(f"{kind}:{seed}")
+    generators = list(GENERATORS.values())
+    parts = []
+    total = 0
+    n = 0
+    while total < size_bytes:
+        generator = generators[n % len(generators)] if kind == 'mixed' else GENERATORS[kind]
+        paragraph = generator(rng, n)
+        parts.append(paragraph)
+        total += len(paragraph.encode('utf-8')) + 2
+        n += 1
+    return '\n\n'.join(parts)
+
+
+def parse_size(value: str) -> int:
+    """Parse sizes like '1KB', '10MB' or '512' into bytes."""
+    value = value.strip().upper()
+    for suffix, factor in (('KB', 1024), ('MB', 1024 * 1024), ('B', 1)):
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * factor)
+    return int(value)
+
+
+def generate_pdf(path: str, pages: int, kind: str = 'pdf', seed: int = 0,
+                 header: str = None, footer: str = None) -> str:
+    """
+    Write a synthetic text PDF with one corpus excerpt per page.
+
+    Args:
+        path: Output file path
+        pages: Number of pages
+        kind: Corpus kind used for page text
+        seed: Random seed
+        header: Optional running header drawn at the top of every page
+        footer: Optional footer drawn at the bottom; '{page}' is replaced
+            with the page number
+
+    Returns:
+        The output path
+    """
+    import fitz
+
+    text = generate(kind, pages * 2000, seed)
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        excerpt = text[page_num * 2000:(page_num + 1) * 2000]
+        if header:
+            page.insert_text((72, 40), header, fontsize=9)
+        page.insert_textbox(fitz.Rect(72, 72, page.rect.width - 72, page.rect.height - 72), excerpt, fontsize=10)
+        if footer:
+            page.insert_text((72, page.rect.height - 36), footer.format(page=page_num + 1), fontsize=9)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def generate_docx(path: str, size_bytes: int, kind: str = 'pdf', seed: int = 0) -> str:
+    """
+    Write a synthetic DOCX with one paragraph per corpus paragraph.
+
+    Args:
+        path: Output file path
+        size_bytes: Approximate amount of text
+        kind: Corpus kind used for paragraph text
+        seed: Random seed
+
+    Returns:
+        The output path
+    """
+    from docx import Document
+    from docx.oxml import OxmlElement
+
+    doc = Document()
+    # Insert paragraph elements directly: Document.add_paragraph searches
+    # the body for its insertion point, which is quadratic for large files
+    sect_pr = doc.element.body[-1]
+    for paragraph in generate(kind, size_bytes, seed).split('\n\n'):
+        p, r, t = OxmlElement('w:p'), OxmlElement('w:r'), OxmlElement('w:t')
+        t.text = paragraph
+        r.append(t)
+        p.append(r)
+        sect_pr.addprevious(p)
+    doc.save(path)
+    return path
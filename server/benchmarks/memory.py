@@ -0,0 +1,18 @@
+"""Peak memory measurement shared by the extraction benchmarks."""
+
+import resource
+import sys
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in KB."""
+    try:
+        # Per address space, so not inherited from the parent like ru_maxrss
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
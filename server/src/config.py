@@ -21,6 +21,11 @@ class Settings:
     DEFAULT_SPEED: float = float(os.getenv("DEFAULT_SPEED", "1.0"))
     MAX_CHUNK_TOKENS: int = int(os.getenv("MAX_CHUNK_TOKENS", "250"))
 
+    # Text normalization: inputs of at least PARALLEL_NORMALIZE_MIN_CHARS are
+    # normalized across NORMALIZE_WORKERS processes (1 = always serial)
+    NORMALIZE_WORKERS: int = int(os.getenv("NORMALIZE_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PARALLEL_NORMALIZE_MIN_CHARS: int = int(os.getenv("PARALLEL_NORMALIZE_MIN_CHARS", "2000000"))
+
     # Sherpa-ONNX settings
     SHERPA_MODEL_DIR: str = os.getenv(
         "SHERPA_MODEL_DIR",
@@ -41,6 +46,76 @@ class Settings:
     # File uploads
     MAX_UPLOAD_SIZE_MB: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", "100"))
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "/tmp/openmobiletts_uploads")
+    # Documents up to this size are parsed from memory; larger ones are
+    # written to UPLOAD_DIR first (0 = always write to disk)
+    UPLOAD_SPOOL_MAX_KB: int = int(os.getenv("UPLOAD_SPOOL_MAX_KB", "4096"))
+
+    # Threads for blocking document work (upload writes, extraction,
+    # preprocessing); limits how many documents are processed at once
+    DOCUMENT_WORKERS: int = int(os.getenv("DOCUMENT_WORKERS", "2"))
+
+    # Extracted text and chunk lists, keyed by the SHA-256 of the upload;
+    # least recently used entries are evicted past DOCUMENT_CACHE_MB (0 = off)
+    DOCUMENT_CACHE_DIR: str = os.getenv(
+        "DOCUMENT_CACHE_DIR",
+        str(Path.home() / ".cache" / "openmobiletts" / "documents"),
+    )
+    DOCUMENT_CACHE_MB: int = int(os.getenv("DOCUMENT_CACHE_MB", "256"))
+
+    # Uploaded documents are kept server-side under a document ID so they can
+    # be streamed without re-posting the text; the TTL renews on each access.
+    # Least recently used handles are dropped past DOCUMENT_HANDLE_MAX handles
+    # or DOCUMENT_HANDLE_MAX_MB of text and chunk lists in memory
+    DOCUMENT_HANDLE_TTL_SECONDS: int = int(os.getenv("DOCUMENT_HANDLE_TTL_SECONDS", "3600"))
+    DOCUMENT_HANDLE_MAX: int = int(os.getenv("DOCUMENT_HANDLE_MAX", "32"))
+    DOCUMENT_HANDLE_MAX_MB: float = float(os.getenv("DOCUMENT_HANDLE_MAX_MB", "128"))
+
+    # PDF extraction: PDFs with at least PDF_PARALLEL_MIN_PAGES pages are
+    # extracted across PDF_EXTRACT_WORKERS processes (1 = always serial)
+    PDF_EXTRACT_WORKERS: int = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "100"))
+    # Drop running headers/footers repeated at the same position across pages
+    PDF_STRIP_RUNNING_LINES: bool = os.getenv("PDF_STRIP_RUNNING_LINES", "true").lower() == "true"
+
+    # Speech-to-text: STT_RECOGNIZERS Moonshine recognizers (one model copy
+    # each) serve concurrent requests, each using STT_NUM_THREADS threads.
+    # Every decode borrows one, so at most STT_RECOGNIZERS decodes run at
+    # once across all requests and batches (see STT_WORKERS)
+    STT_RECOGNIZERS: int = int(os.getenv("STT_RECOGNIZERS", "1"))
+    STT_NUM_THREADS: int = int(os.getenv("STT_NUM_THREADS", "4"))
+    # Load the STT model in the background at startup instead of on the
+    # first STT request
+    STT_PRELOAD: bool = os.getenv("STT_PRELOAD", "false").lower() == "true"
+    # Recordings longer than STT_LONG_AUDIO_SECONDS are cut into speech
+    # segments (Silero VAD when STT_VAD_MODEL exists, otherwise an energy
+    # detector) and decoded in batches of STT_BATCH_SIZE across STT_WORKERS
+    # threads of a pool shared by all requests. STT_WORKERS is capped at
+    # STT_RECOGNIZERS: with one recognizer batches are decoded one after
+    # another, so raise both together to decode a recording in parallel
+    STT_LONG_AUDIO_SECONDS: float = float(os.getenv("STT_LONG_AUDIO_SECONDS", "30"))
+    STT_MAX_SEGMENT_SECONDS: float = float(os.getenv("STT_MAX_SEGMENT_SECONDS", "20"))
+    STT_MIN_SILENCE_SECONDS: float = float(os.getenv("STT_MIN_SILENCE_SECONDS", "0.5"))
+    STT_BATCH_SIZE: int = int(os.getenv("STT_BATCH_SIZE", "8"))
+    STT_WORKERS: int = int(os.getenv("STT_WORKERS", str(min(2, os.cpu_count() or 1))))
+    STT_VAD_MODEL: str = os.path.expanduser(
+        os.getenv("STT_VAD_MODEL", str(Path.home() / ".cache" / "silero_vad.onnx"))
+    )
+    # Transcripts by upload hash and decoded-audio fingerprint; least
+    # recently used entries are evicted past STT_CACHE_MB (0 = off)
+    STT_CACHE_DIR: str = os.getenv(
+        "STT_CACHE_DIR",
+        str(Path.home() / ".cache" / "openmobiletts" / "transcripts"),
+    )
+    STT_CACHE_MB: int = int(os.getenv("STT_CACHE_MB", "32"))
+    # Live transcription (WebSocket): seconds of new audio between partial
+    # hypotheses for the utterance in progress
+    STT_PARTIAL_INTERVAL_SECONDS: float = float(os.getenv("STT_PARTIAL_INTERVAL_SECONDS", "1.0"))
+
+    # Project autosaves: a project is written once it has had no update for
+    # PROJECT_WRITE_DELAY_SECONDS (0 = write every update), and at least every
+    # PROJECT_MAX_WRITE_DELAY_SECONDS while updates keep coming
+    PROJECT_WRITE_DELAY_SECONDS: float = float(os.getenv("PROJECT_WRITE_DELAY_SECONDS", "2.0"))
+    PROJECT_MAX_WRITE_DELAY_SECONDS: float = float(os.getenv("PROJECT_MAX_WRITE_DELAY_SECONDS", "10.0"))
 
     # Static files (built client) — auto-detected if empty
     STATIC_DIR: str = os.getenv("STATIC_DIR", "")
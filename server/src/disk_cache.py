@@ -0,0 +1,159 @@
+"""Size-bounded LRU store of JSON entries on disk.
+
+Shared by the document and transcript caches. Each entry is one JSON file
+named by its key; file modification times carry recency across restarts.
+Writes go to a temp file that is renamed into place, and the least
+recently used entries are evicted once the total size passes the limit.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class DiskLruCache:
+    """Base class: subclasses define what an entry holds.
+
+    Hooks:
+        _accept(key, path): called for each file found at startup; return
+            False to delete it (default keeps every file without reading it)
+        _evicted(keys): called with the lock held after entries are evicted
+            or removed, to drop any in-memory references to them
+    """
+
+    NAME = "Cache"  # Used in log messages
+
+    def __init__(self, cache_dir: str, max_mb: int):
+        """
+        Initialize the cache and index existing entries.
+
+        Args:
+            cache_dir: Directory for cache files
+            max_mb: Maximum total size in MB; 0 disables the cache
+        """
+        self._dir = Path(cache_dir).expanduser()
+        self.max_bytes = max_mb * 1024 * 1024
+        # Reentrant: held across a read-merge-write (_update)
+        self._lock = threading.RLock()
+        # key -> file size, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        if self.enabled:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            entries = sorted(self._dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+            for path in entries:
+                if not self._accept(path.stem, path):
+                    path.unlink(missing_ok=True)
+                    continue
+                size = path.stat().st_size
+                self._index[path.stem] = size
+                self._total_bytes += size
+            logger.info(f"{self.NAME}: {len(self._index)} entries, {self._total_bytes} bytes in {self._dir}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _accept(self, key: str, path: Path) -> bool:
+        return True
+
+    def _evicted(self, keys: List[str]) -> None:
+        pass
+
+    def _get(self, key: str) -> Optional[dict]:
+        """Entry stored under key, updating recency; None if absent or unreadable."""
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        path = self._path(key)
+        entry = self._load(path)
+        if entry is None:
+            logger.warning(f"{self.NAME}: dropping unreadable entry {key}")
+            self._remove(key)
+            return None
+        try:
+            os.utime(path)  # Persist recency across restarts
+        except OSError:
+            pass
+        return entry
+
+    def _read(self, key: str) -> Optional[dict]:
+        """Read an entry without updating recency."""
+        if key not in self._index:
+            return None
+        return self._load(self._path(key))
+
+    def _update(self, key: str, merge: Callable[[Optional[dict]], dict]) -> bool:
+        """
+        Read, merge and rewrite an entry with the lock held, so concurrent
+        updates of one key cannot drop each other's changes.
+
+        Args:
+            key: Entry key
+            merge: Given the current entry (or None), returns the entry to store
+
+        Returns:
+            True if the entry was stored
+        """
+        with self._lock:
+            return self._store(key, merge(self._read(key)))
+
+    def _store(self, key: str, entry: dict) -> bool:
+        """Write an entry and evict least recently used ones past the limit."""
+        data = json.dumps(entry, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.info(f"{self.NAME}: entry too large to cache: {size} bytes")
+            return False
+
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            evicted = []
+            while self._total_bytes > self.max_bytes and len(self._index) > 1:
+                old_key, old_size = self._index.popitem(last=False)
+                self._total_bytes -= old_size
+                evicted.append(old_key)
+            if evicted:
+                self._evicted(evicted)
+
+        for old_key in evicted:
+            self._path(old_key).unlink(missing_ok=True)
+        if evicted:
+            logger.info(f"{self.NAME}: evicted {len(evicted)} entries")
+        return True
+
+    def _remove(self, key: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+            self._evicted([key])
+        self._path(key).unlink(missing_ok=True)
+
+    def _size_stats(self) -> dict:
+        """Entry count and sizes; call with the lock held."""
+        return {"entries": len(self._index), "bytes": self._total_bytes, "max_bytes": self.max_bytes}
+
+    @staticmethod
+    def _load(path: Path) -> Optional[dict]:
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) else None
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}.json"
@@ -0,0 +1,104 @@
+"""Content-addressed on-disk cache of extracted and chunked documents.
+
+Entries are keyed by the SHA-256 of the uploaded bytes, the file extension
+and the extraction fingerprint (DocumentProcessor.cache_fingerprint), so
+re-uploading the same document from any device skips
+extraction and preprocessing. The cache is bounded in size and evicts the
+least recently used entries first.
+"""
+
+from typing import List, Optional
+
+from .config import settings
+from .disk_cache import DiskLruCache
+
+
+class DocumentCache(DiskLruCache):
+    """Size-bounded LRU cache of document text and chunk lists on disk.
+
+    Each entry is one JSON file: {"text": str, "chunks": {variant: [...]}},
+    where a variant identifies the preprocessing settings the chunks were
+    produced with (see variant()).
+    """
+
+    NAME = "Document cache"
+
+    def __init__(self, cache_dir: str = None, max_mb: int = None):
+        """
+        Initialize the cache and index existing entries.
+
+        Args:
+            cache_dir: Directory for cache files (default from settings)
+            max_mb: Maximum total size in MB; 0 disables the cache
+                (default from settings)
+        """
+        self.hits = 0
+        self.misses = 0
+        super().__init__(
+            cache_dir or settings.DOCUMENT_CACHE_DIR,
+            settings.DOCUMENT_CACHE_MB if max_mb is None else max_mb,
+        )
+
+    @staticmethod
+    def make_key(content_hash: str, suffix: str, extraction: str) -> str:
+        """
+        Cache key for uploaded bytes.
+
+        Args:
+            content_hash: SHA-256 of the upload
+            suffix: File extension
+            extraction: DocumentProcessor.cache_fingerprint; entries from
+                another extractor version or settings are never served
+        """
+        return f"{content_hash}{suffix.lower().replace('.', '_')}_{extraction}"
+
+    @staticmethod
+    def variant(language: Optional[str], max_chunk_tokens: int) -> str:
+        """Identify the preprocessing settings a chunk list was produced with."""
+        return f"{language or 'default'}:{max_chunk_tokens}"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached entry for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        entry = self._get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def get_chunks(self, entry: Optional[dict], variant: str) -> Optional[List[dict]]:
+        """Chunk list for a variant from a cached entry, if present."""
+        if entry is None:
+            return None
+        return entry.get("chunks", {}).get(variant)
+
+    def put(self, key: str, text: str, variant: str = None, chunks: List[dict] = None) -> None:
+        """
+        Store extracted text (and optionally a chunk list) for key.
+
+        Chunk lists for other variants already in the entry are kept.
+
+        Args:
+            key: Cache key from make_key()
+            text: Extracted document text
+            variant: Preprocessing variant of chunks
+            chunks: Chunk list produced by TextPreprocessor.process
+        """
+        if not self.enabled:
+            return
+
+        def merge(existing):
+            all_chunks = existing.get("chunks", {}) if existing else {}
+            if variant is not None and chunks is not None:
+                all_chunks[variant] = chunks
+            return {"text": text, "chunks": all_chunks}
+
+        self._update(key, merge)
+
+    def stats(self) -> dict:
+        """Cache size and hit statistics."""
+        with self._lock:
+            return {**self._size_stats(), "hits": self.hits, "misses": self.misses}
@@ -1,27 +1,107 @@
 """Document processing for extracting text from PDF and DOCX files."""
 
+import bisect
+import io
+import mmap
 import re
+import zipfile
+import xml.etree.ElementTree as ET
+from itertools import islice, repeat
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import fitz  # PyMuPDF - for memory-efficient page-by-page extraction
-from docx import Document
 
+from .config import settings
 from .logging_config import get_logger, preview_text
+from .process_pools import get_process_pool
+from .running_lines import RunningLineFilter
 
 logger = get_logger(__name__)
 
+# One or more characters other than the given one, never spanning a blank
+# line, so markdown is stripped the same whole or block by block
+_MD_SPAN = r'(?:[^{0}\n]|\n(?![ \t]*\n))[^{0}\n]*(?:\n(?![ \t]*\n)[^{0}\n]*)*'
+
+# WordprocessingML element names used by the streaming DOCX extractor
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_BODY = _W + 'body'
+_W_P = _W + 'p'
+_W_R = _W + 'r'
+_W_T = _W + 't'
+_W_BR = _W + 'br'
+_W_HYPERLINK = _W + 'hyperlink'
+_W_BR_TYPE = _W + 'type'
+# Text equivalents of run content, as in python-docx's Run.text
+_W_RUN_TEXT = {_W + 'tab': '\t', _W + 'ptab': '\t', _W + 'cr': '\n', _W + 'noBreakHyphen': '-'}
+
+
+def _extract_pdf_range(filepath: str, start: int, stop: int) -> List[str]:
+    """Process pool entry point: cleaned text of non-empty pages [start, stop)."""
+    doc = fitz.open(filepath)
+    try:
+        pages = []
+        for page_num in range(start, stop):
+            page_text = doc[page_num].get_text("text")
+            if page_text.strip():
+                pages.append(DocumentProcessor._clean_pdf_text(page_text))
+        return pages
+    finally:
+        doc.close()
+
 
 class DocumentProcessor:
     """Extract text from PDF and DOCX documents."""
 
     SUPPORTED_FORMATS = {'.pdf', '.docx', '.txt', '.md'}
 
-    def extract(self, filepath: str) -> str:
+    # Bump when a change alters extracted text, so cached extractions
+    # made by the previous version are not served (see cache_fingerprint)
+    EXTRACTION_VERSION = 2
+
+    # Paragraph-based formats are yielded in blocks of at least this many chars
+    BLOCK_CHARS = 4000
+    # Text/markdown files are decoded in blocks of about this many bytes,
+    # cut at paragraph breaks
+    TEXT_BLOCK_BYTES = 256 * 1024
+
+    def __init__(
+        self,
+        pdf_workers: int = None,
+        pdf_parallel_min_pages: int = None,
+        strip_running_lines: bool = None,
+    ):
+        """
+        Initialize the document processor.
+
+        Args:
+            pdf_workers: Processes used for parallel PDF extraction
+                (default from settings; 1 disables parallel mode)
+            pdf_parallel_min_pages: Page count at which PDFs are extracted
+                in parallel (default from settings)
+            strip_running_lines: Drop PDF headers/footers repeated across
+                pages (default from settings)
+        """
+        self.pdf_workers = pdf_workers or settings.PDF_EXTRACT_WORKERS
+        self.pdf_parallel_min_pages = pdf_parallel_min_pages or settings.PDF_PARALLEL_MIN_PAGES
+        self.strip_running_lines = (
+            settings.PDF_STRIP_RUNNING_LINES if strip_running_lines is None else strip_running_lines
+        )
+
+    @property
+    def cache_fingerprint(self) -> str:
+        """Identify the extractor version and the settings that change its output."""
+        return f"x{self.EXTRACTION_VERSION}{'r' if self.strip_running_lines else ''}"
+
+    def extract(self, filepath: str, data: Optional[bytes] = None) -> str:
         """
         Extract text from a document file.
 
         Args:
-            filepath: Path to the document file
+            filepath: Path to the document file (only its name is used
+                when data is given)
+            data: Document content already in memory; parsed directly
+                instead of reading filepath
 
         Returns:
             Extracted text content
@@ -31,7 +111,7 @@ class DocumentProcessor:
         """
         path = Path(filepath)
         suffix = path.suffix.lower()
-        file_size = path.stat().st_size
+        file_size = len(data) if data is not None else path.stat().st_size
 
         logger.info(f"Extracting document: {path.name} ({suffix}, {file_size} bytes)")
 
@@ -43,13 +123,13 @@ class DocumentProcessor:
             )
 
         if suffix == '.pdf':
-            text = self.extract_pdf(filepath)
+            text = self.extract_pdf(filepath, data)
         elif suffix == '.docx':
-            text = self.extract_docx(filepath)
+            text = self.extract_docx(filepath, data)
         elif suffix == '.txt':
-            text = self.extract_txt(filepath)
+            text = self.extract_txt(filepath, data)
         elif suffix == '.md':
-            text = self.extract_markdown(filepath)
+            text = self.extract_markdown(filepath, data)
         else:
             raise ValueError(f"Unsupported format: {suffix}")
 
@@ -57,7 +137,175 @@ class DocumentProcessor:
         logger.debug(f"Extracted text preview: {preview_text(text, 300)}")
         return text
 
-    def extract_pdf(self, filepath: str) -> str:
+    def extract_iter(self, filepath: str, data: Optional[bytes] = None) -> Iterator[str]:
+        """
+        Extract text from a document incrementally.
+
+        PDFs are yielded page by page as PyMuPDF produces them, DOCX files in
+        blocks of paragraphs as word/document.xml is parsed, and text and
+        markdown files in blocks decoded from a memory map, so callers can
+        start preprocessing and synthesis before the whole document is parsed.
+
+        Args:
+            filepath: Path to the document file
+            data: Document content already in memory (see extract)
+
+        Yields:
+            Non-empty text blocks in document order
+
+        Raises:
+            ValueError: If file format is not supported
+        """
+        suffix = Path(filepath).suffix.lower()
+        if suffix == '.pdf':
+            yield from self.iter_pdf_pages(filepath, data)
+        elif suffix == '.docx':
+            yield from self._group_paragraphs(self.iter_docx_paragraphs(filepath, data))
+        elif suffix in ('.txt', '.md'):
+            yield from self.iter_text_blocks(filepath, data, markdown=suffix == '.md')
+        else:
+            raise ValueError(f"Unsupported format: {suffix}")
+
+    def build_index(self, filepath: str, data: Optional[bytes] = None) -> Dict:
+        """
+        Build a seek index for extract_range.
+
+        PDFs are indexed by page from the page count and outline alone, with
+        no text extracted. Other formats are indexed by paragraph, with each
+        paragraph's character offset in the extract() text.
+
+        Args:
+            filepath: Path to the document file
+            data: Document content already in memory (see extract)
+
+        Returns:
+            {"unit": "page" | "paragraph", "count": int, "offsets": [int],
+            "total_chars": int | None, "toc": [{"level": int, "title": str,
+            "position": int}]}. Positions are 0-based page or paragraph
+            indices; offsets and total_chars are only known for paragraphs.
+        """
+        suffix = Path(filepath).suffix.lower()
+        if suffix == '.pdf':
+            doc = fitz.open(stream=data, filetype='pdf') if data is not None else fitz.open(filepath)
+            try:
+                page_count = len(doc)
+                toc = [
+                    {"level": level, "title": title.strip(), "position": page - 1}
+                    for level, title, page in doc.get_toc(simple=True)
+                    if 1 <= page <= page_count
+                ]
+            finally:
+                doc.close()
+            logger.info(f"Indexed PDF: {page_count} pages, {len(toc)} outline entries")
+            return {"unit": "page", "count": page_count, "offsets": [], "total_chars": None, "toc": toc}
+
+        offsets = []
+        total_chars = 0
+        for offset, paragraph in self._iter_paragraph_offsets(filepath, data):
+            offsets.append(offset)
+            total_chars = offset + len(paragraph)
+        logger.info(f"Indexed {suffix} document: {len(offsets)} paragraphs, {total_chars} chars")
+        return {"unit": "paragraph", "count": len(offsets), "offsets": offsets, "total_chars": total_chars, "toc": []}
+
+    @staticmethod
+    def position_for_offset(index: Dict, offset: int) -> int:
+        """Index position of the paragraph containing a character offset."""
+        if index["unit"] != "paragraph":
+            raise ValueError("Character offsets are only indexed for paragraph-based formats")
+        return max(0, bisect.bisect_right(index["offsets"], offset) - 1)
+
+    def locate_offset(self, filepath: str, data: Optional[bytes] = None, offset: int = 0) -> int:
+        """
+        Paragraph position containing a character offset, like
+        position_for_offset, without indexing the whole document.
+
+        Paragraphs are read only up to the one holding the offset.
+
+        Raises:
+            ValueError: For PDFs, which are indexed by page
+        """
+        if Path(filepath).suffix.lower() == '.pdf':
+            raise ValueError("Character offsets are only indexed for paragraph-based formats")
+        position = 0
+        for n, (paragraph_offset, _) in enumerate(self._iter_paragraph_offsets(filepath, data)):
+            if paragraph_offset > offset:
+                break
+            position = n
+        return position
+
+    def extract_range(
+        self, filepath: str, data: Optional[bytes] = None, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Extract only part of a document, like extract_iter.
+
+        For PDFs, start/end are 0-based page indices and only those pages are
+        opened. For other formats they are paragraph indices (see
+        build_index); paragraphs are yielded in blocks.
+
+        Args:
+            filepath: Path to the document file
+            data: Document content already in memory (see extract)
+            start: First page/paragraph (inclusive)
+            end: Last page/paragraph (exclusive; None for the end)
+
+        Yields:
+            Non-empty text blocks in document order
+        """
+        if start < 0 or (end is not None and end < start):
+            raise ValueError(f"Invalid range: {start}-{end}")
+        suffix = Path(filepath).suffix.lower()
+        if suffix == '.pdf':
+            yield from self.iter_pdf_pages(filepath, data, start, end)
+            return
+        paragraphs = (p for _, p in self._iter_paragraph_offsets(filepath, data))
+        yield from self._group_paragraphs(islice(paragraphs, start, end))
+
+    def _iter_paragraph_offsets(self, filepath: str, data: Optional[bytes] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (offset in extract() text, stripped paragraph) for non-PDF formats."""
+        if Path(filepath).suffix.lower() == '.docx':
+            # extract_docx joins these paragraphs with blank lines
+            offset = 0
+            for paragraph in self.iter_docx_paragraphs(filepath, data):
+                yield offset, paragraph
+                offset += len(paragraph) + 2
+            return
+
+        # Read block by block (see iter_text_blocks) so memory stays bounded
+        # and a range stops reading at its end. Blocks are cut at blank
+        # lines, so no paragraph spans two of them.
+        if Path(filepath).suffix.lower() == '.md':
+            # extract_markdown joins the stripped blocks with blank lines
+            blocks = self.iter_text_blocks(filepath, data, markdown=True)
+            separator = 2
+        else:
+            # extract_txt is the decoded file, so offsets count every character
+            blocks = self._iter_raw_text_blocks(filepath, data)
+            separator = 0
+        block_offset = 0
+        for block in blocks:
+            # Split on blank lines, keeping separators (odd items) to track offsets
+            offset = block_offset
+            for n, part in enumerate(re.split(r'(\n[ \t]*\n\s*)', block)):
+                stripped = part.strip()
+                if n % 2 == 0 and stripped:
+                    yield offset + len(part) - len(part.lstrip()), stripped
+                offset += len(part)
+            block_offset += len(block) + separator
+
+    def _group_paragraphs(self, paragraphs: Iterable[str]) -> Iterator[str]:
+        """Join paragraphs into blocks of at least BLOCK_CHARS characters."""
+        block, block_chars = [], 0
+        for paragraph in paragraphs:
+            block.append(paragraph)
+            block_chars += len(paragraph)
+            if block_chars >= self.BLOCK_CHARS:
+                yield '\n\n'.join(block)
+                block, block_chars = [], 0
+        if block:
+            yield '\n\n'.join(block)
+
+    def extract_pdf(self, filepath: str, data: Optional[bytes] = None) -> str:
         """
         Extract text from PDF using memory-efficient page-by-page extraction.
 
@@ -66,117 +314,325 @@ class DocumentProcessor:
 
         Args:
             filepath: Path to PDF file
+            data: PDF content already in memory
 
         Returns:
             Extracted text in plain format
         """
-        doc = fitz.open(filepath)
-        text_parts = []
+        # Join pages with double newlines for paragraph structure
+        text = '\n\n'.join(self.iter_pdf_pages(filepath, data))
+        logger.debug(f"PDF extracted: {len(text)} chars, {text.count(chr(10))} newlines")
+        return text
+
+    def iter_pdf_pages(
+        self, filepath: str, data: Optional[bytes] = None, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Yield cleaned-up text of each non-empty PDF page.
+
+        PDFs with at least pdf_parallel_min_pages pages (in the requested
+        range) are split into page ranges extracted across a process pool;
+        pages are still yielded in order, as soon as their range is done.
+        In-memory PDFs are always extracted serially, since worker processes
+        open the file by path. Running headers and footers are removed
+        (see RunningLineFilter) unless strip_running_lines is off.
+
+        Args:
+            filepath: Path to PDF file
+            data: PDF content already in memory
+            start: First page index (inclusive)
+            end: Last page index (exclusive; None for the last page)
+
+        Yields:
+            Page text with excessive whitespace collapsed
+        """
+        pages = self._iter_raw_pdf_pages(filepath, data, start, end)
+        if not self.strip_running_lines:
+            yield from pages
+            return
 
+        running_lines = RunningLineFilter()
         try:
-            total_pages = len(doc)
-            logger.debug(f"PDF has {total_pages} pages")
+            yield from running_lines.filter(pages)
+        finally:
+            pages.close()
+        if running_lines.removed_lines:
+            logger.info(
+                f"Removed {running_lines.removed_lines} running header/footer lines from "
+                f"{Path(filepath).name}: {running_lines.removed_chars} chars, "
+                f"~{running_lines.saved_seconds:.0f}s of speech"
+            )
+
+    def _iter_raw_pdf_pages(
+        self, filepath: str, data: Optional[bytes], start: int, end: Optional[int]
+    ) -> Iterator[str]:
+        """Yield cleaned text of non-empty pages [start, end), serially or in parallel."""
+        doc = fitz.open(stream=data, filetype='pdf') if data is not None else fitz.open(filepath)
+        total_pages = len(doc)
+        stop = total_pages if end is None else min(end, total_pages)
+        logger.debug(f"PDF has {total_pages} pages, extracting {start}-{stop}")
 
-            for page_num in range(total_pages):
+        if data is None and self.pdf_workers > 1 and stop - start >= self.pdf_parallel_min_pages:
+            doc.close()
+            yield from self._iter_pdf_pages_parallel(filepath, start, stop)
+            return
+
+        try:
+            for page_num in range(start, stop):
                 page = doc[page_num]
                 # Extract text with layout preservation for better reading order
                 page_text = page.get_text("text")
                 if page_text.strip():
-                    text_parts.append(page_text.strip())
                     logger.debug(f"Page {page_num + 1}: {len(page_text)} chars extracted")
+                    yield self._clean_pdf_text(page_text)
         finally:
             doc.close()
 
-        # Join pages with double newlines for paragraph structure
-        text = '\n\n'.join(text_parts)
-        pre_cleanup_len = len(text)
-        pre_cleanup_newlines = text.count('\n')
-
-        # Clean up excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
+    def _iter_pdf_pages_parallel(self, filepath: str, start: int, stop: int) -> Iterator[str]:
+        """Extract page ranges across the process pool and yield pages in order."""
+        # Several small ranges per worker keep the pool busy and the first
+        # pages available early for streaming
+        total_pages = stop - start
+        range_size = max(8, -(-total_pages // (self.pdf_workers * 4)))
+        starts = list(range(start, stop, range_size))
+        stops = [min(s + range_size, stop) for s in starts]
+        logger.info(f"Parallel PDF extraction: {total_pages} pages in {len(starts)} ranges across {self.pdf_workers} workers")
+
+        # PyMuPDF is not thread-safe, so each process opens the file and
+        # takes a page range
+        pool = get_process_pool("pdf", self.pdf_workers)
+        for pages in pool.map(_extract_pdf_range, repeat(str(filepath)), starts, stops):
+            yield from pages
+
+    @staticmethod
+    def _clean_pdf_text(text: str) -> str:
+        """Collapse excessive whitespace in extracted PDF text."""
+        text = re.sub(r'\n{3,}', '\n\n', text.strip())
         text = re.sub(r' {2,}', ' ', text)
-
-        logger.debug(f"PDF cleanup: {pre_cleanup_len} -> {len(text)} chars, {pre_cleanup_newlines} -> {text.count(chr(10))} newlines")
-
         return text.strip()
 
-    def extract_docx(self, filepath: str) -> str:
+    @staticmethod
+    def _read_text(filepath: str, data: Optional[bytes] = None) -> str:
+        """Read a UTF-8 text file, or decode in-memory content the same way."""
+        if data is not None:
+            # Match text-mode reads: undecodable bytes replaced, newlines universal
+            return data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    def extract_docx(self, filepath: str, data: Optional[bytes] = None) -> str:
         """
         Extract text from DOCX file.
 
         Args:
             filepath: Path to DOCX file
+            data: DOCX content already in memory
 
         Returns:
             Extracted text
         """
-        doc = Document(filepath)
+        # Join with double newlines to preserve paragraph structure
+        return '\n\n'.join(self.iter_docx_paragraphs(filepath, data))
+
+    def iter_docx_paragraphs(self, filepath: str, data: Optional[bytes] = None) -> Iterator[str]:
+        """
+        Yield non-empty body paragraphs of a DOCX file.
 
-        # Extract paragraphs, filtering empty ones
-        paragraphs = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+        word/document.xml is parsed incrementally from the zip and each
+        paragraph is discarded once yielded, so memory stays flat however
+        long the document is. Paragraph text matches python-docx's
+        Document.paragraphs (top-level body paragraphs; tabs, breaks and
+        hyperlink text included), stripped.
 
-        # Join with double newlines to preserve paragraph structure
-        return '\n\n'.join(paragraphs)
+        Args:
+            filepath: Path to DOCX file
+            data: DOCX content already in memory
+
+        Yields:
+            Paragraph text in document order
 
-    def extract_txt(self, filepath: str) -> str:
+        Raises:
+            ValueError: If the file is not a valid DOCX document
+        """
+        try:
+            with zipfile.ZipFile(io.BytesIO(data) if data is not None else filepath) as archive:
+                with archive.open('word/document.xml') as xml:
+                    depth = 0
+                    body = None
+                    for event, elem in ET.iterparse(xml, events=('start', 'end')):
+                        if event == 'start':
+                            depth += 1
+                            if depth == 2 and elem.tag == _W_BODY:
+                                body = elem
+                            continue
+                        depth -= 1
+                        if depth == 2 and body is not None:
+                            # A complete top-level body element
+                            if elem.tag == _W_P:
+                                text = self._docx_paragraph_text(elem).strip()
+                                if text:
+                                    yield text
+                            body.clear()
+        except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+            raise ValueError(f"Invalid DOCX file: {e}") from e
+
+    @staticmethod
+    def _docx_paragraph_text(paragraph: ET.Element) -> str:
+        """Text of a w:p element, built the same way as python-docx's Paragraph.text."""
+        parts = []
+        for child in paragraph:
+            if child.tag == _W_R:
+                runs = (child,)
+            elif child.tag == _W_HYPERLINK:
+                runs = [r for r in child if r.tag == _W_R]
+            else:
+                continue
+            for run in runs:
+                for item in run:
+                    if item.tag == _W_T:
+                        parts.append(item.text or '')
+                    elif item.tag == _W_BR:
+                        # Only line breaks read as text; page/column breaks do not
+                        if item.get(_W_BR_TYPE, 'textWrapping') == 'textWrapping':
+                            parts.append('\n')
+                    elif item.tag in _W_RUN_TEXT:
+                        parts.append(_W_RUN_TEXT[item.tag])
+        return ''.join(parts)
+
+    def extract_txt(self, filepath: str, data: Optional[bytes] = None) -> str:
         """
         Extract text from plain text file.
 
         Args:
             filepath: Path to text file
+            data: File content already in memory
 
         Returns:
             File contents
         """
-        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-            text = f.read()
+        text = self._read_text(filepath, data)
         logger.debug(f"TXT file: {len(text)} chars, {text.count(chr(10))} newlines")
         return text
 
-    def extract_markdown(self, filepath: str) -> str:
+    def extract_markdown(self, filepath: str, data: Optional[bytes] = None) -> str:
         """
         Extract text from Markdown file, stripping formatting for TTS.
 
         Removes headers, bold/italic markers, links, images, code blocks,
-        and HTML tags while preserving readable text content.
+        and HTML tags while preserving readable text content. The file is
+        stripped block by block (see iter_text_blocks).
 
         Args:
             filepath: Path to Markdown file
+            data: File content already in memory
 
         Returns:
             Plain text suitable for speech synthesis
         """
-        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-            text = f.read()
+        text = '\n\n'.join(self.iter_text_blocks(filepath, data, markdown=True))
+        logger.debug(f"Markdown file: {len(text)} chars after stripping")
+        return text
 
+    def iter_text_blocks(self, filepath: str, data: Optional[bytes] = None, markdown: bool = False) -> Iterator[str]:
+        """
+        Yield a text or markdown file in blocks of whole paragraphs.
+
+        The file is memory-mapped and each block of about TEXT_BLOCK_BYTES,
+        cut at a blank line (never inside a fenced code block), is decoded
+        and, for markdown, stripped on its own. Peak memory follows the
+        block size rather than the file size.
+
+        Args:
+            filepath: Path to the text file
+            data: File content already in memory
+            markdown: Strip markdown formatting from each block
+
+        Yields:
+            Non-empty, stripped text blocks in file order
+        """
+        for text in self._iter_raw_text_blocks(filepath, data, markdown):
+            if markdown:
+                text = self._markdown_to_plain(text)
+            text = text.strip()
+            if text:
+                yield text
+
+    def _iter_raw_text_blocks(self, filepath: str, data: Optional[bytes] = None, markdown: bool = False) -> Iterator[str]:
+        """Decoded blocks of a text file, unstripped: joined they equal extract_txt()."""
+        if data is not None:
+            yield from self._iter_text_buffer(data, markdown)
+            return
+        with open(filepath, 'rb') as f:
+            if f.seek(0, io.SEEK_END) == 0:
+                return  # Empty files cannot be memory-mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                yield from self._iter_text_buffer(buf, markdown)
+
+    def _iter_text_buffer(self, buf, markdown: bool) -> Iterator[str]:
+        """Decode and yield raw blocks of a bytes-like buffer (bytes or mmap)."""
+        size = len(buf)
+        pos = 0
+        while pos < size:
+            end = self._next_block_end(buf, pos, size, markdown)
+            # Cut only at newlines, so multi-byte characters are never split
+            text = str(buf[pos:end], 'utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+            if isinstance(buf, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED'):
+                # Release mapped pages already decoded so RSS follows the block size
+                done = end - end % mmap.PAGESIZE
+                if done:
+                    buf.madvise(mmap.MADV_DONTNEED, 0, done)
+            pos = end
+            yield text
+
+    def _next_block_end(self, buf, pos: int, size: int, markdown: bool) -> int:
+        """End of the block starting at pos: the first blank line past the target size."""
+        end = pos + self.TEXT_BLOCK_BYTES
+        while end < size:
+            newline = buf.find(b'\n', end)
+            if newline == -1:
+                return size
+            end = newline + 1
+            # A blank line (LF or CRLF) ends the paragraph
+            if buf[end:end + 1] != b'\n' and buf[end:end + 2] != b'\r\n':
+                continue
+            # An odd number of fences means the cut would split a code block
+            if not markdown or buf[pos:end].count(b'```') % 2 == 0:
+                return end
+        return size
+
+    @staticmethod
+    def _markdown_to_plain(text: str) -> str:
+        """
+        Strip markdown formatting from text, keeping the readable content.
+
+        Inline patterns never match across a blank line (see _MD_SPAN).
+        """
         # Remove fenced code blocks
         text = re.sub(r'```[\s\S]*?```', '', text)
         # Remove inline code (preserve content)
-        text = re.sub(r'`([^`]+)`', r'\1', text)
+        text = re.sub(r'`(%s)`' % _MD_SPAN.format('`'), r'\1', text)
         # Remove images ![alt](url)
-        text = re.sub(r'!\[([^\]]*)\]\([^)]*\)', r'\1', text)
+        text = re.sub(r'!\[([^\]\n]*)\]\([^)\n]*\)', r'\1', text)
         # Convert links [text](url) to just text
-        text = re.sub(r'\[([^\]]*)\]\([^)]*\)', r'\1', text)
+        text = re.sub(r'\[([^\]\n]*)\]\([^)\n]*\)', r'\1', text)
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = re.sub(r'<%s>' % _MD_SPAN.format('>'), '', text)
         # Remove header markers
-        text = re.sub(r'(?m)^#{1,6}\s+', '', text)
+        text = re.sub(r'(?m)^#{1,6}[ \t]+', '', text)
         # Remove bold/italic markers
-        text = re.sub(r'\*{1,3}([^*]+)\*{1,3}', r'\1', text)
-        text = re.sub(r'_{1,3}([^_]+)_{1,3}', r'\1', text)
+        text = re.sub(r'\*{1,3}(%s)\*{1,3}' % _MD_SPAN.format('*'), r'\1', text)
+        text = re.sub(r'_{1,3}(%s)_{1,3}' % _MD_SPAN.format('_'), r'\1', text)
         # Remove strikethrough
-        text = re.sub(r'~~([^~]+)~~', r'\1', text)
+        text = re.sub(r'~~(%s)~~' % _MD_SPAN.format('~'), r'\1', text)
         # Remove blockquote markers
-        text = re.sub(r'(?m)^>\s?', '', text)
+        text = re.sub(r'(?m)^>[ \t]?', '', text)
         # Remove horizontal rules
-        text = re.sub(r'(?m)^[-*_]{3,}\s*$', '', text)
+        text = re.sub(r'(?m)^[-*_]{3,}[ \t]*$', '', text)
         # Remove list markers
-        text = re.sub(r'(?m)^\s*[-*+]\s+', '', text)
-        text = re.sub(r'(?m)^\s*\d+\.\s+', '', text)
+        text = re.sub(r'(?m)^[ \t]*[-*+][ \t]+', '', text)
+        text = re.sub(r'(?m)^[ \t]*\d+\.[ \t]+', '', text)
 
         # Clean up whitespace
         text = re.sub(r'\n{3,}', '\n\n', text)
         text = re.sub(r' {2,}', ' ', text)
-
-        logger.debug(f"Markdown file: {len(text)} chars after stripping")
         return text.strip()
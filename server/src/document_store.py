@@ -0,0 +1,147 @@
+"""Server-side handles for uploaded documents.
+
+An upload is stored here under a random document ID so the client can
+stream it (or any range of its chunks) without posting the text back.
+Handles expire after a TTL that is renewed on every access, and the least
+recently used ones are dropped past a handle count or a total size.
+"""
+
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from .config import settings
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class DocumentStore:
+    """In-memory document handles with a sliding TTL and count/size limits."""
+
+    def __init__(self, ttl_seconds: int = None, max_documents: int = None, max_mb: float = None):
+        """
+        Initialize the store.
+
+        Args:
+            ttl_seconds: Seconds a handle lives after its last access
+                (default from settings)
+            max_documents: Handles kept before the least recently used is
+                dropped (default from settings)
+            max_mb: Total size in MB of the texts and chunk lists kept before
+                least recently used handles are dropped (default from settings)
+        """
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.DOCUMENT_HANDLE_TTL_SECONDS
+        self.max_documents = max_documents if max_documents is not None else settings.DOCUMENT_HANDLE_MAX
+        if max_mb is None:
+            max_mb = settings.DOCUMENT_HANDLE_MAX_MB
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        # document_id -> document dict, least recently used first
+        self._documents: "OrderedDict[str, Dict]" = OrderedDict()
+        # document_id -> in-memory size of its text and chunk lists
+        self._sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+
+    def add(self, filename: str, text: str, variant: str, chunks: List[dict]) -> Dict:
+        """
+        Store an extracted document and return its handle.
+
+        Args:
+            filename: Original upload filename
+            text: Extracted document text
+            variant: Preprocessing variant of chunks (DocumentCache.variant)
+            chunks: Chunk list produced by TextPreprocessor.process
+
+        Returns:
+            Document dict with id, filename, text, chunks and expires_at
+        """
+        document = {
+            "id": uuid.uuid4().hex,
+            "filename": filename,
+            "text": text,
+            "chunks": {variant: chunks},
+            "expires_at": 0,
+        }
+        with self._lock:
+            self._purge_expired()
+            self._touch(document)
+            self._documents[document["id"]] = document
+            self._add_size(document["id"], sys.getsizeof(text) + _chunks_size(chunks))
+            self._enforce_limits()
+        return document
+
+    def get(self, document_id: str) -> Optional[Dict]:
+        """Return a document and renew its TTL, or None if unknown or expired."""
+        with self._lock:
+            self._purge_expired()
+            document = self._documents.get(document_id)
+            if document is not None:
+                self._touch(document)
+                self._documents.move_to_end(document_id)
+            return document
+
+    def set_chunks(self, document_id: str, variant: str, chunks: List[dict]) -> None:
+        """Store the chunk list for another preprocessing variant."""
+        with self._lock:
+            document = self._documents.get(document_id)
+            if document is not None:
+                previous = document["chunks"].get(variant)
+                document["chunks"][variant] = chunks
+                self._add_size(document_id, _chunks_size(chunks) - (_chunks_size(previous) if previous else 0))
+                self._documents.move_to_end(document_id)
+                self._enforce_limits()
+
+    def delete(self, document_id: str) -> bool:
+        """Drop a document handle. Returns False if it did not exist."""
+        with self._lock:
+            return self._drop(document_id)
+
+    def stats(self) -> Dict:
+        """Handle count and total size."""
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "bytes": self._total_bytes,
+                "max_documents": self.max_documents,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _add_size(self, document_id: str, delta: int) -> None:
+        self._sizes[document_id] = self._sizes.get(document_id, 0) + delta
+        self._total_bytes += delta
+
+    def _drop(self, document_id: str) -> bool:
+        if self._documents.pop(document_id, None) is None:
+            return False
+        self._total_bytes -= self._sizes.pop(document_id, 0)
+        return True
+
+    def _enforce_limits(self) -> None:
+        """Drop least recently used handles past either limit; the most
+        recently used one is always kept, however large."""
+        while len(self._documents) > 1 and (
+            len(self._documents) > self.max_documents or self._total_bytes > self.max_bytes
+        ):
+            old_id = next(iter(self._documents))
+            self._drop(old_id)
+            logger.info(f"Document handle dropped (store full): {old_id}")
+
+    def _touch(self, document: Dict) -> None:
+        document["expires_at"] = int((time.time() + self.ttl_seconds) * 1000)
+
+    def _purge_expired(self) -> None:
+        now = int(time.time() * 1000)
+        expired = [doc_id for doc_id, doc in self._documents.items() if doc["expires_at"] <= now]
+        for doc_id in expired:
+            self._drop(doc_id)
+        if expired:
+            logger.info(f"Expired {len(expired)} document handles")
+
+
+def _chunks_size(chunks: List[dict]) -> int:
+    """Approximate in-memory size of a chunk list (dominated by chunk text)."""
+    return sys.getsizeof(chunks) + sum(sys.getsizeof(chunk) + sys.getsizeof(chunk.get("text", "")) for chunk in chunks)
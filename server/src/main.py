@@ -1,24 +1,33 @@
 """Open Mobile TTS - Single-app server (no authentication)."""
 
+import asyncio
+import hashlib
 import io
 import json
 import os
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncGenerator, Iterator, List, Optional, Tuple
 
-from fastapi import FastAPI, File, HTTPException, UploadFile, status
+from fastapi import FastAPI, File, HTTPException, Query, UploadFile, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse, FileResponse
 from pydantic import BaseModel
 
 from .config import settings
+from .document_cache import DocumentCache
 from .document_processor import DocumentProcessor
+from .document_store import DocumentStore
+from .process_pools import shutdown_process_pools
 from .text_preprocessor import TextPreprocessor
 from .tts_engine import EngineManager
 from .logging_config import setup_logging, get_logger, preview_text, export_logs_json, clear_logs
-from .stt_engine import SttEngine
+from .stt_engine import SttEngine, pcm16_to_float32
+from .transcript_cache import TranscriptCache
 from .export_manager import export_pdf, export_markdown, export_plaintext
 from .project_storage import ProjectStorage
 
@@ -26,11 +35,24 @@ from .project_storage import ProjectStorage
 setup_logging()
 logger = get_logger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background work that should not wait for the first request."""
+    if settings.STT_PRELOAD and stt_engine.is_available:
+        _start_stt_load()
+    yield
+    # Write autosaves still waiting in the write-behind buffer
+    project_storage.close()
+    # Stop PDF extraction / normalization worker processes
+    shutdown_process_pools()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Open Mobile TTS",
     description="Private text-to-speech app — single process, no auth",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 # CORS — allow all origins for local/network access
@@ -45,8 +67,32 @@ app.add_middleware(
 engine_manager = EngineManager()
 text_preprocessor = TextPreprocessor()
 document_processor = DocumentProcessor()
+document_cache = DocumentCache()
+document_store = DocumentStore()
 stt_engine = SttEngine()
-project_storage = ProjectStorage()
+transcript_cache = TranscriptCache()
+project_storage = ProjectStorage(
+    write_delay=settings.PROJECT_WRITE_DELAY_SECONDS,
+    max_write_delay=settings.PROJECT_MAX_WRITE_DELAY_SECONDS,
+)
+
+# Bounded pool for blocking document work (upload writes, extraction,
+# preprocessing) so large uploads never stall the event loop and active
+# audio streams. Its size is the document concurrency limit.
+_document_pool = ThreadPoolExecutor(max_workers=settings.DOCUMENT_WORKERS, thread_name_prefix="document")
+
+# Threads for blocking speech recognition (file transcription, live
+# session decoding), kept apart from document work; at least one per
+# recognizer so concurrent requests can use the whole recognizer pool
+_stt_pool = ThreadPoolExecutor(
+    max_workers=max(settings.STT_WORKERS, settings.STT_RECOGNIZERS),
+    thread_name_prefix="stt",
+)
+
+# Upload read size; each read is written from the document pool
+UPLOAD_READ_SIZE = 64 * 1024
+# Characters of document text returned by /api/documents/upload
+DOCUMENT_PREVIEW_CHARS = 200
 
 # Ensure upload directory exists
 Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
@@ -62,9 +108,39 @@ class VoiceInfo(BaseModel):
 
 
 class DocumentUploadResponse(BaseModel):
+    document_id: str
     filename: str
-    text: str
+    preview: str
+    char_count: int
     chunk_count: int
+    expires_at: int
+
+
+class DocumentTextResponse(BaseModel):
+    document_id: str
+    filename: str
+    text: str
+
+
+class DocumentTocEntry(BaseModel):
+    level: int
+    title: str
+    position: int
+
+
+class DocumentIndexResponse(BaseModel):
+    filename: str
+    unit: str
+    count: int
+    total_chars: Optional[int]
+    toc: List[DocumentTocEntry]
+
+
+class DocumentStreamRequest(BaseModel):
+    voice: str = settings.DEFAULT_VOICE
+    speed: float = settings.DEFAULT_SPEED
+    start_chunk: int = 0
+    end_chunk: Optional[int] = None
 
 
 # Voice endpoints
@@ -74,6 +150,103 @@ async def list_voices():
     return engine_manager.active.available_voices
 
 
+def _voice_language(voice: str) -> Optional[str]:
+    """Language code of a voice on the active engine (None if unknown)."""
+    for v in engine_manager.active.available_voices:
+        if v['name'] == voice:
+            return v['language']
+    return None
+
+
+async def _run_document_task(func, *args):
+    """Run blocking document work (I/O, extraction, preprocessing) on the document pool."""
+    return await asyncio.get_running_loop().run_in_executor(_document_pool, partial(func, *args))
+
+
+async def _save_upload(upload: UploadFile, file_path: Path, label: str) -> Tuple[int, str]:
+    """
+    Write an upload to disk without blocking the event loop.
+
+    Args:
+        upload: Uploaded file
+        file_path: Destination path
+        label: Request type for log and error messages
+
+    Returns:
+        (number of bytes written, hex SHA-256 of the content)
+
+    Raises:
+        HTTPException: 413 if the upload exceeds MAX_UPLOAD_SIZE_MB
+    """
+    _, file_size, content_hash = await _receive_upload(upload, file_path, label, spool_max_bytes=0)
+    return file_size, content_hash
+
+
+async def _receive_upload(
+    upload: UploadFile, file_path: Path, label: str, spool_max_bytes: Optional[int] = None
+) -> Tuple[Optional[bytes], int, str]:
+    """
+    Read an upload, keeping it in memory unless it is large.
+
+    Uploads up to spool_max_bytes are returned as bytes and never touch
+    UPLOAD_DIR. Larger ones spill to file_path, written from the document
+    pool so the event loop never blocks. The SHA-256 of the content is
+    computed as it is read, so cache lookups need no second pass.
+
+    Args:
+        upload: Uploaded file
+        file_path: Destination path if the upload spills to disk
+        label: Request type for log and error messages
+        spool_max_bytes: In-memory limit (default UPLOAD_SPOOL_MAX_KB;
+            0 always writes to disk)
+
+    Returns:
+        (content if kept in memory else None, size in bytes, hex SHA-256)
+
+    Raises:
+        HTTPException: 413 if the upload exceeds MAX_UPLOAD_SIZE_MB
+    """
+    if spool_max_bytes is None:
+        spool_max_bytes = settings.UPLOAD_SPOOL_MAX_KB * 1024
+    max_size_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    file_size = 0
+    digest = hashlib.sha256()
+    buffered: List[bytes] = []
+    f = None
+
+    def write_chunk(f, chunk):
+        digest.update(chunk)
+        f.write(chunk)
+
+    if spool_max_bytes == 0:
+        f = await _run_document_task(open, file_path, 'wb')
+    try:
+        while chunk := await upload.read(UPLOAD_READ_SIZE):
+            file_size += len(chunk)
+            if file_size > max_size_bytes:
+                logger.warning(f"{label} rejected: file too large ({file_size} bytes)")
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE_MB}MB",
+                )
+            if f is None and file_size <= spool_max_bytes:
+                digest.update(chunk)
+                buffered.append(chunk)
+                continue
+            if f is None:
+                f = await _run_document_task(open, file_path, 'wb')
+                if buffered:
+                    await _run_document_task(f.write, b''.join(buffered))
+                    buffered = []
+            await _run_document_task(write_chunk, f, chunk)
+    finally:
+        if f is not None:
+            await _run_document_task(f.close)
+
+    data = b''.join(buffered) if f is None else None
+    return data, file_size, digest.hexdigest()
+
+
 # Engine endpoints
 class EngineInfo(BaseModel):
     name: str
@@ -164,8 +337,9 @@ async def stream_tts(request: TTSRequest):
             detail=f"Voice '{voice}' is not available. Valid voices: {sorted(valid_voices)}",
         )
 
-    # Preprocess and chunk text
-    text_chunks = text_preprocessor.process(text)
+    # Preprocess and chunk text using the voice's language segmentation rules,
+    # off the event loop since request bodies can be arbitrarily large
+    text_chunks = await _run_document_task(text_preprocessor.process, text, _voice_language(voice))
     logger.info(f"Text preprocessed into {len(text_chunks)} chunks")
 
     if not text_chunks:
@@ -213,15 +387,18 @@ async def stream_tts(request: TTSRequest):
 # Document endpoints
 @app.post("/api/documents/upload", response_model=DocumentUploadResponse)
 async def upload_document(file: UploadFile = File(...)):
-    """Upload a document (PDF, DOCX, TXT) and extract text for TTS."""
+    """
+    Upload a document (PDF, DOCX, TXT) and extract text for TTS.
+
+    The text stays on the server: the response carries a document_id to
+    stream it by (/api/documents/{document_id}/stream) and a short preview.
+    The full text is available from /api/documents/{document_id}/text.
+    """
     if not file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename is required")
 
     logger.info(f"Document upload: filename={file.filename}, content_type={file.content_type}")
 
-    max_size_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
-    file_size = 0
-
     # Validate extension before writing to disk
     suffix = Path(file.filename).suffix.lower()
     if suffix not in DocumentProcessor.SUPPORTED_FORMATS:
@@ -235,30 +412,35 @@ async def upload_document(file: UploadFile = File(...)):
     file_path = Path(settings.UPLOAD_DIR) / safe_name
 
     try:
-        with open(file_path, 'wb') as f:
-            while chunk := await file.read(8192):
-                file_size += len(chunk)
-                if file_size > max_size_bytes:
-                    logger.warning(f"Document upload rejected: file too large ({file_size} bytes)")
-                    raise HTTPException(
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE_MB}MB",
-                    )
-                f.write(chunk)
-
-        logger.info(f"Document saved: {file_size} bytes")
-
-        text = document_processor.extract(str(file_path))
-        logger.info(f"Document extracted: {len(text)} chars")
-        logger.debug(f"Extracted text preview: {preview_text(text, 500)}")
-
-        chunks = text_preprocessor.process(text)
-        logger.info(f"Document processed into {len(chunks)} chunks")
-
+        data, file_size, content_hash = await _receive_upload(file, file_path, "Document upload")
+        logger.info(f"Document received: {file_size} bytes ({'memory' if data is not None else 'disk'})")
+
+        cache_key = DocumentCache.make_key(content_hash, suffix, document_processor.cache_fingerprint)
+        variant = DocumentCache.variant(None, text_preprocessor.max_chunk_tokens)
+        cached = await _run_document_task(document_cache.get, cache_key)
+        chunks = document_cache.get_chunks(cached, variant)
+
+        if cached is not None:
+            text = cached["text"]
+            logger.info(f"Document cache hit: {len(text)} chars")
+        else:
+            text = await _run_document_task(document_processor.extract, str(file_path), data)
+            logger.info(f"Document extracted: {len(text)} chars")
+            logger.debug(f"Extracted text preview: {preview_text(text, 500)}")
+
+        if chunks is None:
+            chunks = await _run_document_task(text_preprocessor.process, text)
+            logger.info(f"Document processed into {len(chunks)} chunks")
+            await _run_document_task(document_cache.put, cache_key, text, variant, chunks)
+
+        document = document_store.add(file.filename, text, variant, chunks)
         return {
+            "document_id": document["id"],
             "filename": file.filename,
-            "text": text,
+            "preview": text[:DOCUMENT_PREVIEW_CHARS],
+            "char_count": len(text),
             "chunk_count": len(chunks),
+            "expires_at": document["expires_at"],
         }
 
     except (ValueError, RuntimeError, OSError) as e:
@@ -273,20 +455,72 @@ async def upload_document(file: UploadFile = File(...)):
             os.unlink(file_path)
 
 
+@app.post("/api/documents/index", response_model=DocumentIndexResponse)
+async def index_document(file: UploadFile = File(...)):
+    """
+    Upload a document and return its seek index.
+
+    PDFs are indexed by page with their outline (no text is extracted);
+    other formats by paragraph. Positions can be passed as start/end to
+    /api/documents/stream to listen from a bookmark.
+    """
+    if not file.filename:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename is required")
+
+    suffix = Path(file.filename).suffix.lower()
+    if suffix not in DocumentProcessor.SUPPORTED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported format: {suffix}. Supported: {', '.join(DocumentProcessor.SUPPORTED_FORMATS)}",
+        )
+
+    safe_name = f"{uuid.uuid4().hex[:8]}_{Path(file.filename).name}"
+    file_path = Path(settings.UPLOAD_DIR) / safe_name
+
+    try:
+        data, _, _ = await _receive_upload(file, file_path, "Document index")
+        index = await _run_document_task(document_processor.build_index, str(file_path), data)
+        return {
+            "filename": file.filename,
+            "unit": index["unit"],
+            "count": index["count"],
+            "total_chars": index["total_chars"],
+            "toc": index["toc"],
+        }
+
+    except (ValueError, RuntimeError, OSError) as e:
+        logger.error(f"Document index error: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Document processing failed: {e}",
+        )
+
+    finally:
+        if file_path.exists():
+            os.unlink(file_path)
+
+
 @app.post("/api/documents/stream")
 async def stream_document(
     file: UploadFile = File(...),
     voice: str = settings.DEFAULT_VOICE,
     speed: float = settings.DEFAULT_SPEED,
+    start: int = 0,
+    end: Optional[int] = None,
+    start_offset: Optional[int] = None,
 ):
-    """Upload a document and stream TTS audio directly."""
+    """
+    Upload a document and stream TTS audio directly.
+
+    start/end select a range of pages (PDF, 0-based) or paragraphs (other
+    formats), as reported by /api/documents/index; only that range is
+    extracted. start_offset starts at the paragraph containing a character
+    offset of the extracted text instead.
+    """
     if not file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filename is required")
 
-    logger.info(f"Document stream: filename={file.filename}, voice={voice}, speed={speed}")
-
-    max_size_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
-    file_size = 0
+    logger.info(f"Document stream: filename={file.filename}, voice={voice}, speed={speed}, range={start}-{end}")
 
     # Validate extension before writing to disk
     suffix = Path(file.filename).suffix.lower()
@@ -299,26 +533,39 @@ async def stream_document(
     # Use UUID prefix to prevent filename collisions from concurrent uploads
     safe_name = f"{uuid.uuid4().hex[:8]}_{Path(file.filename).name}"
     file_path = Path(settings.UPLOAD_DIR) / safe_name
+    streaming = False
 
     try:
-        with open(file_path, 'wb') as f:
-            while chunk := await file.read(8192):
-                file_size += len(chunk)
-                if file_size > max_size_bytes:
-                    logger.warning(f"Document stream rejected: file too large ({file_size} bytes)")
-                    raise HTTPException(
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE_MB}MB",
-                    )
-                f.write(chunk)
-
-        logger.info(f"Document saved for streaming: {file_size} bytes")
-
-        text = document_processor.extract(str(file_path))
-        logger.info(f"Document extracted: {len(text)} chars")
-
-        text_chunks = text_preprocessor.process(text)
-        logger.info(f"Document processed into {len(text_chunks)} chunks for TTS")
+        data, file_size, content_hash = await _receive_upload(file, file_path, "Document stream")
+        logger.info(f"Document received for streaming: {file_size} bytes ({'memory' if data is not None else 'disk'})")
+
+        language = _voice_language(voice)
+        cache_key = DocumentCache.make_key(content_hash, suffix, document_processor.cache_fingerprint)
+        variant = DocumentCache.variant(language, text_preprocessor.max_chunk_tokens)
+        ranged = start > 0 or end is not None or start_offset is not None
+        cached = None if ranged else await _run_document_task(document_cache.get, cache_key)
+        cached_chunks = document_cache.get_chunks(cached, variant)
+
+        if ranged:
+            # Partial streams skip the document cache, which holds whole documents
+            if start_offset is not None:
+                start = await _run_document_task(document_processor.locate_offset, str(file_path), data, start_offset)
+            pages = document_processor.extract_range(str(file_path), data, start, end)
+            first_page = await _run_document_task(next, pages, None)
+            text_chunks = _document_chunks(pages, first_page, language)
+        elif cached_chunks is not None:
+            logger.info(f"Document cache hit: {len(cached_chunks)} chunks")
+            pages = None
+            text_chunks = _cached_chunks(cached_chunks)
+        else:
+            # Extract the first page before responding so unreadable documents
+            # fail with 400; the rest is extracted while audio streams
+            if cached is not None:
+                pages = _text_pages(cached["text"])
+            else:
+                pages = document_processor.extract_iter(str(file_path), data)
+            first_page = await _run_document_task(next, pages, None)
+            text_chunks = _document_chunks(pages, first_page, language, cache_key, variant)
 
         async def generate_stream():
             chunk_count = 0
@@ -337,8 +584,14 @@ async def stream_document(
             except Exception as e:
                 logger.error(f"Document stream error: {e}", exc_info=True)
                 raise
-
-        return StreamingResponse(
+            finally:
+                await text_chunks.aclose()
+                if pages is not None:
+                    pages.close()
+                if file_path.exists():
+                    os.unlink(file_path)
+
+        response = StreamingResponse(
             generate_stream(),
             media_type="audio/mpeg",
             headers={
@@ -347,6 +600,8 @@ async def stream_document(
                 "X-Accel-Buffering": "no",
             },
         )
+        streaming = True
+        return response
 
     except (ValueError, RuntimeError, OSError) as e:
         logger.error(f"Document stream processing error: {e}", exc_info=True)
@@ -356,16 +611,263 @@ async def stream_document(
         )
 
     finally:
-        if file_path.exists():
+        # Once streaming, the stream generator owns the upload file
+        if not streaming and file_path.exists():
             os.unlink(file_path)
 
 
+@app.post("/api/documents/{document_id}/stream")
+async def stream_document_by_id(document_id: str, request: DocumentStreamRequest):
+    """
+    Stream TTS audio for a range of chunks of an uploaded document.
+
+    The document is identified by the document_id returned from
+    /api/documents/upload, so its text is not sent again. Chunks are
+    start_chunk (inclusive) to end_chunk (exclusive, default: the end);
+    TIMING chunk_index values are document chunk indices.
+    """
+    document = document_store.get(document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found or expired. Upload it again.",
+        )
+
+    voice = request.voice
+    speed = request.speed
+    valid_voices = {v['name'] for v in engine_manager.active.available_voices}
+    if voice not in valid_voices:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Voice '{voice}' is not available. Valid voices: {sorted(valid_voices)}",
+        )
+
+    # Chunk with the voice's language rules, reusing earlier chunking if any
+    language = _voice_language(voice)
+    variant = DocumentCache.variant(language, text_preprocessor.max_chunk_tokens)
+    chunks = document["chunks"].get(variant)
+    if chunks is None:
+        chunks = await _run_document_task(text_preprocessor.process, document["text"], language)
+        document_store.set_chunks(document_id, variant, chunks)
+
+    start = request.start_chunk
+    end = len(chunks) if request.end_chunk is None else min(request.end_chunk, len(chunks))
+    if start < 0 or start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid chunk range {start}-{request.end_chunk} for {len(chunks)} chunks",
+        )
+
+    logger.info(
+        f"Document stream by ID: id={document_id}, voice={voice}, speed={speed}, chunks={start}-{end}"
+    )
+
+    async def generate_stream():
+        chunk_count = 0
+        total_bytes = 0
+        try:
+            async for mp3_bytes, timing in engine_manager.active.generate_speech_stream(
+                chunks[start:end], voice=voice, speed=speed
+            ):
+                chunk_count += 1
+                total_bytes += len(mp3_bytes)
+                timing['chunk_index'] += start
+                timing_line = f"TIMING:{json.dumps(timing)}\n"
+                yield timing_line.encode('utf-8')
+                yield f"AUDIO:{len(mp3_bytes)}\n".encode('utf-8')
+                yield mp3_bytes
+            logger.info(f"Document stream complete: {chunk_count} chunks, {total_bytes} bytes")
+        except Exception as e:
+            logger.error(f"Document stream error: {e}", exc_info=True)
+            raise
+
+    return StreamingResponse(
+        generate_stream(),
+        media_type="audio/mpeg",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Content-Type-Options": "nosniff",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@app.get("/api/documents/{document_id}/text", response_model=DocumentTextResponse)
+async def get_document_text(document_id: str):
+    """Return the full text of an uploaded document (e.g. to edit it)."""
+    document = document_store.get(document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found or expired. Upload it again.",
+        )
+    return {"document_id": document_id, "filename": document["filename"], "text": document["text"]}
+
+
+@app.delete("/api/documents/{document_id}")
+async def delete_document(document_id: str):
+    """Release a server-side document handle before its TTL expires."""
+    if not document_store.delete(document_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    return {"deleted": True}
+
+
+def _text_pages(text: str) -> Iterator[str]:
+    """Page iterator over already-extracted document text."""
+    yield text
+
+
+async def _cached_chunks(chunks: List[dict]) -> AsyncGenerator[dict, None]:
+    """Yield chunks from a document cache entry."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def _document_chunks(
+    pages: Iterator[str],
+    first_page: Optional[str],
+    language: Optional[str],
+    cache_key: Optional[str] = None,
+    variant: Optional[str] = None,
+) -> AsyncGenerator[dict, None]:
+    """
+    Preprocess extracted pages into TTS chunks as they are produced.
+
+    Extraction and preprocessing run on the document pool, one page ahead
+    of the chunks being synthesized. Once every page has been processed,
+    the text and chunks are stored in the document cache under cache_key.
+
+    Args:
+        pages: Page/block iterator from DocumentProcessor.extract_iter
+        first_page: Block already taken from pages (None if exhausted)
+        language: Voice language code for segmentation rules
+        cache_key: Document cache key (None to skip caching)
+        variant: Document cache variant for the chunks
+
+    Yields:
+        Chunk dicts in document order
+    """
+    page_count = 0
+    chunk_count = 0
+    collect = cache_key is not None and document_cache.enabled
+    page_texts: List[str] = []
+    all_chunks: List[dict] = []
+
+    def next_page():
+        page = next(pages, None)
+        return page, text_preprocessor.process(page, language) if page is not None else []
+
+    pending = None
+    try:
+        if first_page is None:
+            return
+        page, chunks = first_page, await _run_document_task(text_preprocessor.process, first_page, language)
+        while page is not None:
+            page_count += 1
+            if collect:
+                page_texts.append(page)
+                all_chunks.extend(chunks)
+            # Prefetch the next page while this page's chunks are synthesized
+            pending = asyncio.ensure_future(_run_document_task(next_page))
+            for chunk in chunks:
+                chunk_count += 1
+                yield chunk
+            page, chunks = await pending
+            pending = None
+        logger.info(f"Document processed into {chunk_count} chunks from {page_count} pages")
+        if collect:
+            await _run_document_task(
+                document_cache.put, cache_key, "\n\n".join(page_texts), variant, all_chunks
+            )
+    finally:
+        if pending is not None:
+            await asyncio.wait([pending])
+        pages.close()
+
+
 # ── STT endpoints ──────────────────────────────────────────
 
+async def _run_stt_task(func, *args):
+    """Run blocking speech recognition work on the STT pool."""
+    return await asyncio.get_running_loop().run_in_executor(_stt_pool, partial(func, *args))
+
+
+def _init_stt_engine():
+    """Lazily initialize the STT engine from the standard model location."""
+    if stt_engine.is_initialized:
+        return
+    model_dir = Path.home() / ".cache" / SttEngine.MODEL_NAME
+    if not model_dir.exists():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"STT model not found at {model_dir}. Download it first.",
+        )
+    stt_engine.init(str(model_dir))
+
+
+# Shared STT model load: started at startup when STT_PRELOAD is set,
+# otherwise by the first STT request; concurrent callers await the same task
+_stt_load: Optional[asyncio.Task] = None
+
+
+async def _load_stt_engine():
+    """Load the STT model off the event loop."""
+    started = time.perf_counter()
+    await _run_stt_task(_init_stt_engine)
+    logger.info(f"STT model loaded in {time.perf_counter() - started:.1f}s")
+
+
+def _log_stt_load(task: asyncio.Task):
+    """Log a failed background load (and mark its exception as retrieved)."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"STT model load failed: {task.exception()}")
+
+
+def _start_stt_load() -> asyncio.Task:
+    """Start loading the STT model unless it is loaded or already loading."""
+    global _stt_load
+    if _stt_load is None or (_stt_load.done() and not stt_engine.is_initialized):
+        _stt_load = asyncio.create_task(_load_stt_engine())
+        _stt_load.add_done_callback(_log_stt_load)
+    return _stt_load
+
+
+async def _ensure_stt_engine():
+    """Wait for the STT model, starting the load if needed (a failed load is retried)."""
+    if stt_engine.is_initialized:
+        return
+    # Shielded so a caller that disconnects does not cancel everyone's load
+    await asyncio.shield(_start_stt_load())
+
+
+def _stt_state() -> Tuple[str, Optional[str]]:
+    """(state, error) of the STT model: not_loaded, loading, loaded or failed."""
+    if stt_engine.is_initialized:
+        return "loaded", None
+    if _stt_load is None:
+        return "not_loaded", None
+    if not _stt_load.done():
+        return "loading", None
+    if _stt_load.cancelled():
+        return "not_loaded", None
+    error = _stt_load.exception()
+    detail = error.detail if isinstance(error, HTTPException) else str(error)
+    return "failed", detail
+
+
+class SttSegment(BaseModel):
+    start: float
+    end: float
+    text: str
+
+
 class SttTranscribeResponse(BaseModel):
     text: str
     duration_ms: int
     model: str
+    segments: List[SttSegment] = []
+    rtf: float = 0.0
+    cached: bool = False
 
 
 @app.post("/api/stt/transcribe", response_model=SttTranscribeResponse)
@@ -381,34 +883,28 @@ async def stt_transcribe(audio: UploadFile = File(...)):
     safe_name = f"{uuid.uuid4().hex[:8]}_{audio.filename or 'audio.wav'}"
     file_path = Path(settings.UPLOAD_DIR) / safe_name
 
+    def decode(path: str) -> Tuple:
+        samples = stt_engine.decode_audio_file(path)
+        return samples, TranscriptCache.fingerprint(samples)
+
     try:
-        max_size_bytes = settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
-        file_size = 0
-        with open(file_path, "wb") as f:
-            while chunk := await audio.read(8192):
-                file_size += len(chunk)
-                if file_size > max_size_bytes:
-                    raise HTTPException(
-                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                        detail=f"Audio file too large. Maximum: {settings.MAX_UPLOAD_SIZE_MB}MB",
-                    )
-                f.write(chunk)
-
-        # Lazy init STT engine
-        if not stt_engine.is_initialized:
-            # Look for model in standard locations
-            model_dir = Path.home() / ".cache" / SttEngine.MODEL_NAME
-            if not model_dir.exists():
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail=f"STT model not found at {model_dir}. Download it first.",
-                )
-            stt_engine.init(str(model_dir))
+        _, upload_hash = await _save_upload(audio, file_path, "Audio upload")
 
-        text = stt_engine.transcribe_file(str(file_path))
-        duration_ms = 0  # TODO: extract from audio metadata
+        # Same bytes as an earlier upload: no decode, no model
+        cached = await _run_stt_task(transcript_cache.get_upload, upload_hash)
+        if cached is None:
+            # A missing or failed model is reported before paying for a decode
+            await _ensure_stt_engine()
+            # Same audio in another file (re-encoded container, lossless copy)
+            samples, pcm_hash = await _run_stt_task(decode, str(file_path))
+            cached = await _run_stt_task(transcript_cache.get_pcm, pcm_hash, upload_hash)
+        if cached is not None:
+            return {**cached, "model": "moonshine-v2-medium", "cached": True}
 
-        return {"text": text, "duration_ms": duration_ms, "model": "moonshine-v2-medium"}
+        result = await _run_stt_task(stt_engine.transcribe_samples, samples)
+        await _run_stt_task(transcript_cache.put, pcm_hash, upload_hash, result)
+
+        return {**result, "model": "moonshine-v2-medium"}
 
     except HTTPException:
         raise
@@ -423,16 +919,146 @@ async def stt_transcribe(audio: UploadFile = File(...)):
             os.unlink(file_path)
 
 
+# Audio frames read from ffmpeg when decoding a live Opus stream
+STT_STREAM_READ_SIZE = 16 * 1024
+
+
+@app.websocket("/api/stt/stream")
+async def stt_stream(websocket: WebSocket, encoding: str = "pcm16"):
+    """
+    Live transcription over a WebSocket.
+
+    The client sends binary audio frames while the user speaks, then the
+    text message ``{"type": "end"}``. Frames are raw 16 kHz mono s16le PCM
+    (``encoding=pcm16``) or an Ogg/WebM Opus stream as recorded by
+    MediaRecorder (``encoding=opus``, decoded by an ffmpeg pipe).
+
+    The server sends ``{"type": "partial", "text"}`` for the utterance in
+    progress and ``{"type": "final", "start", "end", "text"}`` for each
+    finished one, then ``{"type": "done", "text", "duration_ms"}`` and
+    closes. Failures are sent as ``{"type": "error", "detail"}``.
+    """
+    await websocket.accept()
+
+    async def fail(detail: str, code: int = 1011):
+        await websocket.send_json({"type": "error", "detail": detail})
+        await websocket.close(code=code)
+
+    if encoding not in ("pcm16", "opus"):
+        await fail(f"Unsupported encoding '{encoding}'. Use pcm16 or opus.", code=1003)
+        return
+    if not stt_engine.is_available:
+        await fail("STT not available — sherpa_onnx not installed")
+        return
+    try:
+        await _ensure_stt_engine()
+    except HTTPException as e:
+        await fail(e.detail)
+        return
+    except Exception as e:
+        await fail(f"STT model failed to load: {e}")
+        return
+
+    session = stt_engine.create_session()
+    remainder = b""
+
+    async def feed(data: bytes):
+        """Convert s16le bytes (carrying odd bytes over) and send any events."""
+        nonlocal remainder
+        data = remainder + data
+        usable = len(data) - len(data) % 2
+        remainder = data[usable:]
+        if usable:
+            for event in await _run_stt_task(session.accept_waveform, pcm16_to_float32(data[:usable])):
+                await websocket.send_json(event)
+
+    decoder = None
+    reader = None
+    if encoding == "opus":
+        try:
+            decoder = await asyncio.create_subprocess_exec(
+                "ffmpeg", "-hide_banner", "-loglevel", "error",
+                "-i", "pipe:0",
+                "-f", "s16le", "-acodec", "pcm_s16le",
+                "-ar", str(SttEngine.SAMPLE_RATE), "-ac", "1",
+                "pipe:1",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError as e:
+            logger.error(f"Live STT: ffmpeg could not be started: {e}")
+            await fail(f"Opus decoding unavailable — ffmpeg could not be started: {e}")
+            return
+
+        async def pump():
+            while chunk := await decoder.stdout.read(STT_STREAM_READ_SIZE):
+                await feed(chunk)
+
+        reader = asyncio.create_task(pump())
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                if decoder is None:
+                    await feed(message["bytes"])
+                else:
+                    decoder.stdin.write(message["bytes"])
+                    await decoder.stdin.drain()
+            elif message.get("text"):
+                try:
+                    if json.loads(message["text"]).get("type") == "end":
+                        break
+                except (ValueError, AttributeError):
+                    pass
+
+        if decoder is not None:
+            decoder.stdin.close()
+            await reader
+            await decoder.wait()
+
+        for event in await _run_stt_task(session.finish):
+            await websocket.send_json(event)
+        await websocket.send_json({
+            "type": "done",
+            "text": session.text,
+            "duration_ms": int(session.duration * 1000),
+        })
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        logger.info("Live STT client disconnected")
+    except Exception as e:
+        logger.error(f"Live STT session failed: {e}", exc_info=True)
+        try:
+            await fail(f"Transcription failed: {e}")
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+    finally:
+        if reader is not None and not reader.done():
+            reader.cancel()
+        if decoder is not None and decoder.returncode is None:
+            decoder.kill()
+            await decoder.wait()
+
+
 @app.get("/api/stt/models")
 async def stt_models():
-    """List available STT models."""
+    """List available STT models and the loading state of the active one."""
+    state, error = _stt_state()
     return {
+        "transcript_cache": transcript_cache.stats(),
         "models": [
             {
                 "name": "moonshine-v2-medium",
                 "size_mb": 250,
                 "downloaded": stt_engine.is_initialized or (Path.home() / ".cache" / SttEngine.MODEL_NAME).exists(),
                 "active": stt_engine.is_initialized,
+                "state": state,
+                "error": error,
             }
         ]
     }
@@ -505,9 +1131,27 @@ class CleanupRequest(BaseModel):
 
 
 @app.get("/api/projects")
-async def list_projects():
-    """List all projects."""
-    return {"projects": project_storage.list_projects()}
+async def list_projects(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    project_type: Optional[str] = Query(None, alias="type"),
+    title_prefix: Optional[str] = None,
+):
+    """
+    List projects, newest first, one page at a time.
+
+    Pass next_cursor back as cursor for the following page (null on the
+    last one). fields is a comma-separated list of metadata keys, e.g.
+    "id,title,modified"; type and title_prefix filter on the server.
+    """
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 500")
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        return project_storage.list_page(limit, cursor, project_type, title_prefix, field_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/api/projects")
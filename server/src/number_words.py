@@ -0,0 +1,99 @@
+"""Cached number-to-words conversion shared across requests.
+
+num2words is slow (tens of microseconds per call) and number-heavy documents
+call it thousands of times. Integers 0-9999 are served from a per-language
+table filled on first use; decimals go through an LRU cache.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from num2words import CONVERTER_CLASSES, num2words
+
+# Integers below this are served from the per-language table
+TABLE_SIZE = 10000
+
+# Word spoken for the decimal separator, by num2words language
+POINT_WORDS = {
+    'en': 'point',
+    'es': 'punto',
+    'fr': 'virgule',
+    'it': 'virgola',
+    'pt': 'vírgula',
+    'pt_BR': 'vírgula',
+    'ja': '点',
+}
+
+_tables: Dict[str, List[Optional[str]]] = {}
+_tables_lock = threading.Lock()
+
+
+def num2words_lang(language: str = None) -> str:
+    """
+    Map a voice language code to a num2words language.
+
+    Args:
+        language: Voice language code (e.g. 'en-us', 'pt-br', 'ja')
+
+    Returns:
+        num2words language (e.g. 'en', 'pt_BR'); 'en' when unsupported
+    """
+    if not language:
+        return 'en'
+    parts = language.replace('_', '-').split('-')
+    full = f"{parts[0].lower()}_{parts[1].upper()}" if len(parts) > 1 else parts[0].lower()
+    for candidate in (full, parts[0].lower()):
+        if candidate in CONVERTER_CLASSES:
+            return candidate
+    return 'en'
+
+
+def _table(lang: str) -> List[Optional[str]]:
+    table = _tables.get(lang)
+    if table is None:
+        with _tables_lock:
+            table = _tables.setdefault(lang, [None] * TABLE_SIZE)
+    return table
+
+
+def integer_to_words(number: int, lang: str = 'en') -> str:
+    """
+    Convert an integer to words, using the shared table for 0-9999.
+
+    Args:
+        number: Integer to convert
+        lang: num2words language (see num2words_lang)
+
+    Returns:
+        Number in words
+    """
+    if 0 <= number < TABLE_SIZE:
+        table = _table(lang)
+        words = table[number]
+        if words is None:
+            # Benign race: concurrent fills write the same value
+            words = table[number] = num2words(number, lang=lang)
+        return words
+    return num2words(number, lang=lang)
+
+
+@lru_cache(maxsize=4096)
+def decimal_to_words(number: str, lang: str = 'en') -> str:
+    """
+    Convert a decimal string digit by digit after the separator.
+
+    3.14 → three point one four (leading zeros in the fraction are kept).
+
+    Args:
+        number: Decimal string such as '3.14' or '.5'
+        lang: num2words language (see num2words_lang)
+
+    Returns:
+        Number in words
+    """
+    whole, fraction = number.split('.', 1)
+    whole_words = integer_to_words(int(whole), lang) if whole else integer_to_words(0, lang)
+    fraction_words = ' '.join(integer_to_words(int(d), lang) for d in fraction)
+    point = POINT_WORDS.get(lang) or POINT_WORDS.get(lang.split('_')[0], 'point')
+    return f"{whole_words} {point} {fraction_words}"
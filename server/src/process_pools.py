@@ -0,0 +1,48 @@
+"""Shared process pools for CPU-bound work.
+
+Used for parallel PDF extraction and text normalization. Pools are created
+lazily, one per name and worker count, with the 'spawn' start method, which
+avoids forking a multi-threaded server process. The server shuts them down
+on exit (shutdown_process_pools).
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Tuple
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_pools: Dict[Tuple[str, int], ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_process_pool(name: str, workers: int) -> ProcessPoolExecutor:
+    """
+    Get (or create) the shared process pool for a kind of work.
+
+    Args:
+        name: Kind of work (e.g. "pdf", "normalize"); each gets its own pool
+        workers: Number of worker processes
+
+    Returns:
+        The pool, created on first use
+    """
+    with _pools_lock:
+        pool = _pools.get((name, workers))
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pools[(name, workers)] = pool
+        return pool
+
+
+def shutdown_process_pools(wait: bool = True) -> None:
+    """Shut down every pool and stop its worker processes (a later get creates a new one)."""
+    with _pools_lock:
+        pools = list(_pools.items())
+        _pools.clear()
+    for (name, workers), pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info(f"Process pool stopped: {name} ({workers} workers)")
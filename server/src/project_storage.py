@@ -6,13 +6,38 @@ JSON-based project storage for user sessions.
 Each project is a folder with project.json (metadata) and content.txt (text).
 Same folder structure as the Android ProjectStorage.kt — cross-platform compatible.
 
+The folders are the source of truth. A SQLite index of the metadata
+(.index.sqlite3 in the same directory, ignored by folder scans) serves
+sorted listing and cleanup without reading every project.json; it is
+updated with each create/update/delete and brought back in line with the
+folders on startup. list_page() pages through it by (modified, id) with
+a keyset cursor, so a page costs the same however many projects exist.
+
+Locking: project.json and content.txt are replaced atomically (temp file +
+rename), so get() reads without a lock and never sees a half-written file.
+Writes to one project are serialized by that project's lock; listing,
+export and single-project writes share a readers-writer lock that cleanup
+takes exclusively. Each thread uses its own index connection, so a long
+export or listing never holds up an autosave of another project.
+
+Write-behind (write_delay > 0): update() only records the new state in
+memory, and reads (get, list_projects, export_all) are served from it. A
+background thread writes a project once it has had no update for
+write_delay seconds, or max_write_delay seconds after its first unsaved
+update, so a burst of autosaves costs one write. flush() writes everything
+pending; close() flushes and is called on server shutdown. Edits newer
+than the last write are lost only if the process dies without closing.
+
 Default storage location: ~/.openmobilevoice/projects/
 """
 
 import json
 import logging
+import os
+import sqlite3
 import time
 import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
 
@@ -20,18 +45,106 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_PROJECTS_DIR = Path.home() / ".openmobilevoice" / "projects"
 
+INDEX_FILE = ".index.sqlite3"
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    type TEXT NOT NULL,
+    created INTEGER NOT NULL,
+    modified INTEGER NOT NULL,
+    meta TEXT NOT NULL,            -- project.json as stored, extra fields included
+    meta_mtime_ns INTEGER NOT NULL -- project.json mtime when indexed
+);
+DROP INDEX IF EXISTS projects_modified;
+CREATE INDEX IF NOT EXISTS projects_order ON projects (modified DESC, id);
+CREATE INDEX IF NOT EXISTS projects_type ON projects (type, modified DESC, id);
+"""
+
+# Metadata kept in index columns; projections limited to these skip parsing meta
+INDEX_FIELDS = ("id", "title", "type", "created", "modified")
+
+
+class _ReadWriteLock:
+    """Many readers or one writer. A waiting writer holds off new readers."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
 
 class ProjectStorage:
     """JSON-based project CRUD with auto-cleanup and export."""
 
-    def __init__(self, base_dir: Optional[str] = None):
+    def __init__(
+        self,
+        base_dir: Optional[str] = None,
+        write_delay: float = 0.0,
+        max_write_delay: float = 10.0,
+    ):
+        """
+        Open (and index) a project directory.
+
+        Args:
+            base_dir: Projects directory (default ~/.openmobilevoice/projects/)
+            write_delay: Seconds without updates before a project's changes
+                are written; 0 writes every update immediately
+            max_write_delay: Longest time an update stays unwritten while
+                updates keep arriving
+        """
+        self.write_delay = write_delay
+        self.max_write_delay = max(max_write_delay, write_delay)
         self._base_dir = Path(base_dir) if base_dir else DEFAULT_PROJECTS_DIR
         self._base_dir.mkdir(parents=True, exist_ok=True)
-        self._lock = threading.RLock()  # Reentrant — export_all() calls get() while holding lock
+        # Not reentrant: no method takes it while already holding it
+        self._rw_lock = _ReadWriteLock()
+        self._project_locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()  # Protects _project_locks, _connections and _flusher
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        # project ID -> {"meta", "content" (None = unchanged), "since", "updated"};
+        # entries are replaced, never mutated, so get() can read them unlocked
+        self._pending: dict[str, dict] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._open_index().close()  # Create or rebuild before any thread connects
+        self._sync_index()
 
     def create(self, title: str, project_type: str, content: str) -> str:
         """Create a new project. Returns the project ID."""
-        with self._lock:
+        with self._rw_lock.read():
             project_id = self._generate_id()
             project_dir = self._base_dir / project_id
             project_dir.mkdir(parents=True, exist_ok=True)
@@ -45,74 +158,172 @@ class ProjectStorage:
                 "modified": now,
             }
 
-            (project_dir / "project.json").write_text(
-                json.dumps(metadata, indent=2), encoding="utf-8"
-            )
-            (project_dir / "content.txt").write_text(content, encoding="utf-8")
+            self._write_atomic(project_dir / "content.txt", content)
+            self._write_atomic(project_dir / "project.json", json.dumps(metadata, indent=2))
+            self._index_project(project_id, metadata)
 
             logger.info(f"Project created: {project_id} ({title})")
             return project_id
 
     def get(self, project_id: str) -> Optional[dict]:
         """Get a project by ID. Returns None if not found."""
-        with self._lock:
-            project_dir = self._base_dir / project_id
-            meta_file = project_dir / "project.json"
-            if not meta_file.exists():
-                return None
-
-            try:
+        # No lock: files are only ever replaced whole (see _write_atomic)
+        project_dir = self._base_dir / project_id
+        pending = self._pending.get(project_id)
+        meta_file = project_dir / "project.json"
+        if pending is None and not meta_file.exists():
+            return None
+
+        try:
+            if pending is not None:
+                meta = dict(pending["meta"])
+                if pending["content"] is not None:
+                    meta["content"] = pending["content"]
+                    return meta
+            else:
                 meta = json.loads(meta_file.read_text(encoding="utf-8"))
-                content_file = project_dir / "content.txt"
-                meta["content"] = content_file.read_text(encoding="utf-8") if content_file.exists() else ""
-                return meta
-            except Exception as e:
-                logger.warning(f"Failed to read project {project_id}: {e}")
-                return None
-
-    def list_projects(self) -> list[dict]:
-        """List all projects, sorted by modified date (newest first)."""
-        with self._lock:
-            projects = []
-            if not self._base_dir.exists():
-                return projects
-
-            for project_dir in self._base_dir.iterdir():
-                if not project_dir.is_dir():
-                    continue
-                meta_file = project_dir / "project.json"
-                if not meta_file.exists():
-                    continue
-                try:
-                    meta = json.loads(meta_file.read_text(encoding="utf-8"))
-                    projects.append(meta)
-                except Exception:
-                    continue
-
-            projects.sort(key=lambda p: p.get("modified", 0), reverse=True)
-            return projects
+            content_file = project_dir / "content.txt"
+            meta["content"] = content_file.read_text(encoding="utf-8") if content_file.exists() else ""
+            return meta
+        except Exception as e:
+            logger.warning(f"Failed to read project {project_id}: {e}")
+            return None
+
+    def list_projects(
+        self,
+        project_type: Optional[str] = None,
+        title_prefix: Optional[str] = None,
+        fields: Optional[list[str]] = None,
+    ) -> list[dict]:
+        """List all matching projects, sorted by modified date (newest first).
+
+        Arguments are as for list_page().
+        """
+        return self.list_page(project_type=project_type, title_prefix=title_prefix, fields=fields)["projects"]
+
+    def list_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        project_type: Optional[str] = None,
+        title_prefix: Optional[str] = None,
+        fields: Optional[list[str]] = None,
+    ) -> dict:
+        """
+        One page of projects, sorted by modified date (newest first).
+
+        Args:
+            limit: Projects per page; None returns every match
+            cursor: next_cursor from the previous page
+            project_type: Only projects of this type (e.g. "tts", "stt")
+            title_prefix: Only titles starting with this (ASCII case-insensitive)
+            fields: Metadata keys to return (default all); keys in INDEX_FIELDS
+                are read from the index without parsing project.json
+
+        Returns:
+            {"projects": [...], "next_cursor": str, or None on the last page}
+
+        Raises:
+            ValueError: If limit is below 1 or cursor is malformed
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        after = self._parse_cursor(cursor) if cursor else None
+
+        # Unwritten updates are newer than the index: query the rest and
+        # merge the pending projects in from memory
+        pending = {project_id: entry["meta"] for project_id, entry in dict(self._pending).items()}
+        where, params = [], []
+        if project_type is not None:
+            where.append("type = ?")
+            params.append(project_type)
+        if title_prefix:
+            escaped = title_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where.append("title LIKE ? ESCAPE '\\'")
+            params.append(escaped + "%")
+        if after is not None:
+            where.append("(modified < ? OR (modified = ? AND id > ?))")
+            params += [after[0], after[0], after[1]]
+        if pending:
+            where.append(f"id NOT IN ({', '.join('?' * len(pending))})")
+            params += list(pending)
+        sql = "SELECT id, title, type, created, modified, meta FROM projects"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY modified DESC, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)  # One extra row tells whether another page follows
+
+        with self._rw_lock.read():
+            rows = self._db().execute(sql, params).fetchall()
+        # (modified, id, index row, or None and the pending metadata)
+        matches = [(row[4], row[0], row, None) for row in rows]
+        for project_id, meta in pending.items():
+            modified = int(meta.get("modified") or 0)
+            if project_type is not None and str(meta.get("type", "")) != project_type:
+                continue
+            if title_prefix and not str(meta.get("title", "")).lower().startswith(title_prefix.lower()):
+                continue
+            if after is not None and not (modified < after[0] or (modified == after[0] and project_id > after[1])):
+                continue
+            matches.append((modified, project_id, None, meta))
+        if pending:
+            matches.sort(key=lambda m: (-m[0], m[1]))
+
+        next_cursor = None
+        if limit is not None and len(matches) > limit:
+            matches = matches[:limit]
+            next_cursor = f"{matches[-1][0]}:{matches[-1][1]}"
+
+        columns = None
+        if fields is not None and set(fields) <= set(INDEX_FIELDS):
+            columns = [INDEX_FIELDS.index(field) for field in fields]
+        projects = []
+        for _, _, row, pending_meta in matches:
+            if row is not None and columns is not None:
+                projects.append({field: row[i] for field, i in zip(fields, columns)})
+                continue
+            meta = json.loads(row[5]) if row is not None else dict(pending_meta)
+            projects.append(meta if fields is None else {field: meta[field] for field in fields if field in meta})
+        return {"projects": projects, "next_cursor": next_cursor}
 
     def update(
         self, project_id: str, content: Optional[str] = None, title: Optional[str] = None
     ) -> bool:
         """Update a project's content and/or title. Returns True if found."""
-        with self._lock:
-            project_dir = self._base_dir / project_id
-            meta_file = project_dir / "project.json"
+        with self._rw_lock.read(), self._project_lock(project_id):
+            # Checked under the lock: a delete that held it has finished
+            meta_file = self._base_dir / project_id / "project.json"
             if not meta_file.exists():
+                self._pending.pop(project_id, None)
+                self._drop_project_lock(project_id)
                 return False
+            pending = self._pending.get(project_id)
 
             try:
-                meta = json.loads(meta_file.read_text(encoding="utf-8"))
+                if pending is not None:
+                    meta = dict(pending["meta"])
+                else:
+                    meta = json.loads(meta_file.read_text(encoding="utf-8"))
                 meta["modified"] = int(time.time() * 1000)
                 if title is not None:
                     meta["title"] = title
-                meta_file.write_text(json.dumps(meta, indent=2), encoding="utf-8")
-
-                if content is not None:
-                    (project_dir / "content.txt").write_text(content, encoding="utf-8")
 
-                logger.info(f"Project updated: {project_id}")
+                if self.write_delay <= 0:
+                    self._write_project(project_id, meta, content)
+                    logger.info(f"Project updated: {project_id}")
+                    return True
+
+                now = time.monotonic()
+                self._pending[project_id] = {
+                    "meta": meta,
+                    "content": content if content is not None else (pending or {}).get("content"),
+                    "since": pending["since"] if pending is not None else now,
+                    "updated": now,
+                }
+                self._ensure_flusher()
+                logger.debug(f"Project update deferred: {project_id}")
                 return True
             except Exception as e:
                 logger.warning(f"Failed to update project {project_id}: {e}")
@@ -120,13 +331,20 @@ class ProjectStorage:
 
     def delete(self, project_id: str) -> bool:
         """Delete a project and all its files."""
-        with self._lock:
+        with self._rw_lock.read(), self._project_lock(project_id):
+            self._pending.pop(project_id, None)
             project_dir = self._base_dir / project_id
             if not project_dir.exists():
+                self._drop_project_lock(project_id)
                 return False
 
             import shutil
             shutil.rmtree(project_dir, ignore_errors=True)
+            db = self._db()
+            with db:
+                db.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+            # Only now: a writer given a fresh lock must find the folder gone
+            self._drop_project_lock(project_id)
             logger.info(f"Project deleted: {project_id}")
             return True
 
@@ -135,43 +353,43 @@ class ProjectStorage:
         if max_age_days <= 0:
             return 0
 
-        with self._lock:
-            cutoff = int(time.time() * 1000) - (max_age_days * 24 * 60 * 60 * 1000)
-            deleted = 0
-
-            if not self._base_dir.exists():
-                return 0
-
-            for project_dir in list(self._base_dir.iterdir()):
-                if not project_dir.is_dir():
-                    continue
-
-                meta_file = project_dir / "project.json"
-                if not meta_file.exists():
-                    import shutil
-                    shutil.rmtree(project_dir, ignore_errors=True)
-                    deleted += 1
-                    continue
-
-                try:
-                    meta = json.loads(meta_file.read_text(encoding="utf-8"))
-                    modified = meta.get("modified", 0)
-                    if 0 < modified < cutoff:
-                        import shutil
-                        shutil.rmtree(project_dir, ignore_errors=True)
-                        deleted += 1
-                except Exception:
-                    import shutil
-                    shutil.rmtree(project_dir, ignore_errors=True)
-                    deleted += 1
+        import shutil
 
+        # Exclusive: no single-project write, listing or export runs meanwhile
+        with self._rw_lock.write():
+            cutoff = int(time.time() * 1000) - (max_age_days * 24 * 60 * 60 * 1000)
+            # Pending projects were just modified; write them so the index agrees
+            for project_id in list(self._pending):
+                self._write_pending(project_id)
+
+            # Picks up folders added or edited outside the server; folders
+            # without readable metadata are removed as before
+            broken = self._sync_index()
+            for project_dir in broken:
+                shutil.rmtree(project_dir, ignore_errors=True)
+
+            db = self._db()
+            expired = [
+                project_id for (project_id,) in db.execute(
+                    "SELECT id FROM projects WHERE modified > 0 AND modified < ?", (cutoff,)
+                )
+            ]
+            for project_id in expired:
+                shutil.rmtree(self._base_dir / project_id, ignore_errors=True)
+            with db:
+                db.executemany("DELETE FROM projects WHERE id = ?", [(p,) for p in expired])
+            with self._guard:
+                for project_id in expired:
+                    self._project_locks.pop(project_id, None)
+
+            deleted = len(broken) + len(expired)
             if deleted > 0:
                 logger.info(f"Auto-cleanup: deleted {deleted} projects older than {max_age_days} days")
             return deleted
 
     def export_all(self) -> dict:
         """Export all projects as a single dict (metadata + text, no audio)."""
-        with self._lock:
+        with self._rw_lock.read():
             projects = []
             if not self._base_dir.exists():
                 return {"exported_at": int(time.time() * 1000), "format_version": 1, "projects": [], "count": 0}
@@ -189,6 +407,205 @@ class ProjectStorage:
                 "count": len(projects),
             }
 
+    def flush(self, due_only: bool = False) -> int:
+        """
+        Write deferred updates to disk.
+
+        Args:
+            due_only: Only write projects idle for write_delay or pending
+                for max_write_delay (the background thread's pass)
+
+        Returns:
+            Number of projects written
+        """
+        now = time.monotonic()
+        written = 0
+        for project_id, entry in list(self._pending.items()):
+            if due_only and (now - entry["updated"] < self.write_delay
+                             and now - entry["since"] < self.max_write_delay):
+                continue
+            with self._rw_lock.read(), self._project_lock(project_id):
+                written += self._write_pending(project_id)
+        return written
+
+    def close(self) -> None:
+        """Write deferred updates, stop the flush thread and close the index."""
+        with self._guard:
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._stop.set()
+            flusher.join()
+            self._stop.clear()
+        self.flush()
+        with self._guard:
+            for db in self._connections:
+                db.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _project_lock(self, project_id: str) -> threading.Lock:
+        """The lock serializing writes to one project."""
+        with self._guard:
+            return self._project_locks.setdefault(project_id, threading.Lock())
+
+    def _drop_project_lock(self, project_id: str) -> None:
+        """Forget the lock of a project that no longer exists."""
+        with self._guard:
+            self._project_locks.pop(project_id, None)
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flush thread if it is not running."""
+        with self._guard:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, name="project-flush", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        # Check often enough that a project is written within ~1.25x write_delay
+        interval = max(self.write_delay / 4, 0.01)
+        while not self._stop.wait(interval):
+            try:
+                self.flush(due_only=True)
+            except Exception as e:
+                logger.warning(f"Project flush failed: {e}")
+
+    def _write_pending(self, project_id: str) -> int:
+        """Write one project's deferred update. Caller holds its lock (or the exclusive side)."""
+        entry = self._pending.get(project_id)
+        if entry is None:
+            return 0
+        if not (self._base_dir / project_id / "project.json").exists():
+            # Deleted (here or outside the server) since the update
+            self._pending.pop(project_id, None)
+            return 0
+        try:
+            self._write_project(project_id, entry["meta"], entry["content"])
+        except Exception as e:
+            # Kept pending (and served to readers); retried on the next pass
+            logger.warning(f"Failed to write project {project_id}: {e}")
+            return 0
+        del self._pending[project_id]
+        logger.info(f"Project updated: {project_id}")
+        return 1
+
+    def _write_project(self, project_id: str, meta: dict, content: Optional[str]) -> None:
+        """Write metadata (and content, unless None) and index it."""
+        project_dir = self._base_dir / project_id
+        if content is not None:
+            self._write_atomic(project_dir / "content.txt", content)
+        self._write_atomic(project_dir / "project.json", json.dumps(meta, indent=2))
+        self._index_project(project_id, meta)
+
+    @staticmethod
+    def _write_atomic(path: Path, text: str) -> None:
+        """Replace a file in one step, so readers see the old or the new version."""
+        tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _db(self) -> sqlite3.Connection:
+        """This thread's index connection (WAL lets them read concurrently)."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._open_index()
+            self._local.db = db
+            with self._guard:
+                self._connections.append(db)
+        return db
+
+    def _open_index(self) -> sqlite3.Connection:
+        """Open (or recreate, if unreadable) the metadata index."""
+        path = self._base_dir / INDEX_FILE
+        for attempt in range(2):
+            db = None
+            try:
+                db = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.executescript(_INDEX_SCHEMA)
+                return db
+            except sqlite3.DatabaseError as e:
+                if attempt:
+                    raise
+                # Only derived data lives here; rebuild it from the folders
+                logger.warning(f"Project index unreadable ({e}), rebuilding")
+                if db is not None:
+                    db.close()
+                for stale in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")):
+                    stale.unlink(missing_ok=True)
+
+    def _sync_index(self) -> list[Path]:
+        """
+        Bring the index in line with the project folders.
+
+        Only project.json files whose mtime changed since they were indexed
+        are read, so an up-to-date index costs one stat per project.
+
+        Returns:
+            Project folders without readable metadata (not indexed)
+        """
+        db = self._db()
+        indexed = dict(db.execute("SELECT id, meta_mtime_ns FROM projects"))
+        seen = set()
+        broken = []
+        rows = []
+        for project_dir in self._base_dir.iterdir():
+            if not project_dir.is_dir():
+                continue
+            meta_file = project_dir / "project.json"
+            try:
+                mtime_ns = meta_file.stat().st_mtime_ns
+                if indexed.get(project_dir.name) != mtime_ns:
+                    rows.append(self._index_row(project_dir.name, json.loads(meta_file.read_text(encoding="utf-8")), mtime_ns))
+            except Exception:
+                broken.append(project_dir)
+                continue
+            seen.add(project_dir.name)
+
+        removed = [(project_id,) for project_id in indexed if project_id not in seen]
+        with db:
+            db.executemany("INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            db.executemany("DELETE FROM projects WHERE id = ?", removed)
+        if rows or removed:
+            logger.info(f"Project index: {len(rows)} updated, {len(removed)} removed, {len(seen)} total")
+        return broken
+
+    def _index_project(self, project_id: str, meta: dict) -> None:
+        """Record a project's metadata just written to project.json."""
+        mtime_ns = (self._base_dir / project_id / "project.json").stat().st_mtime_ns
+        db = self._db()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._index_row(project_id, meta, mtime_ns),
+            )
+
+    @staticmethod
+    def _index_row(project_id: str, meta: dict, mtime_ns: int) -> tuple:
+        """Index columns for a project; the folder name is the ID, as in get()."""
+        if not isinstance(meta, dict):
+            raise ValueError("project.json is not an object")
+        return (
+            project_id,
+            str(meta.get("title", "")),
+            str(meta.get("type", "")),
+            int(meta.get("created") or 0),
+            int(meta.get("modified") or 0),
+            json.dumps(meta),
+            mtime_ns,
+        )
+
+    @staticmethod
+    def _parse_cursor(cursor: str) -> tuple[int, str]:
+        """(modified, id) of the last project on the previous page."""
+        modified, sep, project_id = cursor.partition(":")
+        try:
+            if not sep or not project_id:
+                raise ValueError
+            return int(modified), project_id
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from None
+
     def _generate_id(self) -> str:
         import uuid
         return f"proj_{uuid.uuid4().hex[:16]}"
@@ -0,0 +1,108 @@
+"""Detection of running headers and footers in extracted PDF pages.
+
+Page headers, footers and watermark lines are repeated on every page of
+most PDFs. Read aloud, they interrupt the text hundreds of times and cost
+minutes of synthesis. RunningLineFilter learns which lines repeat at the
+same position (counted from the top or bottom of the page) across a sample
+of pages and drops them from every page.
+"""
+
+import math
+import re
+from collections import Counter
+from itertools import chain, islice
+from typing import Iterable, Iterator, List, Set, Tuple
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# (edge, rank from that edge, normalized line text)
+LineKey = Tuple[str, int, str]
+
+
+class RunningLineFilter:
+    """Drop lines repeated at the same position across PDF pages."""
+
+    # Non-empty lines checked at the top and at the bottom of each page
+    EDGE_LINES = 3
+    # Pages sampled to learn the running lines before any page is yielded
+    SAMPLE_PAGES = 12
+    # A line must repeat on at least this many sampled pages, and on at
+    # least MIN_RATIO of them
+    MIN_PAGES = 3
+    MIN_RATIO = 0.5
+    # Pages with fewer non-empty lines are left alone (their edges are body text)
+    MIN_PAGE_LINES = 2 * EDGE_LINES
+    # Average speaking rate used to estimate the synthesis saved
+    SPEECH_CHARS_PER_SECOND = 15
+
+    def __init__(self):
+        self.running_lines: Set[LineKey] = set()
+        self.removed_lines = 0
+        self.removed_chars = 0
+
+    @property
+    def saved_seconds(self) -> float:
+        """Estimated seconds of speech no longer synthesized."""
+        return self.removed_chars / self.SPEECH_CHARS_PER_SECOND
+
+    def filter(self, pages: Iterable[str]) -> Iterator[str]:
+        """
+        Yield pages with running lines removed.
+
+        The first SAMPLE_PAGES pages are read ahead to learn the running
+        lines; pages left empty are skipped.
+
+        Args:
+            pages: Cleaned page text in document order
+
+        Yields:
+            Page text without running headers/footers
+        """
+        pages = iter(pages)
+        sample = list(islice(pages, self.SAMPLE_PAGES))
+        self.learn(sample)
+        for page in chain(sample, pages):
+            page = self.strip(page)
+            if page:
+                yield page
+
+    def learn(self, pages: List[str]) -> None:
+        """Find the lines repeated at the same position across pages."""
+        counts: Counter = Counter()
+        for page in pages:
+            counts.update({key for key, _ in self._edge_lines(page.split('\n'))})
+        threshold = max(self.MIN_PAGES, math.ceil(len(pages) * self.MIN_RATIO))
+        self.running_lines = {key for key, count in counts.items() if count >= threshold}
+        if self.running_lines:
+            logger.debug(f"Running lines: {sorted(key[2] for key in self.running_lines)}")
+
+    def strip(self, page: str) -> str:
+        """Remove learned running lines from one page."""
+        if not self.running_lines:
+            return page
+        lines = page.split('\n')
+        drop = {i for key, i in self._edge_lines(lines) if key in self.running_lines}
+        if not drop:
+            return page
+        self.removed_lines += len(drop)
+        self.removed_chars += sum(len(lines[i].strip()) for i in drop)
+        text = '\n'.join(line for i, line in enumerate(lines) if i not in drop)
+        return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+    def _edge_lines(self, lines: List[str]) -> List[Tuple[LineKey, int]]:
+        """Keys and indices of the non-empty lines nearest the top and bottom."""
+        non_empty = [i for i, line in enumerate(lines) if line.strip()]
+        if len(non_empty) < self.MIN_PAGE_LINES:
+            return []
+        top = non_empty[:self.EDGE_LINES]
+        bottom = non_empty[-self.EDGE_LINES:][::-1]
+        return [(('top', rank, self._normalize(lines[i])), i) for rank, i in enumerate(top)] + [
+            (('bottom', rank, self._normalize(lines[i])), i) for rank, i in enumerate(bottom)
+        ]
+
+    @staticmethod
+    def _normalize(line: str) -> str:
+        """Compare lines ignoring case, spacing and numbers (page numbers, dates)."""
+        return re.sub(r'\d+', '#', ' '.join(line.split()).lower())
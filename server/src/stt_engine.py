@@ -8,10 +8,20 @@ on first use if not already present.
 from __future__ import annotations
 
 import logging
+import queue
 import subprocess
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from .config import settings
+from .vad import Segment, SpeechSegmenter
 
 logger = logging.getLogger(__name__)
 
@@ -24,15 +34,86 @@ except ImportError:
     logger.info("sherpa_onnx not installed — STT features disabled on desktop")
 
 
+# ffmpeg stdout is read straight into a growing buffer in chunks of this size
+PIPE_READ_BYTES = 1024 * 1024
+
+
+def pcm16_to_float32(pcm: Union[bytes, bytearray, memoryview]) -> np.ndarray:
+    """
+    Convert 16-bit little-endian PCM to float32 samples in [-1, 1).
+
+    The int16 view over ``pcm`` is not copied; the float32 result is written
+    and scaled in a single output array.
+
+    Args:
+        pcm: Raw s16le bytes (a trailing odd byte is ignored)
+
+    Returns:
+        1-D float32 array with one sample per 16-bit frame
+    """
+    shorts = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    samples = np.empty(shorts.shape, dtype=np.float32)
+    np.multiply(shorts, np.float32(1.0 / 32768.0), out=samples)
+    return samples
+
+
+def read_pipe(stream) -> bytearray:
+    """
+    Read a binary stream to EOF into a single growing buffer.
+
+    Avoids the list of chunks plus join that ``stream.read()`` would build,
+    so peak memory stays close to the size of the data.
+
+    Args:
+        stream: Binary file object (e.g. a subprocess pipe)
+
+    Returns:
+        All bytes read
+    """
+    buf = bytearray()
+    while chunk := stream.read(PIPE_READ_BYTES):
+        buf += chunk
+    return buf
+
+
 class SttEngine:
     """Moonshine v2 STT engine via sherpa-onnx."""
 
     SAMPLE_RATE = 16000
     MODEL_NAME = "sherpa-onnx-moonshine-base-en-int8"
-
-    def __init__(self, model_dir: Optional[str] = None):
+    # ffmpeg is killed if a file decode takes longer than this
+    DECODE_TIMEOUT_SECONDS = 300
+
+    def __init__(
+        self,
+        model_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        long_audio_seconds: Optional[float] = None,
+        segmenter: Optional[SpeechSegmenter] = None,
+        recognizers: Optional[int] = None,
+        num_threads: Optional[int] = None,
+    ):
         self._recognizer = None
+        # Idle recognizers; each decode borrows one so concurrent requests
+        # run on separate ONNX sessions instead of queueing behind one
+        self._pool: Optional[queue.Queue] = None
         self._model_dir = model_dir
+        self.recognizers = max(1, recognizers or settings.STT_RECOGNIZERS)
+        self.num_threads = max(1, num_threads or settings.STT_NUM_THREADS)
+        # Each batch borrows a recognizer, so threads beyond the pool size would only wait
+        self.workers = min(max(1, workers or settings.STT_WORKERS), self.recognizers)
+        self._batch_pool: Optional[ThreadPoolExecutor] = None
+        self._batch_pool_lock = threading.Lock()
+        self.batch_size = max(1, batch_size or settings.STT_BATCH_SIZE)
+        self.long_audio_seconds = (
+            settings.STT_LONG_AUDIO_SECONDS if long_audio_seconds is None else long_audio_seconds
+        )
+        self.segmenter = segmenter or SpeechSegmenter(
+            settings.STT_VAD_MODEL,
+            min_silence_seconds=settings.STT_MIN_SILENCE_SECONDS,
+            max_segment_seconds=settings.STT_MAX_SEGMENT_SECONDS,
+        )
 
     @property
     def is_available(self) -> bool:
@@ -87,21 +168,44 @@ class SttEngine:
         else:
             raise FileNotFoundError(f"No decoder files found in {model_path}. Found: {onnx_files}")
 
-        self._recognizer = sherpa_onnx.OfflineRecognizer.from_moonshine(
-            tokens=str(model_path / "tokens.txt"),
-            num_threads=4,
-            decoding_method="greedy_search",
-            **moonshine_config,
+        recognizers = [
+            sherpa_onnx.OfflineRecognizer.from_moonshine(
+                tokens=str(model_path / "tokens.txt"),
+                num_threads=self.num_threads,
+                decoding_method="greedy_search",
+                **moonshine_config,
+            )
+            for _ in range(self.recognizers)
+        ]
+        self._pool = queue.Queue()
+        for recognizer in recognizers:
+            self._pool.put(recognizer)
+        self._recognizer = recognizers[0]
+
+        logger.info(
+            f"Moonshine v2 STT engine initialized: {self.recognizers} recognizer(s) "
+            f"x {self.num_threads} thread(s)"
         )
 
-        logger.info("Moonshine v2 STT engine initialized")
+    @contextmanager
+    def _checkout(self):
+        """Borrow an idle recognizer for one decode, waiting if all are busy."""
+        if self._pool is None:
+            yield self._recognizer
+            return
+        recognizer = self._pool.get()
+        try:
+            yield recognizer
+        finally:
+            self._pool.put(recognizer)
 
-    def transcribe(self, samples: list[float], sample_rate: int = SAMPLE_RATE) -> str:
+    def transcribe(self, samples: Union[np.ndarray, Sequence[float]], sample_rate: int = SAMPLE_RATE) -> str:
         """
         Transcribe PCM audio samples to text.
 
         Args:
-            samples: Float audio samples normalized to [-1, 1]
+            samples: Float audio samples normalized to [-1, 1] (a float32
+                array is passed to sherpa-onnx without conversion)
             sample_rate: Sample rate in Hz (default 16000)
 
         Returns:
@@ -110,15 +214,128 @@ class SttEngine:
         if self._recognizer is None:
             raise RuntimeError("STT engine not initialized")
 
-        stream = self._recognizer.create_stream()
-        stream.accept_waveform(sample_rate, samples)
-        self._recognizer.decode(stream)
+        if not isinstance(samples, np.ndarray) or samples.dtype != np.float32:
+            samples = np.asarray(samples, dtype=np.float32)
+
+        with self._checkout() as recognizer:
+            stream = recognizer.create_stream()
+            stream.accept_waveform(sample_rate, samples)
+            recognizer.decode(stream)
         text = stream.result.text.strip()
 
         logger.info(f"Transcribed {len(samples)} samples → {len(text)} chars: {text[:100]}")
         return text
 
-    def transcribe_file(self, file_path: str) -> str:
+    def transcribe_segments(self, samples: np.ndarray) -> list[dict]:
+        """
+        Transcribe a long recording segment by segment.
+
+        Speech segments from the VAD are decoded in batches with
+        ``decode_streams``, batches running in parallel on a thread pool,
+        and reassembled in recording order.
+
+        Args:
+            samples: 16 kHz mono float32 samples normalized to [-1, 1]
+
+        Returns:
+            List of dicts with start and end (seconds) and text, in order;
+            segments where nothing was recognized are omitted
+        """
+        if self._recognizer is None:
+            raise RuntimeError("STT engine not initialized")
+
+        ranges = self.segmenter.segments(samples)
+        batches = [ranges[i:i + self.batch_size] for i in range(0, len(ranges), self.batch_size)]
+        logger.info(
+            f"{len(ranges)} speech segments ({self.segmenter.backend} VAD) "
+            f"in {len(batches)} batches across {min(self.workers, len(batches))} workers"
+        )
+
+        if len(batches) > 1 and self.workers > 1:
+            texts = list(self._batch_executor().map(lambda batch: self._decode_batch(samples, batch), batches))
+        else:
+            texts = [self._decode_batch(samples, batch) for batch in batches]
+
+        segments = []
+        for batch, batch_texts in zip(batches, texts):
+            for (start, end), text in zip(batch, batch_texts):
+                if text:
+                    segments.append({
+                        "start": round(start / self.SAMPLE_RATE, 3),
+                        "end": round(end / self.SAMPLE_RATE, 3),
+                        "text": text,
+                    })
+        return segments
+
+    def create_session(self, partial_interval: Optional[float] = None) -> "SttStreamSession":
+        """
+        Start an incremental transcription of live audio.
+
+        Args:
+            partial_interval: Seconds of new audio between partial
+                hypotheses (default STT_PARTIAL_INTERVAL_SECONDS)
+
+        Returns:
+            Session fed with accept_waveform() and closed with finish()
+        """
+        if self._recognizer is None:
+            raise RuntimeError("STT engine not initialized")
+        if partial_interval is None:
+            partial_interval = settings.STT_PARTIAL_INTERVAL_SECONDS
+        return SttStreamSession(self, partial_interval)
+
+    def _batch_executor(self) -> ThreadPoolExecutor:
+        """Thread pool shared by all segmented transcriptions, one thread per usable recognizer."""
+        with self._batch_pool_lock:
+            if self._batch_pool is None:
+                self._batch_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stt-batch")
+            return self._batch_pool
+
+    def _decode_batch(self, samples: np.ndarray, batch: list[Segment]) -> list[str]:
+        """Decode one batch of segments together and return their texts in order."""
+        with self._checkout() as recognizer:
+            streams = []
+            for start, end in batch:
+                stream = recognizer.create_stream()
+                stream.accept_waveform(self.SAMPLE_RATE, samples[start:end])
+                streams.append(stream)
+            recognizer.decode_streams(streams)
+        return [stream.result.text.strip() for stream in streams]
+
+    def transcribe_samples(self, samples: np.ndarray) -> dict:
+        """
+        Transcribe decoded 16kHz mono samples.
+        Recordings longer than ``long_audio_seconds`` are VAD-segmented
+        (see transcribe_segments); shorter ones are decoded in one stream.
+
+        Args:
+            samples: float32 samples normalized to [-1, 1]
+
+        Returns:
+            Dict with text, segments (start/end seconds and text),
+            duration_ms of the audio and rtf (recognition time / audio time)
+        """
+        started = time.perf_counter()
+        duration = len(samples) / self.SAMPLE_RATE
+
+        if duration > self.long_audio_seconds:
+            segments = self.transcribe_segments(samples)
+        else:
+            text = self.transcribe(samples)
+            segments = [{"start": 0.0, "end": round(duration, 3), "text": text}] if text else []
+
+        elapsed = time.perf_counter() - started
+        rtf = elapsed / duration if duration else 0.0
+        logger.info(f"Transcribed {duration:.1f}s of audio in {elapsed:.2f}s (RTF {rtf:.3f})")
+
+        return {
+            "text": " ".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "duration_ms": int(duration * 1000),
+            "rtf": round(rtf, 4),
+        }
+
+    def transcribe_file(self, file_path: str) -> dict:
         """
         Transcribe an audio file to text.
         Uses ffmpeg to decode to 16kHz mono PCM, then runs Moonshine.
@@ -127,47 +344,177 @@ class SttEngine:
             file_path: Path to the audio file (mp3, aac, ogg, wav, etc.)
 
         Returns:
-            Transcribed text string
+            Result dict as from transcribe_samples
         """
-        samples = self._decode_audio_file(file_path)
-        return self.transcribe(samples)
+        return self.transcribe_samples(self.decode_audio_file(file_path))
 
-    def _decode_audio_file(self, file_path: str) -> list[float]:
-        """Decode any audio file to 16kHz mono float samples using ffmpeg."""
-        import struct
+    def decode_audio_file(self, file_path: str) -> np.ndarray:
+        """
+        Decode any audio file to 16kHz mono float32 samples using ffmpeg.
 
-        tmp = tempfile.NamedTemporaryFile(suffix=".raw", delete=False)
-        tmp_path = tmp.name
-        tmp.close()
+        ffmpeg writes raw s16le PCM to a pipe that is read into one buffer
+        and converted with NumPy, with no PCM temp file and no per-sample
+        Python objects.
 
-        try:
-            cmd = [
-                "ffmpeg", "-i", file_path,
-                "-f", "s16le",       # raw 16-bit signed little-endian
-                "-acodec", "pcm_s16le",
-                "-ar", str(self.SAMPLE_RATE),
-                "-ac", "1",          # mono
-                "-y",                # overwrite
-                tmp_path,
-            ]
-
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=300
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"ffmpeg decode failed: {result.stderr[:500]}")
+        Args:
+            file_path: Path to the audio file
 
-            raw_bytes = Path(tmp_path).read_bytes()
-        finally:
-            Path(tmp_path).unlink(missing_ok=True)
+        Returns:
+            float32 samples normalized to [-1, 1)
 
-        # Convert 16-bit PCM to float [-1, 1]
-        num_samples = len(raw_bytes) // 2
-        shorts = struct.unpack(f"<{num_samples}h", raw_bytes)
-        return [s / 32768.0 for s in shorts]
+        Raises:
+            RuntimeError: If ffmpeg fails or times out
+        """
+        cmd = [
+            "ffmpeg", "-nostdin", "-hide_banner",
+            "-loglevel", "error",  # keep stderr small, it is only read at exit
+            "-i", file_path,
+            "-f", "s16le",         # raw 16-bit signed little-endian
+            "-acodec", "pcm_s16le",
+            "-ar", str(self.SAMPLE_RATE),
+            "-ac", "1",            # mono
+            "pipe:1",
+        ]
+
+        # stderr goes to an anonymous file so a chatty decode can never fill
+        # its pipe and stall ffmpeg while stdout is being drained
+        with tempfile.TemporaryFile() as stderr:
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr) as proc:
+                # The read only returns at EOF, so a stalled ffmpeg is killed
+                # from a timer, which closes its stdout and ends the read
+                timed_out = threading.Event()
+
+                def kill():
+                    timed_out.set()
+                    proc.kill()
+
+                watchdog = threading.Timer(self.DECODE_TIMEOUT_SECONDS, kill)
+                watchdog.daemon = True
+                watchdog.start()
+                try:
+                    pcm = read_pipe(proc.stdout)
+                    returncode = proc.wait()
+                finally:
+                    watchdog.cancel()
+
+            if timed_out.is_set():
+                raise RuntimeError("ffmpeg decode timed out")
+            if returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"ffmpeg decode failed: {stderr.read(500).decode(errors='replace')}")
+
+        return pcm16_to_float32(pcm)
 
     def release(self):
         """Release the STT engine resources."""
         self._recognizer = None
+        self._pool = None
+        with self._batch_pool_lock:
+            if self._batch_pool is not None:
+                self._batch_pool.shutdown(wait=False)
+                self._batch_pool = None
         logger.info("STT engine released")
+
+
+class SttStreamSession:
+    """
+    VAD-chunked live transcription on the offline Moonshine recognizer.
+
+    Moonshine has no streaming decoder, so audio is buffered and, every
+    ``partial_interval`` seconds, the engine's segmenter is run over the
+    audio not yet finalized. Utterances followed by at least the minimum
+    silence (or cut at the maximum segment length) are decoded once and
+    emitted as final; the utterance still in progress is re-decoded as a
+    partial hypothesis. Only the open utterance plus CONTEXT_SECONDS of
+    earlier audio (for the VAD's noise floor) is kept.
+
+    Events are dicts: ``{"type": "partial", "text"}`` and
+    ``{"type": "final", "start", "end", "text"}`` with times in seconds
+    from the start of the session.
+    """
+
+    CONTEXT_SECONDS = 10
+
+    def __init__(self, engine: SttEngine, partial_interval: float):
+        self._engine = engine
+        self._rate = engine.SAMPLE_RATE
+        self._partial_samples = max(1, int(partial_interval * self._rate))
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._offset = 0      # session sample index of _buffer[0]
+        self._committed = 0   # session sample index up to which audio is final
+        self._unprocessed = 0
+        self._partial = ""
+        self.texts: list[str] = []
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio received so far."""
+        return (self._offset + len(self._buffer)) / self._rate
+
+    @property
+    def text(self) -> str:
+        """Final transcript so far."""
+        return " ".join(self.texts)
+
+    def accept_waveform(self, samples: np.ndarray) -> list[dict]:
+        """
+        Add 16 kHz mono float32 samples.
+
+        Returns:
+            Events produced (empty until partial_interval seconds of new
+            audio have arrived)
+        """
+        self._buffer = np.concatenate((self._buffer, np.asarray(samples, dtype=np.float32)))
+        self._unprocessed += len(samples)
+        if self._unprocessed < self._partial_samples:
+            return []
+        return self._process(final=False)
+
+    def finish(self) -> list[dict]:
+        """Finalize all remaining speech and return its events."""
+        return self._process(final=True)
+
+    def _process(self, final: bool) -> list[dict]:
+        """Emit finals for completed utterances and a partial for the open one."""
+        self._unprocessed = 0
+        segmenter = self._engine.segmenter
+        start = self._committed - self._offset
+        tail = len(self._buffer)
+        segments = [(max(s, start), e) for s, e in segmenter.segments(self._buffer) if e > start]
+
+        min_silence = int(segmenter.min_silence_seconds * self._rate)
+        if segments and (final or tail - segments[-1][1] >= min_silence):
+            done, open_segment = segments, None
+        else:
+            done, open_segment = segments[:-1], (segments[-1] if segments else None)
+
+        events = []
+        if done:
+            texts = self._engine._decode_batch(self._buffer, done)
+            for (seg_start, seg_end), text in zip(done, texts):
+                if text:
+                    self.texts.append(text)
+                    events.append({
+                        "type": "final",
+                        "start": round((seg_start + self._offset) / self._rate, 3),
+                        "end": round((seg_end + self._offset) / self._rate, 3),
+                        "text": text,
+                    })
+            self._committed = self._offset + done[-1][1]
+            self._partial = ""
+
+        if open_segment is not None and not final:
+            text = self._engine._decode_batch(self._buffer, [open_segment])[0]
+            if text != self._partial:
+                self._partial = text
+                events.append({"type": "partial", "text": text})
+        elif open_segment is None:
+            # Nothing open: the audio up to the last min_silence is silence
+            self._committed = max(self._committed, self._offset + tail - min_silence)
+
+        # Drop audio that is final, keeping some context for the VAD
+        cut = max(0, self._committed - self._offset - int(self.CONTEXT_SECONDS * self._rate))
+        if cut:
+            self._buffer = self._buffer[cut:].copy()
+            self._offset += cut
+        return events
@@ -2,15 +2,30 @@
 
 import re
 import unicodedata
+from functools import partial
 from typing import List
 
-from num2words import num2words
-
 from .config import settings
 from .logging_config import get_logger, preview_text
+from .number_words import decimal_to_words, integer_to_words, num2words_lang
+from .process_pools import get_process_pool
 
 logger = get_logger(__name__)
 
+# Candidate shard boundary: a paragraph break after a plain word ending in
+# sentence punctuation, followed by a letter. No single-paragraph
+# normalization rule matches across such a break.
+_SHARD_BOUNDARY = re.compile(r'(?<=\s)[^\W\d_]+[.!?](\n\n)(?=[^\W\d_])')
+
+# Markdown/markup delimiters whose regexes can span paragraphs; a shard is
+# only cut where each of these is balanced
+_SHARD_BALANCED_MARKERS = ('```', '`', '*', '_', '[', ']', '(', ')', '<', '>')
+
+
+def _normalize_shard(text: str, language: str = None) -> str:
+    """Process pool entry point: serially normalize one shard."""
+    return TextPreprocessor().normalize(text, language, parallel=False)
+
 
 class TextPreprocessor:
     """Preprocess text for optimal TTS quality."""
@@ -56,19 +71,86 @@ class TextPreprocessor:
         flags=re.UNICODE
     )
 
-    def __init__(self, max_chunk_tokens: int = None):
+    # Fallback split points for sentences longer than max_chunk_tokens,
+    # tried in order from strongest to weakest clause boundary
+    CLAUSE_BOUNDARIES = [
+        re.compile(r'(?<=[;:])\s+'),
+        re.compile(r'(?<=,)\s+'),
+        re.compile(
+            r'\s+(?=(?:and|but|or|nor|yet|because|although|though|whereas|while|unless|until|which)\b)',
+            re.IGNORECASE,
+        ),
+    ]
+
+    # CJK text has no spaces between sentences; NFKC maps full-width ！？，；：
+    # to ASCII, so both forms are matched
+    _CJK_CLAUSE_BOUNDARIES = [
+        re.compile(r'(?<=[;:；：])\s*'),
+        re.compile(r'(?<=[,，、])\s*'),
+    ]
+
+    # Segmentation rules keyed by voice language code (see the 'language'
+    # field of TTSBackend.available_voices). chars_per_token calibrates the
+    # token estimate to speaking rate, so a CJK or Hindi chunk takes about as
+    # long to synthesize as an English chunk of the same token budget.
+    LANGUAGE_RULES = {
+        'default': {
+            'sentence': re.compile(r'(?<=[.!?])\s+'),
+            'clauses': CLAUSE_BOUNDARIES,
+            'joiner': ' ',
+            'chars_per_token': 4,
+        },
+        'zh': {
+            'sentence': re.compile(r'(?<=[。！？!?])\s*|(?<=\.)\s+'),
+            'clauses': _CJK_CLAUSE_BOUNDARIES,
+            'joiner': '',
+            'chars_per_token': 1,
+        },
+        'ja': {
+            'sentence': re.compile(r'(?<=[。！？!?])\s*|(?<=\.)\s+'),
+            'clauses': _CJK_CLAUSE_BOUNDARIES,
+            'joiner': '',
+            'chars_per_token': 2,
+        },
+        'hi': {
+            'sentence': re.compile(r'(?<=[।॥])\s*|(?<=[.!?])\s+'),
+            'clauses': [
+                re.compile(r'(?<=[;:])\s+'),
+                re.compile(r'(?<=,)\s+'),
+                re.compile(r'\s+(?=(?:और|लेकिन|परंतु|किंतु|या|क्योंकि|जबकि)\s)'),
+            ],
+            'joiner': ' ',
+            'chars_per_token': 3,
+        },
+    }
+
+    def __init__(
+        self,
+        max_chunk_tokens: int = None,
+        normalize_workers: int = None,
+        parallel_min_chars: int = None,
+    ):
         """
         Initialize the text preprocessor.
 
         Args:
             max_chunk_tokens: Maximum tokens per chunk (default from settings)
+            normalize_workers: Processes used for parallel normalization
+                (default from settings; 1 disables parallel mode)
+            parallel_min_chars: Input size at which normalize() switches to
+                parallel mode (default from settings)
         """
         self.max_chunk_tokens = max_chunk_tokens or settings.MAX_CHUNK_TOKENS
+        self.normalize_workers = normalize_workers or settings.NORMALIZE_WORKERS
+        self.parallel_min_chars = parallel_min_chars or settings.PARALLEL_NORMALIZE_MIN_CHARS
 
-    def normalize(self, text: str) -> str:
+    def normalize(self, text: str, language: str = None, parallel: bool = True) -> str:
         """
         Normalize text for TTS processing.
 
+        Inputs of at least parallel_min_chars are normalized in shards across
+        a process pool (see normalize_parallel) when parallel is True.
+
         Full pipeline:
         1. Unicode normalization
         2. Strip emojis
@@ -81,10 +163,15 @@ class TextPreprocessor:
 
         Args:
             text: Raw input text
+            language: Voice language code, used for number-to-words
+            parallel: Allow parallel mode for large inputs
 
         Returns:
             Normalized text ready for TTS
         """
+        if parallel and self.normalize_workers > 1 and len(text) >= self.parallel_min_chars:
+            return self.normalize_parallel(text, language)
+
         original_len = len(text)
         original_newlines = text.count('\n')
         original_paragraphs = text.count('\n\n') + 1
@@ -117,7 +204,7 @@ class TextPreprocessor:
             text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
 
         # 7. Convert numbers to words (for better TTS pronunciation)
-        text = self._convert_numbers_to_words(text)
+        text = self._convert_numbers_to_words(text, language)
 
         # 8. Clean up whitespace while PRESERVING paragraph breaks
         # First normalize line endings
@@ -166,6 +253,80 @@ class TextPreprocessor:
 
         return text.strip()
 
+    def normalize_parallel(self, text: str, language: str = None) -> str:
+        """
+        Normalize a large text in shards across a process pool.
+
+        The text is cut only at safe paragraph boundaries (see _split_shards),
+        so every shard normalizes independently and the in-order result
+        matches the serial path.
+
+        Args:
+            text: Raw input text
+            language: Voice language code, used for number-to-words
+
+        Returns:
+            Normalized text ready for TTS
+        """
+        target_size = max(len(text) // (self.normalize_workers * 4), self.parallel_min_chars // 8, 1)
+        shards = self._split_shards(text, target_size)
+        if len(shards) < 2:
+            return self.normalize(text, language, parallel=False)
+
+        logger.info(f"Parallel normalize: {len(text)} chars in {len(shards)} shards across {self.normalize_workers} workers")
+        pool = get_process_pool("normalize", self.normalize_workers)
+        results = pool.map(partial(_normalize_shard, language=language), shards)
+        return '\n\n'.join(r for r in results if r)
+
+    @staticmethod
+    def _split_shards(text: str, target_size: int) -> List[str]:
+        """
+        Split text into shards of roughly target_size at safe paragraph breaks.
+
+        A break is only used when the shard before it has balanced markdown
+        delimiters, so no emphasis, link, code or tag match can straddle it.
+
+        Args:
+            text: Raw input text
+            target_size: Desired shard length in characters
+
+        Returns:
+            List of shards in original order (boundaries removed)
+        """
+        shards = []
+        start = 0
+        counted_to = 0
+        counts = dict.fromkeys(_SHARD_BALANCED_MARKERS, 0)
+
+        for match in _SHARD_BOUNDARY.finditer(text):
+            cut = match.start(1)
+            if cut - start < target_size:
+                continue
+
+            for marker in _SHARD_BALANCED_MARKERS:
+                counts[marker] += text.count(marker, counted_to, cut)
+            counted_to = cut
+
+            balanced = (
+                counts['```'] % 2 == 0
+                and (counts['`'] - 3 * counts['```']) % 2 == 0
+                and counts['*'] % 2 == 0
+                and counts['_'] % 2 == 0
+                and counts['['] == counts[']']
+                and counts['('] == counts[')']
+                and counts['<'] == counts['>']
+            )
+            if not balanced:
+                continue
+
+            shards.append(text[start:cut])
+            start = match.end(1)
+            counted_to = start
+            counts = dict.fromkeys(_SHARD_BALANCED_MARKERS, 0)
+
+        shards.append(text[start:])
+        return shards
+
     def _strip_emojis(self, text: str) -> str:
         """
         Remove emojis to prevent TTS issues.
@@ -304,26 +465,27 @@ class TextPreprocessor:
 
         return text
 
-    def _convert_numbers_to_words(self, text: str) -> str:
+    def _convert_numbers_to_words(self, text: str, language: str = None) -> str:
         """
         Convert standalone numbers to words for better TTS.
 
-        Handles both integers and decimal numbers.
+        Handles both integers and decimal numbers. Conversions go through the
+        shared caches in number_words, in the voice's language when num2words
+        supports it (English otherwise).
 
         Args:
             text: Input text with numbers
+            language: Voice language code (e.g. 'en-us', 'es')
 
         Returns:
             Text with numbers converted to words
         """
+        lang = num2words_lang(language)
+
         def replace_decimal(match):
             """Convert decimal numbers: 3.14 → three point one four"""
             try:
-                parts = match.group(0).split('.')
-                whole = num2words(int(parts[0])) if parts[0] else 'zero'
-                # Convert each decimal digit to words
-                decimal_digits = ' '.join(num2words(int(d)) for d in parts[1])
-                return f"{whole} point {decimal_digits}"
+                return decimal_to_words(match.group(0), lang)
             except (ValueError, OverflowError):
                 return match.group(0)
 
@@ -333,7 +495,7 @@ class TextPreprocessor:
                 num = match.group(0)
                 # Only convert reasonable numbers (not years, IDs, etc.)
                 if len(num) <= 4:
-                    return num2words(int(num))
+                    return integer_to_words(int(num), lang)
                 return num
             except (ValueError, OverflowError):
                 return match.group(0)
@@ -346,20 +508,27 @@ class TextPreprocessor:
 
         return text
 
-    def chunk_text(self, text: str) -> List[dict]:
+    def chunk_text(self, text: str, language: str = None) -> List[dict]:
         """
         Split text into optimal chunks for TTS processing.
 
         Chunks are split at sentence boundaries and target max_chunk_tokens.
         This ensures natural pauses and stays within Kokoro's 510 token limit.
+        Sentences longer than max_chunk_tokens are split further at clause
+        boundaries (see _split_long_sentence).
         Paragraph breaks are preserved in the chunk metadata.
 
         Args:
             text: Preprocessed text to chunk
+            language: Voice language code (e.g. 'en-us', 'ja'); selects the
+                segmentation rules from LANGUAGE_RULES
 
         Returns:
             List of chunk dicts: [{"text": str, "starts_paragraph": bool}, ...]
         """
+        rules = self.get_language_rules(language)
+        joiner = rules['joiner']
+
         # First split into paragraphs to preserve structure
         paragraphs = text.split('\n\n')
 
@@ -370,23 +539,25 @@ class TextPreprocessor:
                 continue
 
             # Split paragraph into sentences
-            sentences = re.split(r'(?<=[.!?])\s+', paragraph.strip())
+            sentences = rules['sentence'].split(paragraph.strip())
 
             current_chunk = []
             current_length = 0
             is_first_in_para = True
 
+            # Break up run-on sentences so no single unit exceeds the limit
+            units = []
             for sentence in sentences:
-                if not sentence.strip():
-                    continue
+                if sentence.strip():
+                    units.extend(self._split_long_sentence(sentence, rules=rules))
 
-                # Rough token estimate: ~4 characters per token (minimum 1)
-                sentence_tokens = max(1, len(sentence) // 4)
+            for sentence in units:
+                sentence_tokens = self._estimate_tokens(sentence, rules['chars_per_token'])
 
                 # If adding this sentence exceeds max, save current chunk
                 if current_length + sentence_tokens > self.max_chunk_tokens and current_chunk:
                     chunks.append({
-                        "text": ' '.join(current_chunk),
+                        "text": joiner.join(current_chunk),
                         "starts_paragraph": is_first_in_para
                     })
                     current_chunk = [sentence]
@@ -399,24 +570,124 @@ class TextPreprocessor:
             # Add remaining sentences from this paragraph
             if current_chunk:
                 chunks.append({
-                    "text": ' '.join(current_chunk),
+                    "text": joiner.join(current_chunk),
                     "starts_paragraph": is_first_in_para
                 })
 
         return chunks
 
-    def process(self, text: str) -> List[dict]:
+    @classmethod
+    def get_language_rules(cls, language: str = None) -> dict:
+        """
+        Look up segmentation rules for a voice language code.
+
+        Matches the full code first ('pt-br'), then its base language ('pt'),
+        and falls back to the default (Latin-script) rules.
+
+        Args:
+            language: Language code from voice metadata, or None
+
+        Returns:
+            Rules dict from LANGUAGE_RULES
+        """
+        if language:
+            language = language.lower()
+            rules = cls.LANGUAGE_RULES.get(language) or cls.LANGUAGE_RULES.get(language.split('-')[0])
+            if rules:
+                return rules
+        return cls.LANGUAGE_RULES['default']
+
+    @staticmethod
+    def _estimate_tokens(text: str, chars_per_token: int = 4) -> int:
+        """Rough token estimate: ~chars_per_token characters per token (minimum 1)."""
+        return max(1, len(text) // chars_per_token)
+
+    def _split_long_sentence(self, sentence: str, level: int = 0, rules: dict = None) -> List[str]:
+        """
+        Split a sentence that exceeds max_chunk_tokens into smaller pieces.
+
+        Tries each of the language's clause boundaries in turn (for the
+        default rules: semicolons/colons, commas, conjunctions) and finally
+        falls back to a hard word-count split, so every returned piece fits
+        within max_chunk_tokens.
+
+        Args:
+            sentence: A single sentence
+            level: Index of the first clause boundary to try
+            rules: Segmentation rules from get_language_rules()
+
+        Returns:
+            List of pieces in original order
+        """
+        rules = rules or self.LANGUAGE_RULES['default']
+        if self._estimate_tokens(sentence, rules['chars_per_token']) <= self.max_chunk_tokens:
+            return [sentence]
+
+        clauses = rules['clauses']
+        while level < len(clauses):
+            parts = [p for p in clauses[level].split(sentence) if p.strip()]
+            level += 1
+            if len(parts) > 1:
+                pieces = []
+                for part in parts:
+                    pieces.extend(self._split_long_sentence(part, level, rules))
+                return pieces
+
+        return self._split_by_words(sentence, rules)
+
+    def _split_by_words(self, text: str, rules: dict = None) -> List[str]:
+        """
+        Hard split on whitespace so each piece fits within max_chunk_tokens.
+
+        Words that are themselves too long (including unspaced CJK runs)
+        are sliced by character count.
+
+        Args:
+            text: Text with no usable clause boundaries
+            rules: Segmentation rules from get_language_rules()
+
+        Returns:
+            List of pieces in original order
+        """
+        rules = rules or self.LANGUAGE_RULES['default']
+        chars_per_token = rules['chars_per_token']
+        max_chars = (self.max_chunk_tokens + 1) * chars_per_token - 1
+        pieces = []
+        current = ''
+
+        for word in text.split():
+            while len(word) > max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ''
+                pieces.append(word[:max_chars])
+                word = word[max_chars:]
+
+            candidate = f"{current} {word}" if current else word
+            if len(candidate) > max_chars and current:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def process(self, text: str, language: str = None) -> List[dict]:
         """
         Full preprocessing pipeline: normalize and chunk text.
 
         Args:
             text: Raw input text
+            language: Voice language code used to pick segmentation and
+                number-to-words rules
 
         Returns:
             List of chunk dicts: [{"text": str, "starts_paragraph": bool}, ...]
         """
         logger.info(f"Processing text: {len(text)} chars input")
-        normalized = self.normalize(text)
-        chunks = self.chunk_text(normalized)
+        normalized = self.normalize(text, language)
+        chunks = self.chunk_text(normalized, language)
         logger.info(f"Processing complete: {len(chunks)} chunks created")
         return chunks
@@ -0,0 +1,135 @@
+"""On-disk cache of speech-to-text transcripts.
+
+Clients retry uploads and re-transcribe the same voice notes. Transcripts
+are stored under a fingerprint of the decoded 16 kHz PCM, and every upload
+that decoded to it is recorded as an alias by the SHA-256 of its bytes:
+
+- an identical upload hits on its byte hash before ffmpeg or the model run;
+- a copy in another container or lossless encoding (same PCM) hits after
+  decoding, skipping recognition, and its byte hash is added as an alias.
+
+The cache is bounded in size and evicts the least recently used entries
+first.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .config import settings
+from .disk_cache import DiskLruCache
+
+
+class TranscriptCache(DiskLruCache):
+    """Size-bounded LRU cache of transcription results on disk.
+
+    Each entry is one JSON file named by its PCM fingerprint:
+    {"result": {...}, "uploads": [upload SHA-256, ...]}, where result is
+    the dict returned by SttEngine.transcribe_samples.
+    """
+
+    NAME = "Transcript cache"
+
+    def __init__(self, cache_dir: str = None, max_mb: int = None):
+        """
+        Initialize the cache and index existing entries.
+
+        Args:
+            cache_dir: Directory for cache files (default from settings)
+            max_mb: Maximum total size in MB; 0 disables the cache
+                (default from settings)
+        """
+        # upload SHA-256 -> PCM fingerprint
+        self._uploads: Dict[str, str] = {}
+        self.upload_hits = 0
+        self.pcm_hits = 0
+        self.misses = 0
+        super().__init__(
+            cache_dir or settings.STT_CACHE_DIR,
+            settings.STT_CACHE_MB if max_mb is None else max_mb,
+        )
+
+    @staticmethod
+    def fingerprint(samples: np.ndarray) -> str:
+        """SHA-256 of decoded float32 samples."""
+        return hashlib.sha256(np.ascontiguousarray(samples, dtype=np.float32).data).hexdigest()
+
+    def get_upload(self, upload_hash: str) -> Optional[dict]:
+        """Result for an upload seen before (by byte hash), or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            key = self._uploads.get(upload_hash)
+        entry = self._get(key) if key else None
+        if entry is None or "result" not in entry:
+            return None
+        with self._lock:
+            self.upload_hits += 1
+        return entry["result"]
+
+    def get_pcm(self, pcm_hash: str, upload_hash: str = None) -> Optional[dict]:
+        """
+        Result for decoded audio seen before, or None (counted as a miss).
+
+        Args:
+            pcm_hash: fingerprint() of the decoded samples
+            upload_hash: SHA-256 of this upload, recorded as a new alias on a hit
+        """
+        if not self.enabled:
+            return None
+        entry = self._get(pcm_hash)
+        with self._lock:
+            if entry is None or "result" not in entry:
+                self.misses += 1
+                return None
+            self.pcm_hits += 1
+            new_alias = upload_hash and self._uploads.get(upload_hash) != pcm_hash
+        if new_alias:
+            self.put(pcm_hash, upload_hash, entry["result"])
+        return entry["result"]
+
+    def put(self, pcm_hash: str, upload_hash: Optional[str], result: dict) -> None:
+        """
+        Store a transcription result, adding upload_hash to its aliases.
+
+        Args:
+            pcm_hash: fingerprint() of the decoded samples
+            upload_hash: SHA-256 of the uploaded bytes
+            result: Dict returned by SttEngine.transcribe_samples
+        """
+        if not self.enabled:
+            return
+
+        # Held across read, write and alias update so concurrent puts merge
+        with self._lock:
+            existing = self._read(pcm_hash)
+            uploads = existing.get("uploads", []) if existing else []
+            if upload_hash and upload_hash not in uploads:
+                uploads.append(upload_hash)
+            if self._store(pcm_hash, {"result": result, "uploads": uploads}):
+                for alias in uploads:
+                    self._uploads[alias] = pcm_hash
+
+    def stats(self) -> dict:
+        """Cache size and hit statistics (a miss is a transcription that had to run)."""
+        with self._lock:
+            return {
+                **self._size_stats(),
+                "upload_hits": self.upload_hits,
+                "pcm_hits": self.pcm_hits,
+                "misses": self.misses,
+            }
+
+    def _accept(self, key: str, path: Path) -> bool:
+        entry = self._load(path)
+        if entry is None or "result" not in entry:
+            return False
+        for upload_hash in entry.get("uploads", []):
+            self._uploads[upload_hash] = key
+        return True
+
+    def _evicted(self, keys: List[str]) -> None:
+        gone = set(keys)
+        self._uploads = {h: k for h, k in self._uploads.items() if k not in gone}
@@ -1,10 +1,27 @@
 """Abstract base class for TTS backends."""
 
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, Dict, List, Tuple
+from typing import AsyncGenerator, AsyncIterable, Dict, Iterable, List, Tuple, Union
 
 import numpy as np
 
+# Text chunks may be a precomputed list or produced incrementally
+# (e.g. page by page while a document is still being extracted)
+TextChunks = Union[Iterable[Dict], AsyncIterable[Dict]]
+
+
+async def iter_text_chunks(text_chunks: TextChunks) -> AsyncGenerator[Tuple[int, Dict], None]:
+    """Enumerate sync or async text chunks as (chunk_index, chunk) pairs."""
+    chunk_index = 0
+    if hasattr(text_chunks, '__aiter__'):
+        async for chunk in text_chunks:
+            yield chunk_index, chunk
+            chunk_index += 1
+    else:
+        for chunk in text_chunks:
+            yield chunk_index, chunk
+            chunk_index += 1
+
 
 class TTSBackend(ABC):
     """Abstract interface for TTS engine backends.
@@ -16,14 +33,15 @@ class TTSBackend(ABC):
     @abstractmethod
     async def generate_speech_stream(
         self,
-        text_chunks: List[Dict],
+        text_chunks: TextChunks,
         voice: str = None,
         speed: float = None,
     ) -> AsyncGenerator[Tuple[bytes, Dict], None]:
         """Generate speech as a stream of (MP3 bytes, timing metadata) tuples.
 
         Args:
-            text_chunks: List of chunk dicts with 'text' and 'starts_paragraph' keys
+            text_chunks: Chunk dicts with 'text' and 'starts_paragraph' keys,
+                as a list or an async iterable (see iter_text_chunks)
             voice: Voice name (e.g. 'af_heart')
             speed: Speech speed multiplier (1.0 = normal)
 
@@ -9,7 +9,7 @@ import numpy as np
 
 from .audio_encoder import StreamingAudioEncoder
 from .config import settings
-from .tts_backend import TTSBackend
+from .tts_backend import TTSBackend, TextChunks, iter_text_chunks
 
 # Thread pool for parallel encoding
 _encoder_pool = ThreadPoolExecutor(max_workers=2)
@@ -78,7 +78,7 @@ class KokoroBackend(TTSBackend):
 
     async def generate_speech_stream(
         self,
-        text_chunks: List[Dict],
+        text_chunks: TextChunks,
         voice: str = None,
         speed: float = None,
     ) -> AsyncGenerator[Tuple[bytes, Dict], None]:
@@ -94,7 +94,7 @@ class KokoroBackend(TTSBackend):
         pending_encode = None
         pending_meta = None
 
-        for chunk_index, chunk_data in enumerate(text_chunks):
+        async for chunk_index, chunk_data in iter_text_chunks(text_chunks):
             text_chunk = chunk_data['text']
             starts_paragraph = chunk_data.get('starts_paragraph', False)
 
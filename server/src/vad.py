@@ -0,0 +1,161 @@
+"""Voice activity detection for splitting long recordings into speech segments.
+
+Moonshine is trained on short utterances: fed a whole recording in one
+stream it slows down, uses memory in proportion to the length and starts
+dropping or repeating words. SpeechSegmenter cuts 16 kHz mono audio into
+speech segments no longer than a maximum length, using sherpa-onnx's
+Silero VAD when its model file is present and an energy threshold
+otherwise.
+"""
+
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import sherpa_onnx
+    HAS_SHERPA = True
+except ImportError:
+    HAS_SHERPA = False
+
+# (start sample, end sample), end exclusive
+Segment = Tuple[int, int]
+
+
+class SpeechSegmenter:
+    """Find speech segments in float32 PCM."""
+
+    SAMPLE_RATE = 16000
+    # Energy fallback: analysis frame length and the margins (dB) a frame
+    # must clear above the noise floor and may sit below the loudest frames
+    FRAME_MS = 30
+    FLOOR_MARGIN_DB = 12.0
+    PEAK_MARGIN_DB = 30.0
+    # Frames quieter than this are never speech (digital silence, hiss)
+    MIN_SPEECH_DB = -60.0
+    # Kept around each segment so word onsets and tails are not clipped
+    PAD_SECONDS = 0.15
+    MIN_SPEECH_SECONDS = 0.25
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        min_silence_seconds: float = 0.5,
+        max_segment_seconds: float = 20.0,
+    ):
+        """
+        Args:
+            model_path: Silero VAD .onnx file; the energy detector is used
+                when it is missing or sherpa-onnx is not installed
+            min_silence_seconds: Pauses shorter than this do not end a segment
+            max_segment_seconds: Longer speech is split at its quietest frame
+        """
+        self.model_path = model_path if model_path and Path(model_path).is_file() else None
+        self.min_silence_seconds = min_silence_seconds
+        self.max_segment_seconds = max_segment_seconds
+
+    @property
+    def backend(self) -> str:
+        """'silero' or 'energy'."""
+        return "silero" if HAS_SHERPA and self.model_path else "energy"
+
+    def segments(self, samples: np.ndarray) -> List[Segment]:
+        """
+        Find speech in a recording.
+
+        Args:
+            samples: 16 kHz mono float32 samples in [-1, 1]
+
+        Returns:
+            Non-overlapping (start, end) sample ranges in order
+        """
+        if len(samples) == 0:
+            return []
+        if self.backend == "silero":
+            return self._silero_segments(samples)
+        return self._energy_segments(samples)
+
+    def _silero_segments(self, samples: np.ndarray) -> List[Segment]:
+        """Segments from sherpa-onnx's Silero VAD."""
+        config = sherpa_onnx.VadModelConfig()
+        config.silero_vad.model = self.model_path
+        config.silero_vad.min_silence_duration = self.min_silence_seconds
+        config.silero_vad.min_speech_duration = self.MIN_SPEECH_SECONDS
+        config.silero_vad.max_speech_duration = self.max_segment_seconds
+        config.sample_rate = self.SAMPLE_RATE
+        vad = sherpa_onnx.VoiceActivityDetector(config, buffer_size_in_seconds=self.max_segment_seconds * 2)
+
+        found: List[Segment] = []
+
+        def drain():
+            while not vad.empty():
+                segment = vad.front
+                found.append((segment.start, segment.start + len(segment.samples)))
+                vad.pop()
+
+        window = config.silero_vad.window_size
+        for i in range(0, len(samples), window):
+            vad.accept_waveform(samples[i:i + window])
+            drain()
+        vad.flush()
+        drain()
+        return self._pad(found, len(samples))
+
+    def _energy_segments(self, samples: np.ndarray) -> List[Segment]:
+        """Segments where frame energy clears an adaptive threshold."""
+        frame = self.SAMPLE_RATE * self.FRAME_MS // 1000
+        n_frames = -(-len(samples) // frame)
+        padded = np.zeros(n_frames * frame, dtype=np.float32)
+        padded[:len(samples)] = samples
+        frames = padded.reshape(n_frames, frame)
+        db = 10 * np.log10(np.einsum("ij,ij->i", frames, frames) / frame + 1e-12)
+
+        # Between the noise floor and the loudest frames; a recording
+        # without pauses has floor == peak and counts as all speech
+        floor = np.percentile(db, 10)
+        peak = np.percentile(db, 99)
+        threshold = max(min(floor + self.FLOOR_MARGIN_DB, peak - self.PEAK_MARGIN_DB), self.MIN_SPEECH_DB)
+        speech = db > threshold
+
+        # Runs of speech frames, merged across pauses shorter than min_silence
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0]))))
+        runs = list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+        min_gap = self.min_silence_seconds * 1000 / self.FRAME_MS
+        merged: List[List[int]] = []
+        for start, end in runs:
+            if merged and start - merged[-1][1] < min_gap:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
+
+        min_frames = self.MIN_SPEECH_SECONDS * 1000 / self.FRAME_MS
+        max_frames = max(2, int(self.max_segment_seconds * 1000 / self.FRAME_MS))
+        found: List[Segment] = []
+        for start, end in merged:
+            if end - start < min_frames:
+                continue
+            # Split overlong speech at the quietest frame in the second half
+            # of each max-length window
+            while end - start > max_frames:
+                lo = start + max_frames // 2
+                cut = lo + int(np.argmin(db[lo:start + max_frames]))
+                found.append((start * frame, cut * frame))
+                start = cut
+            found.append((start * frame, min(end * frame, len(samples))))
+        return self._pad(found, len(samples))
+
+    def _pad(self, segments: List[Segment], total: int) -> List[Segment]:
+        """Widen segments by PAD_SECONDS without overlapping their neighbours."""
+        pad = int(self.PAD_SECONDS * self.SAMPLE_RATE)
+        padded: List[Segment] = []
+        for start, end in segments:
+            start = max(0, start - pad)
+            if padded:
+                start = max(start, padded[-1][1])
+            padded.append((start, min(total, end + pad)))
+        return [(start, end) for start, end in padded if end > start]
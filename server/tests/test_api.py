@@ -1,8 +1,64 @@
 """Integration tests for FastAPI endpoints (no authentication)."""
 
+import asyncio
+import io
+import threading
+import time
+import wave
+
+import httpx
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
+
+from src import main
+from src.document_cache import DocumentCache
 from src.main import app
+from src.process_pools import get_process_pool
+from src.project_storage import ProjectStorage
+from src.stt_engine import SttEngine, pcm16_to_float32
+from src.transcript_cache import TranscriptCache
+from src.tts_backend import TTSBackend, iter_text_chunks
+from src.vad import SpeechSegmenter
+from tests.test_stt_engine import LoudnessRecognizer, _bursts
+
+
+class FakeBackend(TTSBackend):
+    """Backend that records chunks and returns one byte of 'audio' per chunk
+    (and no samples from the non-streaming generate_speech)."""
+
+    def __init__(self):
+        self.chunks = []
+
+    @property
+    def available_voices(self):
+        return [{'name': 'af_heart', 'language': 'en-us', 'language_name': 'English (US)',
+                 'gender': 'female', 'display_name': 'Heart'}]
+
+    async def generate_speech_stream(self, text_chunks, voice=None, speed=None):
+        async for index, chunk in iter_text_chunks(text_chunks):
+            self.chunks.append(chunk)
+            yield b'x', {'text': chunk['text'], 'start': 0, 'end': 0, 'chunk_index': index,
+                         'starts_paragraph': chunk['starts_paragraph']}
+
+    def generate_speech(self, text, voice=None, speed=None):
+        return np.zeros(0, dtype=np.float32), 0.0
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """Replace the active TTS engine with a FakeBackend."""
+    backend = FakeBackend()
+    monkeypatch.setattr(main.engine_manager, '_active', backend)
+    return backend
+
+
+@pytest.fixture(autouse=True)
+def document_cache(tmp_path_factory, monkeypatch):
+    """Give each test an empty document cache."""
+    cache = DocumentCache(str(tmp_path_factory.mktemp("document_cache")), max_mb=16)
+    monkeypatch.setattr(main, 'document_cache', cache)
+    return cache
 
 
 class TestAPI:
@@ -43,9 +99,10 @@ class TestAPI:
         assert response.status_code == 200
         data = response.json()
         assert data["filename"] == "test.txt"
-        assert "text" in data
-        assert len(data["text"]) > 0
+        assert data["preview"] == "Hello world. This is a test."
+        assert data["char_count"] == len(data["preview"])
         assert "chunk_count" in data
+        assert "text" not in data
 
     def test_document_upload_unsupported_format(self):
         """Test uploading an unsupported file format."""
@@ -57,3 +114,456 @@ class TestAPI:
         """Test root endpoint serves SPA or returns API info."""
         response = self.client.get("/")
         assert response.status_code == 200
+
+
+def _make_pdf(pages):
+    """Build an in-memory PDF with one line of text per page."""
+    import fitz
+
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"This is page number {i + 1}.")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_document_stream_pdf_pages(fake_backend, tmp_path, monkeypatch):
+    """Test a PDF is streamed page by page and the upload is cleaned up."""
+    monkeypatch.setattr(main.settings, 'UPLOAD_DIR', str(tmp_path))
+    client = TestClient(app)
+    files = {"file": ("book.pdf", _make_pdf(3), "application/pdf")}
+    response = client.post("/api/documents/stream", files=files)
+
+    assert response.status_code == 200
+    assert response.content.count(b"TIMING:") == 3
+    assert [c['text'] for c in fake_backend.chunks] == [
+        "This is page number one.", "This is page number two.", "This is page number three.",
+    ]
+    assert all(c['starts_paragraph'] for c in fake_backend.chunks)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_document_stream_invalid_pdf(fake_backend, tmp_path, monkeypatch):
+    """Test an unreadable PDF fails before streaming starts."""
+    monkeypatch.setattr(main.settings, 'UPLOAD_DIR', str(tmp_path))
+    client = TestClient(app)
+    files = {"file": ("broken.pdf", b"not a pdf", "application/pdf")}
+    response = client.post("/api/documents/stream", files=files)
+
+    assert response.status_code == 400
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_document_upload_does_not_block_event_loop(tmp_path, monkeypatch):
+    """Test a large document is processed on the document pool without stalling the event loop."""
+    monkeypatch.setattr(main.settings, 'UPLOAD_DIR', str(tmp_path))
+    text = "\n\n".join(f"Paragraph {i} has 12 numbers, 3.5 decimals and https://example.com/{i} links." for i in range(6000))
+    threads = {}
+    extract = main.document_processor.extract
+    process = main.text_preprocessor.process
+
+    def recording_extract(*args):
+        threads["extract"] = threading.current_thread().name
+        return extract(*args)
+
+    def recording_process(*args):
+        threads["process"] = threading.current_thread().name
+        return process(*args)
+
+    monkeypatch.setattr(main.document_processor, 'extract', recording_extract)
+    monkeypatch.setattr(main.text_preprocessor, 'process', recording_process)
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def measure_lag():
+        nonlocal max_lag
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.01)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        ticker = asyncio.create_task(measure_lag())
+        await asyncio.sleep(0.02)  # Let the ticker start
+        response = await client.post("/api/documents/upload", files={"file": ("big.txt", text, "text/plain")})
+        done.set()
+        await ticker
+
+    assert response.status_code == 200
+    assert threads["extract"].startswith("document")
+    assert threads["process"].startswith("document")
+    assert max_lag < 0.15
+
+
+def test_tts_stream_preprocesses_off_event_loop(fake_backend, monkeypatch):
+    """Test /api/tts/stream chunks text on the document pool, not the event loop."""
+    threads = []
+    process = main.text_preprocessor.process
+
+    def recording_process(text, language=None):
+        threads.append(threading.current_thread().name)
+        return process(text, language)
+
+    monkeypatch.setattr(main.text_preprocessor, 'process', recording_process)
+    client = TestClient(app)
+    response = client.post("/api/tts/stream", json={"text": "Hello there. How are you?", "voice": "af_heart"})
+    assert response.status_code == 200
+    assert threads and threads[0].startswith("document")
+
+
+def test_document_upload_cache_hit_skips_extraction(document_cache, monkeypatch):
+    """Test re-uploading the same bytes is served from the document cache."""
+    client = TestClient(app)
+    files = {"file": ("notes.txt", "Cached document. Second sentence.", "text/plain")}
+    first = client.post("/api/documents/upload", files=files)
+    assert first.status_code == 200
+
+    def fail_extract(filepath):
+        raise AssertionError("extraction should be skipped on a cache hit")
+
+    monkeypatch.setattr(main.document_processor, 'extract', fail_extract)
+    files = {"file": ("renamed.txt", "Cached document. Second sentence.", "text/plain")}
+    second = client.post("/api/documents/upload", files=files)
+    assert second.status_code == 200
+    assert second.json()["preview"] == first.json()["preview"]
+    assert second.json()["chunk_count"] == first.json()["chunk_count"]
+    assert document_cache.stats()["hits"] == 1
+
+
+def test_document_stream_cache_hit(fake_backend, document_cache, tmp_path, monkeypatch):
+    """Test a streamed document is cached and replayed without extraction."""
+    monkeypatch.setattr(main.settings, 'UPLOAD_DIR', str(tmp_path))
+    client = TestClient(app)
+    pdf = _make_pdf(2)
+    files = {"file": ("book.pdf", pdf, "application/pdf")}
+    assert client.post("/api/documents/stream", files=files).status_code == 200
+    first_chunks = list(fake_backend.chunks)
+
+    def fail_extract_iter(filepath):
+        raise AssertionError("extraction should be skipped on a cache hit")
+
+    monkeypatch.setattr(main.document_processor, 'extract_iter', fail_extract_iter)
+    fake_backend.chunks.clear()
+    files = {"file": ("book.pdf", pdf, "application/pdf")}
+    assert client.post("/api/documents/stream", files=files).status_code == 200
+    assert fake_backend.chunks == first_chunks
+    assert document_cache.stats()["hits"] == 1
+
+
+def test_document_stream_by_id(fake_backend):
+    """Test an uploaded document is streamed by ID and chunk range."""
+    client = TestClient(app)
+    text = "\n\n".join(f"Paragraph number {n} is here." for n in ("one", "two", "three", "four"))
+    files = {"file": ("doc.txt", text, "text/plain")}
+    upload = client.post("/api/documents/upload", files=files).json()
+    assert upload["chunk_count"] == 4
+
+    response = client.post(
+        f"/api/documents/{upload['document_id']}/stream",
+        json={"voice": "af_heart", "start_chunk": 1, "end_chunk": 3},
+    )
+    assert response.status_code == 200
+    assert [c['text'] for c in fake_backend.chunks] == [
+        "Paragraph number two is here.", "Paragraph number three is here.",
+    ]
+    assert b'"chunk_index": 1' in response.content
+    assert b'"chunk_index": 2' in response.content
+
+    response = client.post(
+        f"/api/documents/{upload['document_id']}/stream",
+        json={"voice": "af_heart", "start_chunk": 4},
+    )
+    assert response.status_code == 400
+
+    assert client.delete(f"/api/documents/{upload['document_id']}").status_code == 200
+    response = client.post(f"/api/documents/{upload['document_id']}/stream", json={"voice": "af_heart"})
+    assert response.status_code == 404
+
+
+def test_document_text_by_id():
+    """Test the full text of an upload is only sent when asked for."""
+    client = TestClient(app)
+    text = "Long paragraph of the uploaded document. " * 20
+    upload = client.post("/api/documents/upload", files={"file": ("doc.txt", text, "text/plain")}).json()
+    assert len(upload["preview"]) == main.DOCUMENT_PREVIEW_CHARS
+
+    response = client.get(f"/api/documents/{upload['document_id']}/text")
+    assert response.status_code == 200
+    assert len(response.json()["text"]) == upload["char_count"]
+    assert response.json()["text"].startswith(upload["preview"])
+    assert response.json()["filename"] == "doc.txt"
+    assert client.get("/api/documents/missing/text").status_code == 404
+
+
+def test_small_upload_parsed_from_memory(tmp_path, monkeypatch):
+    """Test small uploads skip UPLOAD_DIR and large ones spill to disk."""
+    monkeypatch.setattr(main.settings, 'UPLOAD_DIR', str(tmp_path))
+    monkeypatch.setattr(main.settings, 'UPLOAD_SPOOL_MAX_KB', 64)
+    sources = []
+    extract = main.document_processor.extract
+
+    def recording_extract(filepath, data=None):
+        sources.append('memory' if data is not None else 'disk')
+        return extract(filepath, data)
+
+    monkeypatch.setattr(main.document_processor, 'extract', recording_extract)
+    client = TestClient(app)
+    small = {"file": ("small.txt", "A short document.", "text/plain")}
+    large = {"file": ("large.txt", "A longer document. " * 10000, "text/plain")}
+    assert client.post("/api/documents/upload", files=small).status_code == 200
+    assert client.post("/api/documents/upload", files=large).status_code == 200
+    assert sources == ['memory', 'disk']
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_document_index_and_stream_from_page(fake_backend, tmp_path, monkeypatch):
+    """Test a PDF bookmark position streams only the pages from there on."""
+    monkeypatch.setattr(main.settings, 'UPLOAD_DIR', str(tmp_path))
+    client = TestClient(app)
+    pdf = _make_pdf(4)
+
+    response = client.post("/api/documents/index", files={"file": ("book.pdf", pdf, "application/pdf")})
+    assert response.status_code == 200
+    assert response.json()["unit"] == "page"
+    assert response.json()["count"] == 4
+
+    response = client.post(
+        "/api/documents/stream?start=2",
+        files={"file": ("book.pdf", pdf, "application/pdf")},
+    )
+    assert response.status_code == 200
+    assert [c['text'] for c in fake_backend.chunks] == [
+        "This is page number three.", "This is page number four.",
+    ]
+    assert list(tmp_path.iterdir()) == []
+
+
+class AvailableSttEngine(SttEngine):
+    """SttEngine reported as installed, with a test recognizer."""
+
+    is_available = True
+
+    def __init__(self, recognizer):
+        super().__init__(segmenter=SpeechSegmenter(None, min_silence_seconds=0.5, max_segment_seconds=20))
+        self._recognizer = recognizer
+
+
+def test_stt_stream_pcm(monkeypatch):
+    """Test live PCM frames produce partial, final and done events."""
+    monkeypatch.setattr(main, 'stt_engine', AvailableSttEngine(LoudnessRecognizer()))
+    monkeypatch.setattr(main.settings, 'STT_PARTIAL_INTERVAL_SECONDS', 0.5)
+    pcm = (_bursts([(1, False), (2, True), (1, False)]) * 32767).astype('<i2').tobytes()
+
+    with TestClient(app).websocket_connect("/api/stt/stream") as ws:
+        for i in range(0, len(pcm), 3201):  # odd frame sizes split samples
+            ws.send_bytes(pcm[i:i + 3201])
+        ws.send_text('{"type": "end"}')
+        events = []
+        while not events or events[-1]["type"] != "done":
+            events.append(ws.receive_json())
+
+    assert any(e["type"] == "partial" for e in events)
+    assert [e["text"] for e in events if e["type"] == "final"] == ["speech 2"]
+    assert events[-1] == {"type": "done", "text": "speech 2", "duration_ms": 4000}
+
+
+def test_stt_stream_rejects_unknown_encoding():
+    """Test an unsupported encoding is reported before any audio is read."""
+    with TestClient(app).websocket_connect("/api/stt/stream?encoding=mp3") as ws:
+        assert ws.receive_json()["type"] == "error"
+
+
+def test_stt_stream_opus_without_ffmpeg(tmp_path, monkeypatch):
+    """Test a missing ffmpeg is reported to an opus client as an error event."""
+    monkeypatch.setattr(main, 'stt_engine', AvailableSttEngine(LoudnessRecognizer()))
+    monkeypatch.setenv("PATH", str(tmp_path))
+    with TestClient(app).websocket_connect("/api/stt/stream?encoding=opus") as ws:
+        event = ws.receive_json()
+    assert event["type"] == "error"
+    assert "ffmpeg" in event["detail"]
+
+
+class SlowLoadingSttEngine(AvailableSttEngine):
+    """Engine whose model load takes a moment and is counted."""
+
+    def __init__(self):
+        super().__init__(None)
+        self.loads = 0
+
+    def init(self, model_dir=None):
+        time.sleep(0.1)
+        self.loads += 1
+        self._recognizer = LoudnessRecognizer()
+
+
+@pytest.fixture
+def slow_stt_engine(monkeypatch):
+    """Fresh slow-loading engine with no load in progress."""
+    engine = SlowLoadingSttEngine()
+    monkeypatch.setattr(main, 'stt_engine', engine)
+    monkeypatch.setattr(main, '_stt_load', None)
+    monkeypatch.setattr(main, '_init_stt_engine', lambda: engine.init())
+    return engine
+
+
+async def test_stt_load_is_shared(slow_stt_engine):
+    """Test concurrent first requests wait on a single model load."""
+    assert main._stt_state() == ("not_loaded", None)
+    waiters = [asyncio.create_task(main._ensure_stt_engine()) for _ in range(5)]
+    await asyncio.sleep(0.02)
+    assert main._stt_state() == ("loading", None)
+    await asyncio.gather(*waiters)
+    assert slow_stt_engine.loads == 1
+    assert main._stt_state() == ("loaded", None)
+
+
+async def test_stt_load_failure_is_reported_and_retried(slow_stt_engine, monkeypatch):
+    """Test a failed load shows as failed and the next request tries again."""
+    def missing_model():
+        raise main.HTTPException(status_code=503, detail="STT model not found")
+
+    monkeypatch.setattr(main, '_init_stt_engine', missing_model)
+    with pytest.raises(main.HTTPException):
+        await main._ensure_stt_engine()
+    assert main._stt_state() == ("failed", "STT model not found")
+
+    monkeypatch.setattr(main, '_init_stt_engine', lambda: slow_stt_engine.init())
+    await main._ensure_stt_engine()
+    assert main._stt_state() == ("loaded", None)
+
+
+def test_process_pools_stopped_on_shutdown():
+    """Test the server stops the shared process pools when it exits."""
+    with TestClient(app):
+        pool = get_process_pool("test", 1)
+    with pytest.raises(RuntimeError):
+        pool.submit(abs, -3)
+
+
+def test_stt_preload_at_startup(slow_stt_engine, monkeypatch):
+    """Test STT_PRELOAD loads the model in the background at startup."""
+    monkeypatch.setattr(main.settings, 'STT_PRELOAD', True)
+    with TestClient(app) as client:
+        states = []
+        for _ in range(50):
+            states.append(client.get("/api/stt/models").json()["models"][0]["state"])
+            if states[-1] == "loaded":
+                break
+            time.sleep(0.02)
+    assert states[0] in ("loading", "loaded")
+    assert states[-1] == "loaded"
+    assert slow_stt_engine.loads == 1
+
+
+class WavSttEngine(AvailableSttEngine):
+    """Engine decoding WAV uploads with the wave module and counting work."""
+
+    def __init__(self):
+        super().__init__(LoudnessRecognizer())
+        self.decodes = 0
+
+    def decode_audio_file(self, file_path):
+        self.decodes += 1
+        with wave.open(file_path, "rb") as wav:
+            return pcm16_to_float32(wav.readframes(wav.getnframes()))
+
+
+def _wav_bytes(samples, comment=b""):
+    """16 kHz mono WAV; a trailing chunk makes byte-different copies of the same audio."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes((samples * 32767).astype("<i2").tobytes())
+    data = buffer.getvalue()
+    if comment:
+        chunk = b"LIST" + len(comment).to_bytes(4, "little") + comment
+        data = data[:4] + (len(data) - 8 + len(chunk)).to_bytes(4, "little") + data[8:] + chunk
+    return data
+
+
+def test_stt_transcribe_cache(tmp_path, monkeypatch):
+    """Test repeat uploads hit by bytes and re-encoded copies by decoded audio."""
+    engine = WavSttEngine()
+    monkeypatch.setattr(main, 'stt_engine', engine)
+    monkeypatch.setattr(main, 'transcript_cache', TranscriptCache(str(tmp_path / "cache"), max_mb=1))
+    monkeypatch.setattr(main.settings, 'UPLOAD_DIR', str(tmp_path))
+    client = TestClient(app)
+    samples = _bursts([(0.5, False), (2, True), (0.5, False)])
+
+    def transcribe(data):
+        response = client.post("/api/stt/transcribe", files={"audio": ("note.wav", data, "audio/wav")})
+        assert response.status_code == 200
+        return response.json()
+
+    first = transcribe(_wav_bytes(samples))
+    assert first["text"] == "speech 3" and not first["cached"]
+    assert engine.decodes == 1
+
+    again = transcribe(_wav_bytes(samples))
+    assert again["cached"] and again["text"] == "speech 3"
+    assert engine.decodes == 1
+
+    copy = transcribe(_wav_bytes(samples, comment=b"INFOre-encoded"))
+    assert copy["cached"] and engine.decodes == 2
+    assert engine._recognizer.batches == [1]
+
+    stats = client.get("/api/stt/models").json()["transcript_cache"]
+    assert (stats["upload_hits"], stats["pcm_hits"], stats["misses"]) == (1, 1, 1)
+    assert [p.name for p in tmp_path.iterdir()] == ["cache"]
+
+
+def test_stt_transcribe_missing_model_skips_decode(tmp_path, monkeypatch):
+    """Test a missing model is reported before the upload is decoded."""
+    engine = WavSttEngine()
+    monkeypatch.setattr(main, 'stt_engine', engine)
+    monkeypatch.setattr(main, 'transcript_cache', TranscriptCache(str(tmp_path / "cache"), max_mb=1))
+    monkeypatch.setattr(main.settings, 'UPLOAD_DIR', str(tmp_path))
+    monkeypatch.setattr(main, '_stt_load', None)
+    client = TestClient(app)
+    data = _wav_bytes(_bursts([(0.5, False), (2, True), (0.5, False)]))
+    assert client.post("/api/stt/transcribe", files={"audio": ("note.wav", data, "audio/wav")}).status_code == 200
+
+    def missing_model():
+        raise main.HTTPException(status_code=503, detail="STT model not found")
+
+    engine._recognizer = None
+    engine.decodes = 0
+    monkeypatch.setattr(main, '_init_stt_engine', missing_model)
+    other = _wav_bytes(_bursts([(1, True), (1, False)]))
+    response = client.post("/api/stt/transcribe", files={"audio": ("other.wav", other, "audio/wav")})
+    assert response.status_code == 503
+    assert engine.decodes == 0
+
+    # The same bytes as an earlier upload are still served without a model
+    response = client.post("/api/stt/transcribe", files={"audio": ("note.wav", data, "audio/wav")})
+    assert response.status_code == 200 and response.json()["cached"]
+
+
+def test_project_list_pages(tmp_path, monkeypatch):
+    """Test the project list is paged, filtered and projected."""
+    storage = ProjectStorage(str(tmp_path))
+    monkeypatch.setattr(main, 'project_storage', storage)
+    ids = [storage.create(f"Note {i}", "stt" if i % 2 else "tts", "text") for i in range(5)]
+    client = TestClient(app)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "fields": "id,title"}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/projects", params=params).json()
+        assert all(set(p) == {"id", "title"} for p in page["projects"])
+        seen += [p["id"] for p in page["projects"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(ids) and len(seen) == 5
+
+    page = client.get("/api/projects", params={"type": "stt", "title_prefix": "note"}).json()
+    assert {p["id"] for p in page["projects"]} == {ids[1], ids[3]}
+    assert client.get("/api/projects", params={"limit": 0}).status_code == 400
+    assert client.get("/api/projects", params={"cursor": "bogus"}).status_code == 400
@@ -0,0 +1,95 @@
+"""Tests for the content-hash keyed document cache."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from src.document_cache import DocumentCache
+from src.document_processor import DocumentProcessor
+
+
+class TestDocumentCache:
+    """Test cache storage, recency and eviction."""
+
+    def test_miss_then_hit(self, tmp_path):
+        """Test stored text and chunks are returned for the same key."""
+        cache = DocumentCache(str(tmp_path), max_mb=1)
+        key = DocumentCache.make_key("ab" * 32, ".PDF", "x2")
+        variant = DocumentCache.variant("en-us", 150)
+        assert key.endswith("_pdf_x2")
+        assert cache.get(key) is None
+
+        cache.put(key, "Hello world.", variant, [{"text": "Hello world."}])
+        entry = cache.get(key)
+        assert entry["text"] == "Hello world."
+        assert cache.get_chunks(entry, variant) == [{"text": "Hello world."}]
+        assert cache.get_chunks(entry, DocumentCache.variant(None, 150)) is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_put_keeps_other_variants(self, tmp_path):
+        """Test adding a chunk variant keeps the ones already cached."""
+        cache = DocumentCache(str(tmp_path), max_mb=1)
+        cache.put("k", "text", "en-us:150", [{"text": "a"}])
+        cache.put("k", "text", "ja:150", [{"text": "b"}])
+        entry = cache.get("k")
+        assert set(entry["chunks"]) == {"en-us:150", "ja:150"}
+
+    def test_concurrent_puts_keep_all_variants(self, tmp_path):
+        """Test chunk variants stored at the same time are all kept."""
+        cache = DocumentCache(str(tmp_path), max_mb=1)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda n: cache.put("k", "text", f"v{n}:150", [{"text": str(n)}]), range(32)))
+        assert len(cache.get("k")["chunks"]) == 32
+
+    def test_key_follows_extraction_settings(self):
+        """Test extractions with other settings or versions never share a key."""
+        stripped = DocumentProcessor(strip_running_lines=True).cache_fingerprint
+        raw = DocumentProcessor(strip_running_lines=False).cache_fingerprint
+        assert stripped != raw
+        assert DocumentCache.make_key("ab", ".pdf", stripped) != DocumentCache.make_key("ab", ".pdf", raw)
+        assert str(DocumentProcessor.EXTRACTION_VERSION) in stripped
+
+    def test_lru_eviction(self, tmp_path):
+        """Test least recently used entries are evicted past the size limit."""
+        cache = DocumentCache(str(tmp_path), max_mb=1)
+        text = "x" * 400 * 1024
+        cache.put("a", text)
+        cache.put("b", text)
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", text)
+
+        assert cache.get("b") is None
+        assert cache.get("a")["text"] == text
+        assert cache.get("c")["text"] == text
+        assert not (tmp_path / "b.json").exists()
+        assert cache.stats()["bytes"] <= cache.max_bytes
+
+    def test_index_survives_restart(self, tmp_path):
+        """Test existing entries are indexed when the cache is reopened."""
+        DocumentCache(str(tmp_path), max_mb=1).put("k", "persisted")
+        cache = DocumentCache(str(tmp_path), max_mb=1)
+        assert cache.stats()["entries"] == 1
+        assert cache.get("k")["text"] == "persisted"
+
+    def test_corrupt_entry_is_dropped(self, tmp_path):
+        """Test an unreadable entry counts as a miss and is removed."""
+        cache = DocumentCache(str(tmp_path), max_mb=1)
+        cache.put("k", "text")
+        (tmp_path / "k.json").write_text("{not json")
+        assert cache.get("k") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_disabled(self, tmp_path):
+        """Test a zero size limit disables the cache."""
+        cache = DocumentCache(str(tmp_path / "off"), max_mb=0)
+        cache.put("k", "text")
+        assert cache.get("k") is None
+        assert not (tmp_path / "off").exists()
+
+    def test_entry_format(self, tmp_path):
+        """Test entries are plain JSON files named by key."""
+        cache = DocumentCache(str(tmp_path), max_mb=1)
+        cache.put("k", "text", "default:150", [])
+        assert json.loads((tmp_path / "k.json").read_text()) == {
+            "text": "text", "chunks": {"default:150": []},
+        }
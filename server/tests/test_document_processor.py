@@ -39,6 +39,244 @@ class TestDocumentProcessor:
         finally:
             Path(temp_path).unlink()
 
+    def test_extract_iter_pdf_pages(self, tmp_path):
+        """Test PDFs are extracted page by page, matching extract()."""
+        import fitz
+
+        doc = fitz.open()
+        for i in range(3):
+            doc.new_page().insert_text((72, 72), f"Page   {i + 1} text.")
+        pdf_path = tmp_path / "doc.pdf"
+        doc.save(pdf_path)
+        doc.close()
+
+        pages = list(self.processor.extract_iter(str(pdf_path)))
+        assert pages == ["Page 1 text.", "Page 2 text.", "Page 3 text."]
+        assert self.processor.extract(str(pdf_path)) == "\n\n".join(pages)
+
+    def test_extract_pdf_parallel_matches_serial(self, tmp_path):
+        """Test parallel page-range extraction reassembles pages in order."""
+        import fitz
+
+        doc = fitz.open()
+        for i in range(20):
+            if i != 5:  # Leave one page blank
+                doc.new_page().insert_text((72, 72), f"Page {i + 1} text.")
+            else:
+                doc.new_page()
+        pdf_path = tmp_path / "doc.pdf"
+        doc.save(pdf_path)
+        doc.close()
+
+        serial = DocumentProcessor(pdf_workers=1).extract_pdf(str(pdf_path))
+        parallel = DocumentProcessor(pdf_workers=2, pdf_parallel_min_pages=10)
+        assert parallel.extract_pdf(str(pdf_path)) == serial
+        assert serial.startswith("Page 1 text.\n\nPage 2 text.")
+
+    def test_extract_from_bytes_matches_file(self, tmp_path):
+        """Test in-memory content is parsed exactly like the same file on disk."""
+        import fitz
+        from docx import Document
+
+        doc = fitz.open()
+        for i in range(2):
+            doc.new_page().insert_text((72, 72), f"Page {i + 1} text.")
+        doc.save(tmp_path / "doc.pdf")
+        doc.close()
+
+        docx = Document()
+        docx.add_paragraph("First paragraph.")
+        docx.add_paragraph("")
+        docx.add_paragraph("Second paragraph.")
+        docx.save(tmp_path / "doc.docx")
+
+        (tmp_path / "doc.txt").write_bytes("Line one.\r\nLine two \xff.\n".encode("utf-8") + b"\xff")
+        (tmp_path / "doc.md").write_bytes(b"# Title\r\n\r\nSome **bold** text.\r\n")
+
+        for name in ("doc.pdf", "doc.docx", "doc.txt", "doc.md"):
+            path = tmp_path / name
+            from_file = self.processor.extract(str(path))
+            assert from_file
+            assert self.processor.extract(name, path.read_bytes()) == from_file
+            assert list(self.processor.extract_iter(name, path.read_bytes())) == list(
+                self.processor.extract_iter(str(path))
+            )
+
+    def test_docx_streaming_matches_python_docx(self, tmp_path):
+        """Test the streaming DOCX extractor reads paragraphs like python-docx."""
+        from docx import Document
+        from docx.enum.text import WD_BREAK
+        from docx.oxml import parse_xml
+
+        doc = Document()
+        doc.add_paragraph("  Plain paragraph.  ")
+        para = doc.add_paragraph("Tab")
+        para.add_run().add_tab()
+        para.add_run("and line")
+        para.add_run().add_break()
+        para.add_run("break, page")
+        para.add_run().add_break(WD_BREAK.PAGE)
+        para.add_run("break.")
+        doc.add_paragraph("")
+        doc.add_table(rows=1, cols=1).cell(0, 0).text = "Table text is skipped."
+        link = doc.add_paragraph("See ")
+        link._p.append(parse_xml(
+            '<w:hyperlink xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            '<w:r><w:t>the link</w:t></w:r></w:hyperlink>'
+        ))
+        link.add_run(" text.")
+        path = tmp_path / "doc.docx"
+        doc.save(path)
+
+        expected = [p.text.strip() for p in Document(path).paragraphs if p.text.strip()]
+        assert list(self.processor.iter_docx_paragraphs(str(path))) == expected
+        assert self.processor.extract_docx(str(path)) == "\n\n".join(expected)
+        assert "\n\n".join(self.processor.extract_iter(str(path))) == "\n\n".join(expected)
+
+    def test_invalid_docx(self, tmp_path):
+        """Test a file that is not a DOCX zip raises ValueError."""
+        path = tmp_path / "broken.docx"
+        path.write_bytes(b"not a zip file")
+        with pytest.raises(ValueError):
+            self.processor.extract(str(path))
+
+    def test_pdf_index_and_page_range(self, tmp_path):
+        """Test PDFs are indexed by page with their outline and extracted by range."""
+        import fitz
+
+        doc = fitz.open()
+        for i in range(6):
+            doc.new_page().insert_text((72, 72), f"Page {i + 1} text.")
+        doc.set_toc([[1, "Chapter 1", 1], [1, "Chapter 2", 4], [2, "Section 2.1", 5]])
+        pdf_path = tmp_path / "book.pdf"
+        doc.save(pdf_path)
+        doc.close()
+
+        index = self.processor.build_index(str(pdf_path))
+        assert index["unit"] == "page"
+        assert index["count"] == 6
+        assert index["toc"] == [
+            {"level": 1, "title": "Chapter 1", "position": 0},
+            {"level": 1, "title": "Chapter 2", "position": 3},
+            {"level": 2, "title": "Section 2.1", "position": 4},
+        ]
+        chapter_2 = index["toc"][1]["position"]
+        assert list(self.processor.extract_range(str(pdf_path), start=chapter_2)) == [
+            "Page 4 text.", "Page 5 text.", "Page 6 text.",
+        ]
+        assert list(self.processor.extract_range(str(pdf_path), start=1, end=3)) == ["Page 2 text.", "Page 3 text."]
+        parallel = DocumentProcessor(pdf_workers=2, pdf_parallel_min_pages=2)
+        assert list(parallel.extract_range(str(pdf_path), start=2, end=5)) == [
+            "Page 3 text.", "Page 4 text.", "Page 5 text.",
+        ]
+
+    def test_paragraph_index_offsets(self, tmp_path):
+        """Test paragraph offsets point into the extracted text."""
+        path = tmp_path / "notes.txt"
+        path.write_text("\n  First paragraph.\n\n\nSecond one\nwraps.\n \nThird.\n")
+        text = self.processor.extract(str(path))
+        index = self.processor.build_index(str(path))
+
+        assert index["unit"] == "paragraph"
+        assert index["count"] == 3
+        assert [text[o:o + 6] for o in index["offsets"]] == ["First ", "Second", "Third."]
+        assert index["total_chars"] == len(text.rstrip())
+
+        offset = text.index("wraps")
+        position = DocumentProcessor.position_for_offset(index, offset)
+        assert position == 1
+        assert list(self.processor.extract_range(str(path), start=position)) == [
+            "Second one\nwraps.\n\nThird.",
+        ]
+
+    def test_paragraph_offsets_read_in_blocks(self, tmp_path, monkeypatch):
+        """Test offsets match the extracted text across blocks and ranges stop early."""
+        monkeypatch.setattr(DocumentProcessor, 'TEXT_BLOCK_BYTES', 40)
+        paragraphs = [f"  Paragraph {n} has\na few words." for n in range(12)]
+        for suffix, raw in (("txt", "\r\n \r\n\r\n".join(paragraphs)), ("md", "\n\n".join(paragraphs))):
+            path = tmp_path / f"long.{suffix}"
+            path.write_bytes(raw.encode("utf-8"))
+            text = self.processor.extract(str(path))
+            index = self.processor.build_index(str(path))
+            assert index["count"] == 12
+            assert all(text.startswith(f"Paragraph {n} has", o) for n, o in enumerate(index["offsets"]))
+            offset = text.index("Paragraph 7")
+            assert self.processor.locate_offset(str(path), offset=offset + 3) == 7
+
+        def fail(*args, **kwargs):
+            raise AssertionError("whole document extracted")
+
+        monkeypatch.setattr(self.processor, 'extract', fail)
+        monkeypatch.setattr(self.processor, 'extract_txt', fail)
+        blocks = []
+        original = self.processor._iter_text_buffer
+        monkeypatch.setattr(self.processor, '_iter_text_buffer',
+                            lambda buf, markdown: (blocks.append(b) or b for b in original(buf, markdown)))
+        assert list(self.processor.extract_range(str(tmp_path / "long.txt"), start=1, end=2)) == [
+            "Paragraph 1 has\na few words."]
+        assert len(blocks) < 4
+
+    def test_pdf_running_lines_removed(self, tmp_path):
+        """Test running headers/footers are dropped from extract and extract_iter alike."""
+        import fitz
+
+        words = "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima".split()
+        doc = fitz.open()
+        for i in range(8):
+            page = doc.new_page()
+            page.insert_text((72, 40), "Quarterly Review")
+            for line in range(8):
+                page.insert_text((72, 100 + line * 20), f"Body text {words[(i + line) % 12]} {words[i]}.")
+            page.insert_text((72, page.rect.height - 36), f"Page {i + 1}")
+        pdf_path = str(tmp_path / "report.pdf")
+        doc.save(pdf_path)
+        doc.close()
+
+        text = DocumentProcessor(strip_running_lines=True).extract(pdf_path)
+        raw = DocumentProcessor(strip_running_lines=False).extract(pdf_path)
+        assert raw.count("Quarterly Review") == 8
+        assert "Quarterly Review" not in text
+        assert "Page 3" not in text
+        assert "Body text delta delta." in text
+        assert "\n\n".join(DocumentProcessor(strip_running_lines=True).extract_iter(pdf_path)) == text
+
+    def test_text_blocks_from_mmap(self, tmp_path, monkeypatch):
+        """Test text files are yielded in paragraph-aligned blocks from a memory map."""
+        monkeypatch.setattr(DocumentProcessor, 'TEXT_BLOCK_BYTES', 40)
+        paragraphs = [f"Paragraph {n} has a few words in it." for n in range(10)]
+        path = tmp_path / "long.txt"
+        path.write_bytes("\r\n\r\n".join(paragraphs).encode("utf-8"))
+
+        blocks = list(self.processor.iter_text_blocks(str(path)))
+        assert len(blocks) > 1
+        assert "\n\n".join(blocks) == "\n\n".join(paragraphs)
+        assert blocks == list(self.processor.iter_text_blocks(str(path), path.read_bytes()))
+
+        empty = tmp_path / "empty.txt"
+        empty.write_bytes(b"")
+        assert list(self.processor.iter_text_blocks(str(empty))) == []
+
+    def test_markdown_blocks_keep_code_fences_whole(self, tmp_path, monkeypatch):
+        """Test markdown blocks never split a fenced code block and strip like the whole file."""
+        markdown = (
+            "# Title\n\nIntro with *emphasis* and `code`.\n\n"
+            "```python\nfirst = 1\n\nsecond = 2\n```\n\n"
+            "- Item one\n- Item two\n\nA paragraph with an odd_underscore.\n\n"
+            "Closing __bold__ words.\n"
+        )
+        path = tmp_path / "doc.md"
+        path.write_text(markdown)
+        whole = self.processor.extract_markdown(str(path))
+
+        monkeypatch.setattr(DocumentProcessor, 'TEXT_BLOCK_BYTES', 1)
+        blocks = list(self.processor.iter_text_blocks(str(path), markdown=True))
+        assert "\n\n".join(blocks) == whole
+        assert not any("second" in block for block in blocks)
+        assert whole == (
+            "Title\n\nIntro with emphasis and code.\n\nItem one\nItem two\n\n"
+            "A paragraph with an odd_underscore.\n\nClosing bold words."
+        )
+
     def test_markdown_to_plain(self):
         """Test markdown to plain text conversion."""
         markdown = "# Heading\n\n**Bold text** and *italic*.\n\n- List item\n"
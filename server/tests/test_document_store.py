@@ -0,0 +1,63 @@
+"""Tests for server-side document handles."""
+
+from src.document_store import DocumentStore
+
+
+class TestDocumentStore:
+    """Test handle storage, expiry and limits."""
+
+    def test_add_and_get(self):
+        """Test a stored document is returned by its ID."""
+        store = DocumentStore(ttl_seconds=60, max_documents=4)
+        document = store.add("a.txt", "Hello.", "default:150", [{"text": "Hello."}])
+        assert store.get(document["id"])["text"] == "Hello."
+        assert store.get("missing") is None
+
+    def test_expiry(self):
+        """Test handles are gone once their TTL has passed."""
+        store = DocumentStore(ttl_seconds=0, max_documents=4)
+        document = store.add("a.txt", "Hello.", "default:150", [])
+        assert store.get(document["id"]) is None
+
+    def test_max_documents(self):
+        """Test the least recently used handle is dropped when full."""
+        store = DocumentStore(ttl_seconds=60, max_documents=2)
+        first = store.add("1.txt", "one", "default:150", [])
+        second = store.add("2.txt", "two", "default:150", [])
+        store.get(first["id"])
+        store.add("3.txt", "three", "default:150", [])
+        assert store.get(second["id"]) is None
+        assert store.get(first["id"]) is not None
+
+    def test_max_bytes(self):
+        """Test least recently used handles are dropped past the size limit."""
+        store = DocumentStore(ttl_seconds=60, max_documents=10, max_mb=0.1)
+        text = "x" * 40_000
+        first = store.add("1.txt", text, "default:150", [])
+        second = store.add("2.txt", text, "default:150", [])
+        assert store.stats()["documents"] == 2
+        store.add("3.txt", text, "default:150", [])
+        assert store.get(first["id"]) is None
+        assert store.get(second["id"]) is not None
+        assert store.stats()["bytes"] <= store.max_bytes
+
+        # Extra chunk variants count too; the handle just used is kept
+        chunks = [{"text": text}]
+        store.set_chunks(second["id"], "es:150", chunks)
+        assert store.get(second["id"]) is not None
+        assert store.stats()["documents"] == 1
+
+        # A single handle larger than the limit is still kept
+        big = store.add("big.txt", "y" * 200_000, "default:150", [])
+        assert store.get(big["id"]) is not None
+        assert store.stats()["documents"] == 1
+
+    def test_set_chunks_and_delete(self):
+        """Test extra chunk variants are kept and handles can be released."""
+        store = DocumentStore(ttl_seconds=60, max_documents=4)
+        document = store.add("a.txt", "Hola.", "default:150", [])
+        store.set_chunks(document["id"], "es:150", [{"text": "Hola."}])
+        assert set(store.get(document["id"])["chunks"]) == {"default:150", "es:150"}
+        assert store.delete(document["id"])
+        assert not store.delete(document["id"])
+        assert store.stats()["bytes"] == 0
@@ -0,0 +1,47 @@
+"""Tests for cached number-to-words conversion."""
+
+from num2words import num2words
+
+from src import number_words
+from src.number_words import decimal_to_words, integer_to_words, num2words_lang
+from src.text_preprocessor import TextPreprocessor
+
+
+class TestNumberWords:
+    """Test number-to-words tables and caches."""
+
+    def test_integer_table_matches_num2words(self):
+        """Test table lookups return the same words as num2words."""
+        for n in (0, 7, 42, 999, 2024, 9999):
+            assert integer_to_words(n) == num2words(n)
+        assert integer_to_words(123456) == num2words(123456)
+
+    def test_integer_table_is_shared(self):
+        """Test conversions are stored in the shared per-language table."""
+        integer_to_words(4321)
+        assert number_words._tables['en'][4321] == num2words(4321)
+
+    def test_decimal_to_words(self):
+        """Test decimals are read digit by digit after the point."""
+        assert decimal_to_words('3.14') == "three point one four"
+        assert decimal_to_words('0.05') == "zero point zero five"
+        decimal_to_words.cache_clear()
+        decimal_to_words('2.5')
+        decimal_to_words('2.5')
+        assert decimal_to_words.cache_info().hits == 1
+
+    def test_locale_variants(self):
+        """Test voice language codes map to num2words locales."""
+        assert num2words_lang(None) == 'en'
+        assert num2words_lang('en-gb') == 'en'
+        assert num2words_lang('pt-br') == 'pt_BR'
+        assert num2words_lang('es') == 'es'
+        assert num2words_lang('zh') == 'en'  # Unsupported by num2words
+        assert integer_to_words(42, 'es') == "cuarenta y dos"
+        assert decimal_to_words('1.5', 'es') == "uno punto cinco"
+
+    def test_preprocessor_uses_voice_language(self):
+        """Test normalize converts numbers in the voice's language."""
+        preprocessor = TextPreprocessor()
+        assert "forty-two" in preprocessor.normalize("I have 42 apples")
+        assert "cuarenta y dos" in preprocessor.normalize("Tengo 42 manzanas", language='es')
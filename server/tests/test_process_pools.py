@@ -0,0 +1,29 @@
+"""Tests for the shared process pools."""
+
+import pytest
+
+from src.process_pools import get_process_pool, shutdown_process_pools
+
+
+class TestProcessPools:
+    """Test pool reuse and shutdown."""
+
+    def test_pools_shared_per_name_and_size(self):
+        """Test one pool is reused per kind of work and worker count."""
+        try:
+            pool = get_process_pool("test", 1)
+            assert get_process_pool("test", 1) is pool
+            assert get_process_pool("other", 1) is not pool
+            assert get_process_pool("test", 2) is not pool
+        finally:
+            shutdown_process_pools()
+
+    def test_shutdown_stops_pools(self):
+        """Test shutdown stops the pools and a later get creates a new one."""
+        pool = get_process_pool("test", 1)
+        assert pool.submit(abs, -3).result(timeout=60) == 3
+        shutdown_process_pools()
+        with pytest.raises(RuntimeError):
+            pool.submit(abs, -3)
+        assert get_process_pool("test", 1) is not pool
+        shutdown_process_pools()
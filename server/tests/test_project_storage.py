@@ -0,0 +1,297 @@
+"""Tests for JSON project storage and its metadata index."""
+
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.project_storage import INDEX_FILE, ProjectStorage
+
+
+def _age(storage_dir, project_id, days):
+    """Backdate a project's modified time on disk."""
+    meta_file = storage_dir / project_id / "project.json"
+    meta = json.loads(meta_file.read_text())
+    meta["modified"] = int(time.time() * 1000) - days * 24 * 60 * 60 * 1000
+    meta_file.write_text(json.dumps(meta))
+
+
+class TestProjectStorage:
+    """Test CRUD, listing and cleanup through the index."""
+
+    def test_crud_and_listing_order(self, tmp_path):
+        """Test projects list newest first and reflect updates and deletes."""
+        storage = ProjectStorage(str(tmp_path))
+        first = storage.create("First", "tts", "one")
+        second = storage.create("Second", "stt", "two")
+        time.sleep(0.002)
+        assert storage.update(first, content="one!", title="First edited")
+
+        projects = storage.list_projects()
+        assert [p["id"] for p in projects] == [first, second]
+        assert projects[0]["title"] == "First edited"
+        assert "content" not in projects[0]
+        assert storage.get(first)["content"] == "one!"
+
+        assert storage.delete(second)
+        assert [p["id"] for p in storage.list_projects()] == [first]
+        assert not storage.update(second, content="gone")
+
+    def test_index_file_is_not_a_project(self, tmp_path):
+        """Test the index lives beside the folders without being exported."""
+        storage = ProjectStorage(str(tmp_path))
+        storage.create("Only", "tts", "text")
+        assert (tmp_path / INDEX_FILE).exists()
+        assert storage.export_all()["count"] == 1
+
+    def test_startup_sync_with_folders(self, tmp_path):
+        """Test folders added, edited or removed while stopped are reindexed."""
+        storage = ProjectStorage(str(tmp_path))
+        kept = storage.create("Kept", "tts", "a")
+        removed = storage.create("Removed", "tts", "b")
+        storage.close()
+
+        # Edits made elsewhere (e.g. synced from Android)
+        shutil.rmtree(tmp_path / removed)
+        meta_file = tmp_path / kept / "project.json"
+        meta = json.loads(meta_file.read_text())
+        meta["title"] = "Renamed"
+        meta_file.write_text(json.dumps(meta))
+        os.utime(meta_file, ns=(1, 1))  # Differs from the indexed mtime even on coarse clocks
+        added = tmp_path / "proj_external"
+        added.mkdir()
+        (added / "project.json").write_text(json.dumps(
+            {"id": "proj_external", "title": "External", "type": "tts", "created": 1, "modified": 2}))
+
+        projects = {p["id"]: p for p in ProjectStorage(str(tmp_path)).list_projects()}
+        assert set(projects) == {kept, "proj_external"}
+        assert projects[kept]["title"] == "Renamed"
+
+    def test_corrupt_index_is_rebuilt(self, tmp_path):
+        """Test an unreadable index file is replaced from the folders."""
+        ProjectStorage(str(tmp_path)).create("Doc", "tts", "text")
+        for path in tmp_path.glob(INDEX_FILE + "*"):
+            path.unlink()
+        (tmp_path / INDEX_FILE).write_bytes(b"not a database" * 100)
+        assert [p["title"] for p in ProjectStorage(str(tmp_path)).list_projects()] == ["Doc"]
+
+    def test_cleanup(self, tmp_path):
+        """Test old projects and folders without metadata are removed."""
+        storage = ProjectStorage(str(tmp_path))
+        old = storage.create("Old", "tts", "a")
+        new = storage.create("New", "tts", "b")
+        _age(tmp_path, old, days=10)
+        (tmp_path / "proj_broken").mkdir()
+
+        assert storage.cleanup(max_age_days=5) == 2
+        assert [p["id"] for p in storage.list_projects()] == [new]
+        assert not (tmp_path / old).exists()
+        assert not (tmp_path / "proj_broken").exists()
+        assert storage.cleanup(max_age_days=0) == 0
+
+
+class TestProjectListing:
+    """Test paged, filtered and projected listing."""
+
+    def _store(self, tmp_path, count, **kwargs):
+        storage = ProjectStorage(str(tmp_path), **kwargs)
+        ids = [storage.create(f"{'Memo' if i % 3 == 0 else 'Draft'} {i}", "stt" if i % 2 else "tts", "x")
+               for i in range(count)]
+        return storage, ids
+
+    def _all_pages(self, storage, **kwargs):
+        pages, cursor = [], None
+        while True:
+            page = storage.list_page(cursor=cursor, **kwargs)
+            pages.append(page["projects"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return pages
+
+    def test_pages_cover_listing_once(self, tmp_path):
+        """Test pages follow the full order without gaps or repeats, ties included."""
+        storage, ids = self._store(tmp_path, 11)  # Many share a millisecond
+        pages = self._all_pages(storage, limit=3)
+        assert [len(p) for p in pages] == [3, 3, 3, 2]
+        assert [p["id"] for page in pages for p in page] == [p["id"] for p in storage.list_projects()]
+
+    def test_filters_and_projection(self, tmp_path):
+        """Test type and title prefix filters and field projection."""
+        storage, ids = self._store(tmp_path, 9)
+        memos = storage.list_projects(title_prefix="memo", fields=["id", "title"])
+        assert {p["id"] for p in memos} == {ids[0], ids[3], ids[6]}
+        assert all(set(p) == {"id", "title"} for p in memos)
+        stt = self._all_pages(storage, limit=2, project_type="stt", fields=["id"])
+        assert sorted(p["id"] for page in stt for p in page) == sorted(ids[1::2])
+        assert storage.list_projects(title_prefix="Draft_") == []  # LIKE wildcards are literal
+        assert storage.list_projects(fields=["id", "missing"])[0].keys() == {"id"}
+
+    def test_pending_updates_are_paged(self, tmp_path):
+        """Test unwritten autosaves appear in pages with their new order and title."""
+        storage, ids = self._store(tmp_path, 6, write_delay=60)
+        time.sleep(0.002)
+        storage.update(ids[0], title="Memo renamed")
+        first = storage.list_page(limit=2, fields=["id", "title"])
+        assert first["projects"][0] == {"id": ids[0], "title": "Memo renamed"}
+        rest = self._all_pages(storage, limit=2)
+        assert [p["id"] for page in rest for p in page].count(ids[0]) == 1
+        assert len(storage.list_projects(title_prefix="memo r")) == 1
+        storage.close()
+
+    def test_invalid_arguments(self, tmp_path):
+        """Test bad limits and cursors are rejected."""
+        storage, _ = self._store(tmp_path, 1)
+        for kwargs in ({"limit": 0}, {"cursor": "nope"}, {"cursor": "x:proj"}):
+            with pytest.raises(ValueError):
+                storage.list_page(**kwargs)
+
+
+class TestProjectStorageLocking:
+    """Test per-project locking and lock-free reads."""
+
+    def test_update_not_blocked_by_other_project(self, tmp_path):
+        """Test a write held on one project does not hold up another."""
+        storage = ProjectStorage(str(tmp_path))
+        busy = storage.create("Busy", "tts", "a")
+        idle = storage.create("Idle", "tts", "b")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            with storage._project_lock(busy):
+                blocked = pool.submit(storage.update, busy, content="a!")
+                assert pool.submit(storage.update, idle, content="b!").result(timeout=5)
+                assert not blocked.done()
+            assert blocked.result(timeout=5)
+        assert storage.get(busy)["content"] == "a!"
+
+    def test_reads_during_cleanup(self, tmp_path):
+        """Test get() needs no lock while cleanup holds the exclusive side."""
+        storage = ProjectStorage(str(tmp_path))
+        project_id = storage.create("Doc", "tts", "text")
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            with storage._rw_lock.write():
+                listing = pool.submit(storage.list_projects)
+                assert pool.submit(storage.get, project_id).result(timeout=5)["content"] == "text"
+                assert not listing.done()
+            assert len(listing.result(timeout=5)) == 1
+
+    def test_update_during_delete(self, tmp_path, monkeypatch):
+        """Test an update racing a delete cannot bring the project back."""
+        storage = ProjectStorage(str(tmp_path), write_delay=60)
+        project_id = storage.create("Doc", "tts", "text")
+        storage.update(project_id, content="pending")
+        removing = threading.Event()
+        rmtree = shutil.rmtree
+
+        def slow_rmtree(path, *args, **kwargs):
+            removing.set()
+            time.sleep(0.1)
+            rmtree(path, *args, **kwargs)
+
+        monkeypatch.setattr(shutil, "rmtree", slow_rmtree)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            deleted = pool.submit(storage.delete, project_id)
+            assert removing.wait(5)
+            updated = pool.submit(storage.update, project_id, content="late")
+            assert deleted.result(timeout=5)
+            assert not updated.result(timeout=5)
+        assert storage.flush() == 0
+        assert not (tmp_path / project_id).exists()
+        assert storage.get(project_id) is None
+        assert storage.list_projects() == []
+
+    def test_concurrent_autosaves(self, tmp_path):
+        """Test concurrent writes and reads never see a torn or lost file."""
+        storage = ProjectStorage(str(tmp_path))
+        ids = [storage.create(f"P{i}", "tts", "x") for i in range(4)]
+        errors = []
+
+        def write(n):
+            for i in range(25):
+                storage.update(ids[n % 4], content=str(n) * 1000, title=f"T{n}")
+
+        def read():
+            for _ in range(100):
+                project = storage.get(ids[0])
+                if project is None or len(set(project["content"])) != 1:
+                    errors.append(project)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+        threads += [threading.Thread(target=read) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        listed = {p["id"]: p for p in storage.list_projects()}
+        for project_id in ids:
+            project = storage.get(project_id)
+            assert listed[project_id]["title"] == project["title"]
+            assert project["content"] == project["title"][1:] * 1000
+        assert not list(tmp_path.glob("*/*.tmp"))
+
+
+class TestProjectStorageWriteBehind:
+    """Test coalesced autosaves and reads from pending state."""
+
+    def _on_disk(self, storage_dir, project_id):
+        return (storage_dir / project_id / "content.txt").read_text()
+
+    def test_updates_coalesce_until_flush(self, tmp_path):
+        """Test repeated updates are served from memory and written once."""
+        storage = ProjectStorage(str(tmp_path), write_delay=60)
+        project_id = storage.create("Draft", "tts", "")
+        for i in range(1, 21):
+            assert storage.update(project_id, content="x" * i)
+        assert storage.update(project_id, title="Draft 2")
+
+        assert self._on_disk(tmp_path, project_id) == ""
+        assert storage.get(project_id)["content"] == "x" * 20
+        assert storage.list_projects()[0]["title"] == "Draft 2"
+        assert storage.export_all()["projects"][0]["content"] == "x" * 20
+
+        assert storage.flush() == 1
+        assert storage.flush() == 0
+        assert self._on_disk(tmp_path, project_id) == "x" * 20
+        storage.close()
+        reopened = ProjectStorage(str(tmp_path))
+        assert reopened.get(project_id)["title"] == "Draft 2"
+
+    def test_background_flush(self, tmp_path):
+        """Test an idle project is written without an explicit flush."""
+        storage = ProjectStorage(str(tmp_path), write_delay=0.05)
+        project_id = storage.create("Draft", "tts", "")
+        storage.update(project_id, content="saved")
+        deadline = time.monotonic() + 5
+        while self._on_disk(tmp_path, project_id) != "saved" and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert self._on_disk(tmp_path, project_id) == "saved"
+        storage.close()
+
+    def test_close_writes_pending(self, tmp_path):
+        """Test shutdown writes updates still inside the debounce window."""
+        storage = ProjectStorage(str(tmp_path), write_delay=60)
+        project_id = storage.create("Draft", "tts", "a")
+        storage.update(project_id, content="b")
+        storage.close()
+        assert ProjectStorage(str(tmp_path)).get(project_id)["content"] == "b"
+
+    def test_delete_and_cleanup_with_pending(self, tmp_path):
+        """Test deletes drop pending edits and cleanup keeps just-edited projects."""
+        storage = ProjectStorage(str(tmp_path), write_delay=60)
+        edited = storage.create("Edited", "tts", "a")
+        deleted = storage.create("Deleted", "tts", "a")
+        _age(tmp_path, edited, days=10)
+        storage.update(edited, content="fresh")
+        storage.update(deleted, content="gone")
+
+        assert storage.delete(deleted)
+        assert storage.get(deleted) is None
+        assert storage.cleanup(max_age_days=5) == 0
+        assert self._on_disk(tmp_path, edited) == "fresh"
+        assert storage.flush() == 0
+        assert not (tmp_path / deleted).exists()
@@ -0,0 +1,47 @@
+"""Tests for running header/footer detection."""
+
+from src.running_lines import RunningLineFilter
+
+
+def _page(n, header=True, footer=True):
+    lines = [f"Body line {n}.{i} about topic {chr(97 + (n + i) % 26)}." for i in range(8)]
+    if header:
+        lines.insert(0, "ACME Corp Annual Report")
+    if footer:
+        lines.append(f"Page {n} of 20")
+    return '\n'.join(lines)
+
+
+class TestRunningLineFilter:
+    """Test learning and stripping of repeated edge lines."""
+
+    def test_headers_and_footers_removed(self):
+        """Test lines repeated at the page edges are dropped from every page."""
+        pages = [_page(n) for n in range(1, 21)]
+        running = RunningLineFilter()
+        result = list(running.filter(pages))
+
+        assert len(result) == 20
+        assert not any("ACME" in page or "of 20" in page for page in result)
+        assert result[0].startswith("Body line 1.0")
+        assert running.removed_lines == 40
+        assert running.removed_chars == 20 * len("ACME Corp Annual Report") + sum(
+            len(f"Page {n} of 20") for n in range(1, 21)
+        )
+        assert running.saved_seconds == running.removed_chars / RunningLineFilter.SPEECH_CHARS_PER_SECOND
+
+    def test_pages_without_repeats_unchanged(self):
+        """Test body text and pages without running lines are left alone."""
+        pages = [_page(n, header=False, footer=False) for n in range(1, 10)]
+        assert list(RunningLineFilter().filter(pages)) == pages
+
+    def test_rare_lines_kept(self):
+        """Test a line on fewer than MIN_RATIO of pages is not treated as running."""
+        pages = [_page(n, header=n <= 4, footer=False) for n in range(1, 13)]
+        result = list(RunningLineFilter().filter(pages))
+        assert sum("ACME" in page for page in result) == 4
+
+    def test_short_pages_ignored(self):
+        """Test short pages are never stripped, since their edges are body text."""
+        pages = [f"Chapter {n}." for n in range(1, 10)]
+        assert list(RunningLineFilter().filter(pages)) == pages
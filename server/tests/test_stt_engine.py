@@ -0,0 +1,277 @@
+"""Tests for STT audio decoding helpers."""
+
+import io
+import os
+import queue
+import shutil
+import struct
+import sys
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.stt_engine import PIPE_READ_BYTES, SttEngine, pcm16_to_float32, read_pipe
+from src.vad import SpeechSegmenter
+
+HAS_FFMPEG = shutil.which("ffmpeg") is not None
+
+
+def _write_wav(path, samples, sample_rate=SttEngine.SAMPLE_RATE):
+    """Write int16 samples as a mono WAV file."""
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+class TestPcmConversion:
+    """Test raw PCM to float sample conversion."""
+
+    def test_matches_struct_conversion(self):
+        """Test samples equal the previous struct-based conversion."""
+        shorts = [0, 1, -1, 32767, -32768, 12345, -23456]
+        pcm = struct.pack(f"<{len(shorts)}h", *shorts)
+        samples = pcm16_to_float32(pcm)
+        assert samples.dtype == np.float32
+        assert samples.tolist() == pytest.approx([s / 32768.0 for s in shorts], abs=1e-7)
+
+    def test_odd_trailing_byte_ignored(self):
+        """Test a truncated final frame is dropped."""
+        assert len(pcm16_to_float32(b"\x00\x01\x02")) == 1
+
+    def test_empty(self):
+        """Test empty input gives an empty array."""
+        assert pcm16_to_float32(b"").shape == (0,)
+
+    def test_read_pipe_reads_everything(self):
+        """Test reads spanning several chunks are concatenated in order."""
+        data = bytes(range(256)) * (PIPE_READ_BYTES // 256 * 2 + 3)
+        assert read_pipe(io.BytesIO(data)) == data
+
+
+@pytest.mark.skipif(not HAS_FFMPEG, reason="ffmpeg not installed")
+class TestDecodeAudioFile:
+    """Test decoding through the ffmpeg pipe."""
+
+    def test_decode_wav(self, tmp_path):
+        """Test a 16 kHz WAV decodes to the same samples."""
+        shorts = [int(8000 * np.sin(i / 10)) for i in range(SttEngine.SAMPLE_RATE)]
+        path = tmp_path / "tone.wav"
+        _write_wav(path, shorts)
+        samples = SttEngine().decode_audio_file(str(path))
+        assert samples.dtype == np.float32
+        np.testing.assert_allclose(samples, np.array(shorts) / 32768.0, atol=1e-6)
+
+    def test_resamples_to_16k(self, tmp_path):
+        """Test other sample rates are converted to 16 kHz."""
+        path = tmp_path / "tone.wav"
+        _write_wav(path, [0] * 8000, sample_rate=8000)
+        samples = SttEngine().decode_audio_file(str(path))
+        assert abs(len(samples) - SttEngine.SAMPLE_RATE) < 100
+
+    def test_invalid_file(self, tmp_path):
+        """Test an undecodable file raises with ffmpeg's message."""
+        path = tmp_path / "bad.mp3"
+        path.write_bytes(b"not audio")
+        with pytest.raises(RuntimeError, match="ffmpeg decode failed"):
+            SttEngine().decode_audio_file(str(path))
+
+
+def test_decode_timeout_kills_stalled_ffmpeg(tmp_path, monkeypatch):
+    """Test a decode that stops producing output is killed at the deadline."""
+    fake = tmp_path / "ffmpeg"
+    fake.write_text(f"#!{sys.executable}\nimport sys, time\nsys.stdout.buffer.write(b'\\0' * 64)\nsys.stdout.flush()\ntime.sleep(30)\n")
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    engine = SttEngine()
+    engine.DECODE_TIMEOUT_SECONDS = 0.5
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="timed out"):
+        engine.decode_audio_file(str(tmp_path / "audio.wav"))
+    assert time.monotonic() - start < 10
+
+
+class FakeStream:
+    """Offline stream recording the samples it was given."""
+
+    def __init__(self):
+        self.samples = None
+        self.result = type("Result", (), {"text": ""})()
+
+    def accept_waveform(self, sample_rate, samples):
+        self.samples = samples
+
+
+class FakeRecognizer:
+    """Recognizer whose 'transcript' is the start sample of each stream."""
+
+    def __init__(self):
+        self.batches = []
+
+    def create_stream(self):
+        return FakeStream()
+
+    def decode(self, stream):
+        self.decode_streams([stream])
+
+    def decode_streams(self, streams):
+        self.batches.append(len(streams))
+        for stream in streams:
+            stream.result.text = f" {int(stream.samples[0])} "
+
+
+class FixedSegmenter:
+    """Segmenter returning preset ranges."""
+
+    backend = "fixed"
+
+    def __init__(self, ranges):
+        self.ranges = ranges
+
+    def segments(self, samples):
+        return self.ranges
+
+
+class TestTranscribeSegments:
+    """Test batching and ordering of segmented transcription."""
+
+    def test_batches_in_order(self):
+        """Test segments are decoded in batches and reassembled in order."""
+        samples = np.arange(SttEngine.SAMPLE_RATE * 10, dtype=np.float32)
+        ranges = [(i * 16000, i * 16000 + 8000) for i in range(10)]
+        engine = SttEngine(workers=3, recognizers=3, batch_size=4, segmenter=FixedSegmenter(ranges))
+        engine._recognizer = FakeRecognizer()
+
+        segments = engine.transcribe_segments(samples)
+        pool = engine._batch_pool
+        engine.transcribe_segments(samples)
+
+        assert engine._batch_pool is pool and pool._max_workers == 3
+        assert sorted(engine._recognizer.batches) == [2, 2, 4, 4, 4, 4]
+        assert [s["text"] for s in segments] == [str(start) for start, _ in ranges]
+        assert segments[3] == {"start": 3.0, "end": 3.5, "text": "48000"}
+
+    def test_workers_capped_at_recognizers(self):
+        """Test batch threads never outnumber the recognizers they would wait on."""
+        assert SttEngine(workers=4, recognizers=1).workers == 1
+        assert SttEngine(workers=4, recognizers=2).workers == 2
+        assert SttEngine(workers=1, recognizers=4).workers == 1
+
+    def test_requires_init(self):
+        """Test transcription before init raises."""
+        with pytest.raises(RuntimeError):
+            SttEngine().transcribe_segments(np.zeros(10, dtype=np.float32))
+
+
+class LoudnessRecognizer(FakeRecognizer):
+    """Recognizer that 'hears' speech wherever the audio is loud."""
+
+    def decode_streams(self, streams):
+        self.batches.append(len(streams))
+        for stream in streams:
+            seconds = len(stream.samples) / SttEngine.SAMPLE_RATE
+            stream.result.text = f"speech {seconds:.0f}" if np.abs(stream.samples).max() > 0.1 else ""
+
+
+def _bursts(pattern):
+    """Concatenate (seconds, is_speech) parts: noise bursts over faint hiss."""
+    rng = np.random.default_rng(0)
+    return np.concatenate([
+        (rng.standard_normal(int(seconds * SttEngine.SAMPLE_RATE)) * (0.3 if speech else 0.0005)).astype(np.float32)
+        for seconds, speech in pattern
+    ])
+
+
+class TestStreamSession:
+    """Test incremental transcription of live audio."""
+
+    def setup_method(self):
+        self.engine = SttEngine(segmenter=SpeechSegmenter(None, min_silence_seconds=0.5, max_segment_seconds=20))
+        self.engine._recognizer = LoudnessRecognizer()
+
+    def _feed(self, session, samples, frame_seconds=0.1):
+        frame = int(frame_seconds * SttEngine.SAMPLE_RATE)
+        events = []
+        for i in range(0, len(samples), frame):
+            events.extend(session.accept_waveform(samples[i:i + frame]))
+        return events
+
+    def test_partials_then_finals(self):
+        """Test utterances produce partials while open and one final each."""
+        session = self.engine.create_session(partial_interval=0.5)
+        events = self._feed(session, _bursts([(1, False), (2, True), (1, False), (3, True), (1.5, False)]))
+        events += session.finish()
+
+        finals = [e for e in events if e["type"] == "final"]
+        assert any(e["type"] == "partial" for e in events)
+        assert len(finals) == 2
+        assert abs(finals[0]["start"] - 1) < 0.3 and abs(finals[0]["end"] - 3) < 0.3
+        assert abs(finals[1]["start"] - 4) < 0.3 and abs(finals[1]["end"] - 7) < 0.3
+        assert session.text == "speech 2 speech 3"
+        assert session.duration == pytest.approx(8.5)
+
+    def test_finish_flushes_open_utterance(self):
+        """Test speech still in progress at the end is finalized."""
+        session = self.engine.create_session(partial_interval=0.5)
+        self._feed(session, _bursts([(0.5, False), (2, True)]))
+        finals = [e for e in session.finish() if e["type"] == "final"]
+        assert [e["text"] for e in finals] == ["speech 2"]
+
+    def test_buffer_is_bounded(self):
+        """Test finalized audio is dropped beyond the VAD context."""
+        session = self.engine.create_session(partial_interval=0.5)
+        self._feed(session, _bursts([(2, True), (1, False)] * 20))
+        kept = len(session._buffer) / SttEngine.SAMPLE_RATE
+        assert kept <= session.CONTEXT_SECONDS + 3
+        assert len(session.texts) >= 19
+
+
+class SlowRecognizer(FakeRecognizer):
+    """Recognizer that fails if two threads decode on it at once."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        super().__init__()
+        self.busy = False
+
+    def decode(self, stream):
+        assert not self.busy, "recognizer shared between threads"
+        self.busy = True
+        with SlowRecognizer.lock:
+            SlowRecognizer.active += 1
+            SlowRecognizer.peak = max(SlowRecognizer.peak, SlowRecognizer.active)
+        time.sleep(0.05)
+        with SlowRecognizer.lock:
+            SlowRecognizer.active -= 1
+        self.busy = False
+        stream.result.text = "ok"
+
+
+class TestRecognizerPool:
+    """Test concurrent requests borrow separate recognizers."""
+
+    def test_concurrent_requests_use_pool(self):
+        """Test requests run in parallel up to the pool size, never sharing a recognizer."""
+        engine = SttEngine(recognizers=2)
+        engine._pool = queue.Queue()
+        for recognizer in (SlowRecognizer(), SlowRecognizer()):
+            engine._pool.put(recognizer)
+        engine._recognizer = recognizer
+        SlowRecognizer.peak = 0
+
+        samples = np.zeros(1600, dtype=np.float32)
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            texts = list(pool.map(lambda _: engine.transcribe(samples), range(6)))
+
+        assert texts == ["ok"] * 6
+        assert SlowRecognizer.peak == 2
+        assert engine._pool.qsize() == 2
@@ -39,6 +39,102 @@ class TestTextPreprocessor:
         assert all(isinstance(chunk, dict) for chunk in chunks)
         assert all('text' in chunk and 'starts_paragraph' in chunk for chunk in chunks)
 
+    def test_chunk_long_sentence_at_clauses(self):
+        """Test run-on sentences are split at clause boundaries."""
+        preprocessor = TextPreprocessor(max_chunk_tokens=20)
+        text = ", ".join(f"the party of the part number {i} agrees" for i in range(30)) + "."
+        chunks = preprocessor.chunk_text(text)
+
+        assert len(chunks) > 1
+        assert all(len(c['text']) // 4 <= 20 for c in chunks)
+        # Splits happen after commas, and no words are lost
+        assert all(c['text'].endswith((',', '.')) for c in chunks)
+        assert " ".join(c['text'] for c in chunks).split() == text.split()
+        assert chunks[0]['starts_paragraph'] is True
+        assert not any(c['starts_paragraph'] for c in chunks[1:])
+
+    def test_chunk_long_sentence_without_punctuation(self):
+        """Test text without any clause boundaries falls back to word splits."""
+        preprocessor = TextPreprocessor(max_chunk_tokens=10)
+        text = " ".join(f"word{i}" for i in range(200))
+        chunks = preprocessor.chunk_text(text)
+
+        assert len(chunks) > 1
+        assert all(len(c['text']) // 4 <= 10 for c in chunks)
+        assert " ".join(c['text'] for c in chunks).split() == text.split()
+
+    def test_chunk_oversized_word(self):
+        """Test a single word longer than the limit is sliced."""
+        preprocessor = TextPreprocessor(max_chunk_tokens=5)
+        chunks = preprocessor.chunk_text("x" * 100)
+
+        assert all(len(c['text']) // 4 <= 5 for c in chunks)
+        assert "".join(c['text'] for c in chunks) == "x" * 100
+
+    # --- Language-aware segmentation tests ---
+
+    def test_chunk_japanese_sentences(self):
+        """Test Japanese text splits on 。！？ without spaces."""
+        preprocessor = TextPreprocessor(max_chunk_tokens=20)
+        text = "今日は晴れです。明日は雨でしょう！本当ですか？" * 5
+        chunks = preprocessor.chunk_text(text, language='ja')
+
+        assert len(chunks) > 1
+        assert all(c['text'][-1] in '。！？' for c in chunks)
+        assert "".join(c['text'] for c in chunks) == text
+
+    def test_chunk_chinese_clauses(self):
+        """Test a long Chinese sentence falls back to comma splits."""
+        preprocessor = TextPreprocessor(max_chunk_tokens=10)
+        text = "，".join(["我们今天去公园散步"] * 10) + "。"
+        chunks = preprocessor.chunk_text(text, language='zh')
+
+        assert len(chunks) > 1
+        assert all(len(c['text']) <= 10 for c in chunks)
+        assert "".join(c['text'] for c in chunks) == text
+
+    def test_chunk_hindi_danda(self):
+        """Test Hindi text splits on the danda."""
+        preprocessor = TextPreprocessor(max_chunk_tokens=10)
+        text = "यह एक वाक्य है। यह दूसरा वाक्य है। यह तीसरा वाक्य है।"
+        chunks = preprocessor.chunk_text(text, language='hi')
+
+        assert len(chunks) == 3
+        assert chunks[0]['text'] == "यह एक वाक्य है।"
+
+    def test_language_rules_fallback(self):
+        """Test language codes resolve by base language, then default."""
+        default = TextPreprocessor.LANGUAGE_RULES['default']
+        assert TextPreprocessor.get_language_rules(None) is default
+        assert TextPreprocessor.get_language_rules('en-us') is default
+        assert TextPreprocessor.get_language_rules('ja') is TextPreprocessor.LANGUAGE_RULES['ja']
+        assert TextPreprocessor.get_language_rules('zh-CN') is TextPreprocessor.LANGUAGE_RULES['zh']
+
+    # --- Parallel normalization tests ---
+
+    def test_split_shards_safe_boundaries(self):
+        """Test shards are only cut at balanced, plain paragraph breaks."""
+        text = "One *two.\n\nThree* four.\n\nFive visit www.example.com.\n\nSix seven.\n\nEight."
+        shards = TextPreprocessor._split_shards(text, 1)
+
+        # Not inside the *...* span, not after a URL
+        assert shards == ["One *two.\n\nThree* four.", "Five visit www.example.com.\n\nSix seven.", "Eight."]
+
+    def test_normalize_parallel_matches_serial(self):
+        """Test parallel normalization produces the same output as serial."""
+        paragraphs = [
+            "## Section {n}\n\nDr. Smith reviewed **{n}** items, see https://example.com/{n} now.",
+            "Hard wrapped PDF text that\ncontinues on the next line and\nends here.",
+            "Revenue was 4.25 million; margins rose 18% with 42 staff. Email a@example.com today.",
+            "- Item with `code`\n- Item with [link](https://example.com) and _emphasis_ here.",
+        ]
+        text = "\n\n".join(paragraphs[n % 4].format(n=n) for n in range(200))
+
+        serial = TextPreprocessor(normalize_workers=1).normalize(text)
+        parallel = TextPreprocessor(normalize_workers=2, parallel_min_chars=1000)
+        assert len(parallel._split_shards(text, 1000)) > 1
+        assert parallel.normalize(text) == serial
+
     def test_process_pipeline(self):
         """Test full preprocessing pipeline."""
         text = "Dr. Smith said, 'Hello.'   Mr. Jones replied."
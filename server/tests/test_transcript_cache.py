@@ -0,0 +1,79 @@
+"""Tests for the STT transcript cache."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.transcript_cache import TranscriptCache
+
+
+def _result(text, size=0):
+    return {"text": text + "x" * size, "segments": [], "duration_ms": 1000, "rtf": 0.1}
+
+
+class TestTranscriptCache:
+    """Test upload and PCM keys, eviction and persistence."""
+
+    def test_upload_hit(self, tmp_path):
+        """Test the same upload bytes hit without a PCM fingerprint."""
+        cache = TranscriptCache(str(tmp_path), max_mb=1)
+        assert cache.get_upload("u1") is None
+        assert cache.get_pcm("p1", "u1") is None
+        cache.put("p1", "u1", _result("hello"))
+        assert cache.get_upload("u1")["text"] == "hello"
+        assert cache.stats()["upload_hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_pcm_hit_adds_upload_alias(self, tmp_path):
+        """Test a re-encoded copy hits on PCM and then on its own bytes."""
+        cache = TranscriptCache(str(tmp_path), max_mb=1)
+        cache.put("p1", "u1", _result("hello"))
+        assert cache.get_upload("u2") is None
+        assert cache.get_pcm("p1", "u2")["text"] == "hello"
+        assert cache.get_upload("u2")["text"] == "hello"
+        stats = cache.stats()
+        assert (stats["upload_hits"], stats["pcm_hits"], stats["misses"]) == (1, 1, 0)
+
+    def test_fingerprint(self):
+        """Test identical samples share a fingerprint and different ones do not."""
+        samples = np.linspace(-1, 1, 1600, dtype=np.float32)
+        assert TranscriptCache.fingerprint(samples) == TranscriptCache.fingerprint(samples.copy())
+        samples2 = samples.copy()
+        samples2[5] += 1e-4
+        assert TranscriptCache.fingerprint(samples) != TranscriptCache.fingerprint(samples2)
+
+    def test_lru_eviction_drops_aliases(self, tmp_path):
+        """Test evicted entries no longer hit by PCM or upload hash."""
+        cache = TranscriptCache(str(tmp_path), max_mb=1)
+        cache.put("a", "ua", _result("a", 400 * 1024))
+        cache.put("b", "ub", _result("b", 400 * 1024))
+        cache.get_upload("ua")
+        cache.put("c", "uc", _result("c", 400 * 1024))
+        assert cache.get_upload("ub") is None
+        assert cache.get_pcm("b") is None
+        assert cache.get_upload("ua") is not None
+        assert cache.stats()["bytes"] <= cache.max_bytes
+
+    def test_index_and_aliases_survive_restart(self, tmp_path):
+        """Test a new cache instance finds entries and upload aliases on disk."""
+        TranscriptCache(str(tmp_path), max_mb=1).put("p1", "u1", _result("hello"))
+        cache = TranscriptCache(str(tmp_path), max_mb=1)
+        assert cache.stats()["entries"] == 1
+        assert cache.get_upload("u1")["text"] == "hello"
+
+    def test_concurrent_aliases_kept(self, tmp_path):
+        """Test uploads of the same audio stored at once all stay aliased."""
+        cache = TranscriptCache(str(tmp_path), max_mb=1)
+        cache.put("p1", "u0", _result("hello"))
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda n: cache.get_pcm("p1", f"u{n}"), range(1, 33)))
+        reopened = TranscriptCache(str(tmp_path), max_mb=1)
+        assert all(reopened.get_upload(f"u{n}") for n in range(33))
+        assert cache.stats()["pcm_hits"] == 32
+
+    def test_disabled(self, tmp_path):
+        """Test max_mb=0 stores nothing."""
+        cache = TranscriptCache(str(tmp_path / "off"), max_mb=0)
+        cache.put("p1", "u1", _result("hello"))
+        assert cache.get_upload("u1") is None
+        assert not (tmp_path / "off").exists()
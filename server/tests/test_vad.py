@@ -0,0 +1,57 @@
+"""Tests for speech segmentation of long recordings."""
+
+import numpy as np
+
+from src.vad import SpeechSegmenter
+
+RATE = SpeechSegmenter.SAMPLE_RATE
+
+
+def _recording(pattern, seed=0):
+    """Concatenate (seconds, is_speech) parts: noise bursts over faint hiss."""
+    rng = np.random.default_rng(seed)
+    parts = [
+        (rng.standard_normal(int(seconds * RATE)) * (0.3 if speech else 0.001)).astype(np.float32)
+        for seconds, speech in pattern
+    ]
+    return np.concatenate(parts)
+
+
+class TestEnergySegments:
+    """Test the energy-based fallback detector."""
+
+    def setup_method(self):
+        self.segmenter = SpeechSegmenter(model_path=None, min_silence_seconds=0.5, max_segment_seconds=20)
+
+    def test_backend_without_model(self):
+        """Test the energy detector is used when no VAD model exists."""
+        assert SpeechSegmenter(model_path="/nonexistent/silero_vad.onnx").backend == "energy"
+
+    def test_finds_speech_between_pauses(self):
+        """Test each burst becomes one segment around its true position."""
+        samples = _recording([(1, False), (2, True), (1, False), (3, True), (1, False)])
+        segments = self.segmenter.segments(samples)
+        assert len(segments) == 2
+        (s1, e1), (s2, e2) = segments
+        assert abs(s1 / RATE - 1) < 0.2 and abs(e1 / RATE - 3) < 0.2
+        assert abs(s2 / RATE - 4) < 0.2 and abs(e2 / RATE - 7) < 0.2
+
+    def test_short_pauses_are_merged(self):
+        """Test pauses shorter than min_silence do not split a segment."""
+        samples = _recording([(1, False), (1, True), (0.2, False), (1, True), (1, False)])
+        assert len(self.segmenter.segments(samples)) == 1
+
+    def test_long_speech_is_split(self):
+        """Test no segment exceeds the maximum length (plus padding)."""
+        samples = _recording([(65, True)])
+        segments = self.segmenter.segments(samples)
+        assert len(segments) >= 4
+        assert segments[0][0] == 0 and segments[-1][1] == len(samples)
+        limit = (20 + 2 * SpeechSegmenter.PAD_SECONDS) * RATE
+        assert all(end - start <= limit for start, end in segments)
+        assert all(a[1] <= b[0] for a, b in zip(segments, segments[1:]))
+
+    def test_silence_and_empty(self):
+        """Test digital silence and empty input have no segments."""
+        assert self.segmenter.segments(np.zeros(RATE * 5, dtype=np.float32)) == []
+        assert self.segmenter.segments(np.zeros(0, dtype=np.float32)) == []